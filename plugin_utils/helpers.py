@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import List, Optional
 from textwrap import wrap
 
@@ -111,6 +112,8 @@ def findOrCreatePath(path: str):
         os.makedirs(path)
 
 
+# the same collection names repeat for every object on receive
+@lru_cache(maxsize=65536)
 def removeSpecialCharacters(text: str) -> str:
     new_text = (
         text.replace("<", "_")
@@ -1,7 +1,7 @@
-import time
 import numpy as np
 from typing import Any, Callable, List, Optional
 from plugin_utils.helpers import SYMBOL, removeSpecialCharacters
+from plugin_utils.threads import CANCELLATION_TOKEN
 
 from specklepy.objects.GIS.layers import VectorLayer, RasterLayer, Layer
 from speckle.converter.layers.layer_conversions import (
@@ -13,7 +13,7 @@ from speckle.converter.layers.layer_conversions import (
 import threading
 from specklepy.objects import Base
 
-from speckle.converter.layers.utils import findUpdateJsonItemPath
+from speckle.converter.layers.utils import addJsonItemPath
 
 
 SPECKLE_TYPES_TO_READ = [
@@ -23,6 +23,34 @@ SPECKLE_TYPES_TO_READ = [
     "Objects.Other.Hatch",
 ]  # will properly traverse and check for displayValue
 
+# members named differently in the layer tree, see getBaseValidName
+NAMED_MEMBERS = ("elements", "displayValue", "@displayValue", "definition")
+
+
+def runTraversal(walk):
+    """Runs a traversal generator with an explicit stack instead of recursion:
+    each yielded generator (a child node) is run to the end before its parent resumes.
+    Exceptions are passed to the parent, like from a recursive call."""
+    stack = [walk]
+    error = None
+    while len(stack) > 0:
+        try:
+            if error is not None:
+                e, error = error, None
+                child = stack[-1].throw(e)
+            else:
+                child = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        except BaseException as e:
+            stack.pop()
+            if len(stack) == 0:
+                raise
+            error = e
+            continue
+        stack.append(child)
+
 
 def traverseObject(
     plugin,
@@ -31,8 +59,33 @@ def traverseObject(
     check: Optional[Callable[[Base], bool]],
     streamBranch: str,
     nameBase: str = "",
+):
+    runTraversal(
+        _traverseObject(plugin, base, callback, check, streamBranch, nameBase)
+    )
+
+
+def traverseValue(
+    plugin,
+    value: Any,
+    callback: Optional[Callable[[Base, str, Any], bool]],
+    check: Optional[Callable[[Base], bool]],
+    streamBranch: str,
+    name: str,
+):
+    runTraversal(_traverseValue(plugin, value, callback, check, streamBranch, name))
+
+
+def _traverseObject(
+    plugin,
+    base: Base,
+    callback: Optional[Callable[[Base, str, Any], bool]],
+    check: Optional[Callable[[Base], bool]],
+    streamBranch: str,
+    nameBase: str = "",
 ):
     # print("___traverseObject")
+    CANCELLATION_TOKEN.check()
     if check and check(base):
         res = callback(base, streamBranch, nameBase, plugin) if callback else False
         if res:
@@ -55,10 +108,12 @@ def traverseObject(
         if name_pass == SYMBOL + "QGIS commit" or name_pass == SYMBOL + "ArcGIS commit":
             name_pass = ""
         # print(name_pass)
-        traverseValue(plugin, base[name], callback, check, streamBranch, name_pass)
+        yield _traverseValue(
+            plugin, base[name], callback, check, streamBranch, name_pass
+        )
 
 
-def traverseValue(
+def _traverseValue(
     plugin,
     value: Any,
     callback: Optional[Callable[[Base, str, Any], bool]],
@@ -68,10 +123,11 @@ def traverseValue(
 ):
     # print("________traverseValue")
     if isinstance(value, Base):
-        traverseObject(plugin, value, callback, check, streamBranch, name)
+        yield _traverseObject(plugin, value, callback, check, streamBranch, name)
     if isinstance(value, List):
         for item in value:
-            traverseValue(plugin, item, callback, check, streamBranch, name)
+            if isinstance(item, (Base, List)):
+                yield _traverseValue(plugin, item, callback, check, streamBranch, name)
 
 
 def callback(base: Base, streamBranch: str, nameBase: str, plugin) -> bool:
@@ -87,13 +143,15 @@ def callback(base: Base, streamBranch: str, nameBase: str, plugin) -> bool:
         ):
             layerToNative(base, streamBranch, nameBase, plugin)
         else:
-            loopObj(base, "", streamBranch, plugin, [])
+            loopObj(base, "", streamBranch, plugin, set())
         return True
     except:
         return
 
 
 def getBaseValidName(base: Base, name: str) -> str:
+    if name not in NAMED_MEMBERS:
+        return name
     name_pass = name
     search = 0
     try:
@@ -162,19 +220,55 @@ def getBaseValidName(base: Base, name: str) -> str:
 
 def loopObj(
     base: Base, baseName: str, streamBranch: str, plugin, used_ids, matrix=None
+):
+    if not isinstance(used_ids, set):
+        used_ids = set(used_ids)
+    runTraversal(
+        _loopObj(base, baseName, streamBranch, plugin, used_ids, matrix, set())
+    )
+
+
+def loopVal(
+    value: Any, name: str, val_id: str, streamBranch: str, plugin, used_ids, matrix=None
+):  # "name" is the parent object/property/layer name
+    if not isinstance(used_ids, set):
+        used_ids = set(used_ids)
+    runTraversal(
+        _loopVal(value, name, val_id, streamBranch, plugin, used_ids, matrix, set())
+    )
+
+
+def isGeometryType(speckle_type) -> bool:
+    return isinstance(speckle_type, str) and (
+        speckle_type.startswith("Objects.Geometry.") or speckle_type.endswith(".Hatch")
+    )
+
+
+def _loopObj(
+    base: Base,
+    baseName: str,
+    streamBranch: str,
+    plugin,
+    used_ids: set,
+    matrix=None,
+    tree_paths: Optional[set] = None,
 ):
     try:
         # dont loop primitives
         if not isinstance(base, Base):
             return
+        CANCELLATION_TOKEN.check()
 
         memberNames = base.get_member_names()
 
         baseName_pass = removeSpecialCharacters(baseName)
         # print(plugin.receive_layer_tree)
-        plugin.receive_layer_tree = findUpdateJsonItemPath(
-            plugin.receive_layer_tree, streamBranch + SYMBOL + baseName_pass
-        )
+        # update the tree only once per collection path
+        tree_path = streamBranch + SYMBOL + baseName_pass
+        if tree_paths is None or tree_path not in tree_paths:
+            addJsonItemPath(plugin.receive_layer_tree, tree_path)
+            if tree_paths is not None:
+                tree_paths.add(tree_path)
         # print(plugin.receive_layer_tree)
 
         for name in memberNames:
@@ -233,10 +327,9 @@ def loopObj(
 
                         except:
                             matrix = None
-                        time.sleep(0.3)
                     except Exception as e:
                         print(f"ERROR: {e}")
-                loopVal(
+                yield _loopVal(
                     base[name],
                     name_pass,
                     base.id,
@@ -244,13 +337,21 @@ def loopObj(
                     plugin,
                     used_ids,
                     matrix,
+                    tree_paths,
                 )
     except Exception as e:
         print(e)
 
 
-def loopVal(
-    value: Any, name: str, val_id: str, streamBranch: str, plugin, used_ids, matrix=None
+def _loopVal(
+    value: Any,
+    name: str,
+    val_id: str,
+    streamBranch: str,
+    plugin,
+    used_ids: set,
+    matrix=None,
+    tree_paths: Optional[set] = None,
 ):  # "name" is the parent object/property/layer name
     try:
         name = removeSpecialCharacters(name)
@@ -265,14 +366,25 @@ def loopVal(
                 if not value.speckle_type.startswith(
                     "Objects.Geometry."
                 ) and not value.speckle_type.endswith(".Hatch"):
-                    loopObj(value, name, streamBranch, plugin, used_ids, matrix)
+                    yield _loopObj(
+                        value, name, streamBranch, plugin, used_ids, matrix, tree_paths
+                    )
                 elif value.id not in used_ids:  # if geometry
-                    used_ids.append(value.id)
-                    loopVal(
-                        [value], name, value.id, streamBranch, plugin, used_ids, matrix
+                    used_ids.add(value.id)
+                    yield _loopVal(
+                        [value],
+                        name,
+                        value.id,
+                        streamBranch,
+                        plugin,
+                        used_ids,
+                        matrix,
+                        tree_paths,
                     )
-            except:
-                loopObj(value, name, streamBranch, plugin, used_ids, matrix)
+            except Exception:
+                yield _loopObj(
+                    value, name, streamBranch, plugin, used_ids, matrix, tree_paths
+                )
 
         elif isinstance(value, List):
             # print("LOOP VAL - LIST")
@@ -283,8 +395,19 @@ def loopVal(
                 if not isinstance(item, Base):
                     continue
 
-                used_ids.append(item.id)
-                loopVal(item, name, item.id, streamBranch, plugin, used_ids, matrix)
+                used_ids.add(item.id)
+                # geometry was just marked as used, nothing to loop through
+                if not isGeometryType(getattr(item, "speckle_type", None)):
+                    yield _loopVal(
+                        item,
+                        name,
+                        item.id,
+                        streamBranch,
+                        plugin,
+                        used_ids,
+                        matrix,
+                        tree_paths,
+                    )
 
                 if not isinstance(item, Base):
                     continue
@@ -301,7 +424,6 @@ def loopVal(
                             geometryLayerToNative(
                                 value, name, val_id, streamBranch, plugin
                             )
-                            time.sleep(0.3)
                             objectListConverted += 1
                     except:
                         try:
@@ -312,14 +434,12 @@ def loopVal(
                                 geometryLayerToNative(
                                     value, name, val_id, streamBranch, plugin
                                 )
-                                time.sleep(0.3)
                                 objectListConverted += 1
                         except:
                             pass
                 elif item.speckle_type and item.speckle_type.endswith(".ModelCurve"):
                     if item["baseCurve"] is not None:
                         geometryLayerToNative(value, name, val_id, streamBranch, plugin)
-                        time.sleep(0.3)
                         break
                 elif (
                     plugin.dataStorage.latestHostApp.lower().endswith("excel")
@@ -327,7 +447,6 @@ def loopVal(
                 ):
                     # should be before the check for "BuiltElements"
                     nonGeometryLayerToNative(value, name, val_id, streamBranch, plugin)
-                    time.sleep(0.3)
                     break
                 elif item.speckle_type and (
                     item.speckle_type == "Objects.Geometry.Mesh"
@@ -335,7 +454,6 @@ def loopVal(
                     or item.speckle_type.startswith("Objects.BuiltElements.")
                 ):
                     geometryLayerToNative(value, name, val_id, streamBranch, plugin)
-                    time.sleep(0.3)
                     break
                 elif (
                     item.speckle_type
@@ -347,7 +465,6 @@ def loopVal(
                     )
                 ):  # or item.speckle_type == 'Objects.BuiltElements.Alignment'):
                     geometryLayerToNative(value, name, val_id, streamBranch, plugin)
-                    time.sleep(0.3)
                     break
                 elif item.speckle_type:
                     try:
@@ -355,7 +472,6 @@ def loopVal(
                             geometryLayerToNative(
                                 value, name, val_id, streamBranch, plugin
                             )
-                            time.sleep(0.3)
                             break
                     except:
                         pass
@@ -1,42 +1,100 @@
-
-import sys
-import trace
+import time
 import threading
 
+
+class OperationCancelled(SystemExit):
+    """Raised at the next check after the operation was cancelled. Like SystemExit,
+    it is not caught by 'except Exception' and ends the thread silently."""
+
+
+class CancellationToken:
+    """Set from the UI to stop the running send or receive at the next check."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def reset(self):
+        self._event.clear()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise OperationCancelled()
+
+
+# shared by the send/receive thread and its helpers, only one operation runs at a time
+CANCELLATION_TOKEN = CancellationToken()
+
+
 class KThread(threading.Thread):
-    """A subclass of threading.Thread, with a kill()
-    method."""
-    # https://web.archive.org/web/20130503082442/http://mail.python.org/pipermail/python-list/2004-May/281943.html 
-    def __init__(self, *args, **keywords):
-        threading.Thread.__init__(self, *args, **keywords)
-        self.killed = False
-
-    def start(self):
-        """Start the thread."""
-        self.__run_backup = self.run
-        self.run = self.__run      # Force the Thread to install our trace.
-        threading.Thread.start(self)
-
-    def __run(self):
-        """Hacked run function, which installs the trace."""
-        sys.settrace(self.globaltrace)
-        self.__run_backup()
-        self.run = self.__run_backup
-
-    def globaltrace(self, frame, why, arg):
-        if why == 'call':
-            return self.localtrace
-        else:
-            return None
-
-    def localtrace(self, frame, why, arg):
-        if self.killed:
-            if why == 'line':
-                raise SystemExit()
-        return self.localtrace
+    """A subclass of threading.Thread, with a kill() method.
+    The thread stops cooperatively, where the running code checks CANCELLATION_TOKEN."""
+
+    def run(self):
+        try:
+            threading.Thread.run(self)
+        except OperationCancelled:
+            pass
 
     def kill(self):
-        self.killed = True
+        CANCELLATION_TOKEN.cancel()
+
+
+class AckQueue:
+    """Counts items handed over to another thread until they are acknowledged.
+    put() blocks while 'max_in_flight' items are waiting, join() until all are done."""
+
+    def __init__(self, max_in_flight: int = 4, timeout: float = 120):
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout = timeout  # give up waiting, e.g. if the receiver never acknowledges
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def _wait(self, predicate, timeout) -> bool:
+        # wait in short steps, so that a KThread can still be killed meanwhile
+        end = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._cond:
+            while not predicate():
+                CANCELLATION_TOKEN.check()
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.2))
+        return True
+
+    def put(self, timeout: float = None) -> bool:
+        """Reserves a place for a new item, returns False (nothing reserved) if it
+        waited until timeout."""
+        if threading.current_thread() is not threading.main_thread():
+            if not self._wait(lambda: self.in_flight < self.max_in_flight, timeout):
+                return False
+        # on the main thread the receiver would never get to run: don't wait
+        with self._cond:
+            self.in_flight += 1
+        return True
+
+    def ack(self):
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._cond.notify_all()
+
+    def join(self, timeout: float = None) -> bool:
+        if threading.current_thread() is threading.main_thread():
+            return self.in_flight == 0
+        return self._wait(lambda: self.in_flight == 0, timeout)
+
+    def reset(self, max_in_flight: int = None):
+        with self._cond:
+            if max_in_flight is not None:
+                self.max_in_flight = max(1, max_in_flight)
+            self.in_flight = 0
+            self._cond.notify_all()
+
 
 class KillableThread(threading.Thread):
     # is NOT running in the background 
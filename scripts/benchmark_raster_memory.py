@@ -0,0 +1,85 @@
+"""Measures peak memory per raster cell while a raster tile is converted and cached,
+to size RASTER_CELL_BYTES and RASTER_CELL_BAND_BYTES in speckle/converter/layers/utils.py.
+
+Run from the plugin folder: python scripts/benchmark_raster_memory.py
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from specklepy.objects.GIS.geometry import GisRasterElement
+from specklepy.transports.sqlite import SQLiteTransport
+
+from speckle.converter.features.feature_conversions import (
+    get_raster_channel_values,
+    get_raster_mesh_coords,
+    get_raster_mesh_faces,
+    normalize_raster_band_values,
+)
+from speckle.converter.geometry.mesh import constructMeshFromRaster
+from speckle.utils.serialization import cacheObject
+
+SIZE_X, SIZE_Y = 300, 200
+
+
+class Point:
+    def __init__(self, x, y):
+        self._x = x
+        self._y = y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+
+def convert_tile(band_count: int, cache: SQLiteTransport):
+    """Same steps as rasterFeatureToSpeckle for a tile without transformations."""
+    count = SIZE_X * SIZE_Y
+    b = GisRasterElement(units="m")
+    band_values = []
+    for index in range(band_count):
+        array = np.random.default_rng(index).random((SIZE_Y, SIZE_X)) * 100
+        values, _, _, _ = normalize_raster_band_values(array, -9999.0, 0.0, 100.0)
+        band_values.append(values)
+        b["@(10000)" + f"Band {index + 1}" + "_values"] = values.tolist()
+
+    stats = (
+        Point(SIZE_X, 0),
+        Point(0, 0),
+        Point(SIZE_X, -SIZE_Y),
+        Point(0, -SIZE_Y),
+        [1.0, -1.0],
+        [SIZE_X, SIZE_Y],
+    )
+    vertices = get_raster_mesh_coords(stats, [1.0, -1.0], band_values[0], None)
+    vertices = vertices.reshape(-1, 3).copy().ravel()  # offset & rotation copy
+    faces = get_raster_mesh_faces(count)
+    channel = get_raster_channel_values(band_values[0], 0.0, 100.0)
+    colors = np.repeat((255 << 24) | (channel << 16) | (channel << 8) | channel, 4)
+    b.displayValue = [constructMeshFromRaster(vertices, faces, colors, None)]
+    return cacheObject(b, cache)
+
+
+def peak_bytes_per_cell(band_count: int) -> float:
+    cache = SQLiteTransport(base_path=tempfile.mkdtemp())
+    tracemalloc.start()
+    convert_tile(band_count, cache)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cache.close()
+    return peak / (SIZE_X * SIZE_Y)
+
+
+if __name__ == "__main__":
+    peaks = {n: peak_bytes_per_cell(n) for n in (1, 2, 4)}
+    for n, peak in peaks.items():
+        print(f"{n} band(s): {peak:.0f} bytes per cell")
+    per_band = (peaks[4] - peaks[1]) / 3
+    print(f"per band: {per_band:.0f} bytes, without bands: {peaks[1] - per_band:.0f}")
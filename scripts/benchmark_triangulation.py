@@ -0,0 +1,67 @@
+"""Compares serial and process-pool triangulation of synthetic building footprints
+(4-24 vertices, 10% with a hole), as done for large polygon layers on send.
+
+Run from the plugin folder: python scripts/benchmark_triangulation.py [count]
+"""
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from speckle.converter.geometry.triangulation import (
+    shutdown_triangulation_executor,
+    triangulate_rings,
+    triangulate_rings_batch,
+)
+
+
+def ring(rng, cx: float, cy: float, radius: float, count: int):
+    angles = np.sort(rng.uniform(0, 2 * math.pi, count))
+    radii = radius * rng.uniform(0.6, 1.0, count)
+    return [
+        c
+        for a, r in zip(angles, radii)
+        for c in (cx + r * math.cos(a), cy + r * math.sin(a), 0.0)
+    ]
+
+
+def footprints(count: int):
+    rng = np.random.default_rng(0)
+    jobs = []
+    for i in range(count):
+        cx, cy = 100.0 * (i % 1000), 100.0 * (i // 1000)
+        vertices = ring(rng, cx, cy, 20.0, int(rng.integers(4, 25)))
+        holes = []
+        if i % 10 == 0:
+            holes.append(len(vertices) // 3)
+            vertices += ring(rng, cx, cy, 5.0, 4)[::-1]
+        jobs.append((vertices, holes))
+    return jobs
+
+
+def timed(func, *args):
+    time0 = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - time0, result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    jobs = footprints(count)
+    print(f"{count} footprints, {os.cpu_count()} CPUs")
+
+    seconds, expected = timed(lambda: [triangulate_rings(v, h) for v, h in jobs])
+    print(f"serial: {seconds:.1f}s")
+    for workers in (2, 4, 8):
+        try:
+            # 2 layers of one send: the worker processes start only once
+            first, result = timed(triangulate_rings_batch, jobs, workers)
+            second, _ = timed(triangulate_rings_batch, jobs, workers)
+        finally:
+            shutdown_triangulation_executor()
+        assert result == expected
+        print(f"pool, {workers} workers: {first:.1f}s, then {second:.1f}s")
@@ -2,13 +2,14 @@ from datetime import datetime
 import inspect
 import math
 import os
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import hashlib
 
 import scipy as sp
 from plugin_utils.helpers import findOrCreatePath
+from plugin_utils.threads import CANCELLATION_TOKEN
 from speckle.converter.features.GisFeature import GisFeature
 from speckle.converter.geometry import transform
 from speckle.converter.geometry.conversions import (
@@ -24,15 +25,19 @@ from speckle.converter.layers.symbology import (
 )
 from speckle.converter.layers.utils import (
     generate_qgis_app_id,
-    getArrayIndicesFromXY,
+    getArrayIndicesFromXYArrays,
+    getCachedElevationData,
+    getCachedRasterBand,
+    clearRasterBandCache,
     getElevationLayer,
-    getRasterArrays,
     getVariantFromValue,
     getXYofArrayPoint,
+    get_raster_tiles,
     isAppliedLayerTransformByKeywords,
     validateAttributeName,
 )
 from speckle.utils.panel_logging import logToUser
+from speckle.utils.serialization import cacheObject
 from speckle.converter.features.utils import updateFeat
 from specklepy.objects.GIS.geometry import (
     GisRasterElement,
@@ -75,9 +80,14 @@ def featureToSpeckle(
     geomType,
     selectedLayer: Union["QgsVectorLayer", "QgsRasterLayer"],
     dataStorage,
+    feature_report: Optional[dict] = None,
 ):
     if dataStorage is None:
         return
+    if feature_report is None:
+        feature_report = dataStorage.latestActionFeaturesReport[
+            len(dataStorage.latestActionFeaturesReport) - 1
+        ]
     units = dataStorage.currentUnits
     new_report = {"obj_type": "", "errors": ""}
     iterations = 0
@@ -200,16 +210,12 @@ def featureToSpeckle(
         except Exception as e:  # e.g. KeyError for Polygons
             pass
 
-        dataStorage.latestActionFeaturesReport[
-            len(dataStorage.latestActionFeaturesReport) - 1
-        ].update(new_report)
+        feature_report.update(new_report)
         return new_geom
 
     except Exception as e:
         new_report.update({"errors": e})
-        dataStorage.latestActionFeaturesReport[
-            len(dataStorage.latestActionFeaturesReport) - 1
-        ].update(new_report)
+        feature_report.update(new_report)
         logToUser(e, level=2, func=inspect.stack()[0][3])
         return new_geom
 
@@ -256,7 +262,8 @@ def get_raster_mesh_coords(
     rasterResXY: list,
     band1_values: list,
     dataStorage,
-) -> List[float]:
+) -> np.ndarray:
+    """Returns flat array of vertex coordinates, 4 vertices per raster cell."""
     (
         reprojected_top_right,
         reprojectedOriginPt,
@@ -272,55 +279,184 @@ def get_raster_mesh_coords(
     x_correction = (reprojected_bottom_left.x() - xOrigin) / sizeX
     y_correction = (reprojected_top_right.y() - yOrigin) / rasterDimensions[1]
 
-    list_nested = [
-        (
-            xOrigin
-            + rasterResXY[0]
-            * (ind % sizeX)  # ind%sizeX = current item index in the row; +1 = next item
-            + x_correction * (ind % sizeX),
-            yOrigin
-            + rasterResXY[1]
-            * math.floor(
-                ind / sizeX
-            )  # math.floor(ind/sizeX) = current row index; +1 = next row
-            + y_correction * math.floor(ind / sizeX),
-            0,
-            xOrigin + rasterResXY[0] * (ind % sizeX) + x_correction * (ind % sizeX),
-            yOrigin
-            + rasterResXY[1] * math.floor(ind / sizeX + 1)
-            + y_correction * math.floor(ind / sizeX + 1),
-            0,
-            xOrigin
-            + rasterResXY[0] * (ind % sizeX + 1)
-            + x_correction * (ind % sizeX + 1),
-            yOrigin
-            + rasterResXY[1] * math.floor(ind / sizeX + 1)
-            + y_correction * math.floor(ind / sizeX + 1),
-            0,
-            xOrigin
-            + rasterResXY[0] * (ind % sizeX + 1)
-            + x_correction * (ind % sizeX + 1),
-            yOrigin
-            + rasterResXY[1] * math.floor(ind / sizeX)
-            + y_correction * math.floor(ind / sizeX),
-            0,
-        )
-        for ind, _ in enumerate(band1_values)
-    ]
-    list_flattened = [item for sublist in list_nested for item in sublist]
+    count = len(band1_values)
+    cell_indices = np.arange(count)
+    col = cell_indices % sizeX  # current item index in the row; +1 = next item
+    row = cell_indices // sizeX  # current row index; +1 = next row
 
-    return list_flattened
+    x_left = xOrigin + rasterResXY[0] * col + x_correction * col
+    x_right = xOrigin + rasterResXY[0] * (col + 1) + x_correction * (col + 1)
+    y_top = yOrigin + rasterResXY[1] * row + y_correction * row
+    y_bottom = yOrigin + rasterResXY[1] * (row + 1) + y_correction * (row + 1)
 
+    vertices = np.zeros((count, 4, 3), dtype=float)
+    vertices[:, 0, 0] = vertices[:, 1, 0] = x_left
+    vertices[:, 2, 0] = vertices[:, 3, 0] = x_right
+    vertices[:, 0, 1] = vertices[:, 3, 1] = y_top
+    vertices[:, 1, 1] = vertices[:, 2, 1] = y_bottom
 
-def apply_offset_rotation_to_vertices_send(vertices: List[float], dataStorage):
-    new_vertices = []
-    for index in range(int(len(vertices) / 3)):
-        x, y = apply_pt_offsets_rotation_on_send(
-            vertices[3 * index], vertices[3 * index + 1], dataStorage
-        )
-        new_vertices.extend([x, y, vertices[3 * index + 2]])
+    return vertices.ravel()
+
+
+def get_raster_mesh_faces(count: int) -> np.ndarray:
+    """Returns flat array of quad faces, one per raster cell."""
+    faces = np.empty((count, 5), dtype=np.int64)
+    faces[:, 0] = 4
+    faces[:, 1:] = 4 * np.arange(count, dtype=np.int64)[:, None] + np.arange(4)
+    return faces.ravel()
+
+
+def get_raster_grid_mesh_coords(
+    reprojected_raster_stats, rasterResXY: list, count: int
+) -> np.ndarray:
+    """Returns flat array of vertex coordinates of the raster grid, (W+1) x (H+1) vertices
+    shared between cells; same values as the cell corners from get_raster_mesh_coords."""
+    (
+        reprojected_top_right,
+        reprojectedOriginPt,
+        reprojectedMaxPt,
+        reprojected_bottom_left,
+        rasterResXY_reprojected,
+        rasterDimensions,
+    ) = reprojected_raster_stats
+
+    xOrigin = reprojectedOriginPt.x()
+    yOrigin = reprojectedOriginPt.y()
+    sizeX = rasterDimensions[0]
+    sizeY = count // sizeX
+    x_correction = (reprojected_bottom_left.x() - xOrigin) / sizeX
+    y_correction = (reprojected_top_right.y() - yOrigin) / rasterDimensions[1]
+
+    col = np.arange(sizeX + 1)
+    row = np.arange(sizeY + 1)
+    vertices = np.zeros((sizeY + 1, sizeX + 1, 3), dtype=float)
+    vertices[:, :, 0] = (xOrigin + rasterResXY[0] * col + x_correction * col)[None, :]
+    vertices[:, :, 1] = (yOrigin + rasterResXY[1] * row + y_correction * row)[:, None]
+    return vertices.ravel()
+
+
+def get_raster_grid_mesh_faces(sizeX: int, sizeY: int) -> np.ndarray:
+    """Returns flat array of quad faces, one per raster cell, indexing the grid vertices
+    (corners in the same order as get_raster_mesh_coords)."""
+    top_left = (
+        np.arange(sizeY, dtype=np.int64)[:, None] * (sizeX + 1)
+        + np.arange(sizeX, dtype=np.int64)[None, :]
+    ).ravel()
+    faces = np.empty((sizeX * sizeY, 5), dtype=np.int64)
+    faces[:, 0] = 4
+    faces[:, 1] = top_left
+    faces[:, 2] = top_left + sizeX + 1
+    faces[:, 3] = top_left + sizeX + 2
+    faces[:, 4] = top_left + 1
+    return faces.ravel()
+
+
+def get_raster_grid_vertex_colors(
+    cell_colors: np.ndarray, sizeX: int, sizeY: int
+) -> np.ndarray:
+    """Returns grid vertex colors, averaged per channel over the visible adjacent cells;
+    vertices without visible cells are transparent."""
+    cell_colors = np.asarray(cell_colors, dtype=np.int64).reshape(sizeY, sizeX)
+    channels = np.stack(
+        [(cell_colors >> shift) & 0xFF for shift in (24, 16, 8, 0)], axis=-1
+    )
+    visible = channels[:, :, 0] != 0
+
+    sums = np.zeros((sizeY + 1, sizeX + 1, 4), dtype=np.int64)
+    counts = np.zeros((sizeY + 1, sizeX + 1), dtype=np.int64)
+    visible_channels = channels * visible[:, :, None]
+    for row_slice, col_slice in (
+        (slice(None, -1), slice(None, -1)),
+        (slice(1, None), slice(None, -1)),
+        (slice(1, None), slice(1, None)),
+        (slice(None, -1), slice(1, None)),
+    ):
+        sums[row_slice, col_slice] += visible_channels
+        counts[row_slice, col_slice] += visible
+
+    averages = np.rint(sums / np.maximum(counts, 1)[:, :, None]).astype(np.int64)
+    colors = (
+        (averages[:, :, 0] << 24)
+        | (averages[:, :, 1] << 16)
+        | (averages[:, :, 2] << 8)
+        | averages[:, :, 3]
+    )
+    colors[counts == 0] = (0 << 24) | (0 << 16) | (0 << 8) | 0
+    return colors.ravel()
+
+
+def remove_transparent_grid_cells(vertices, faces, colors, cells_visible):
+    """Removes invisible grid cells and the vertices not used by any remaining cell."""
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 5)[cells_visible]
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+
+    vertices_used = np.zeros(len(vertices), dtype=bool)
+    vertices_used[faces[:, 1:].ravel()] = True
+    vertices_remapping = np.cumsum(vertices_used) - 1
+    faces[:, 1:] = vertices_remapping[faces[:, 1:]]
 
-    return new_vertices
+    colors = np.asarray(colors, dtype=np.int64)[vertices_used]
+    return vertices[vertices_used].ravel(), faces.ravel(), colors
+
+
+def get_raster_mesh_payload_size(vertices, faces, colors) -> int:
+    """Number of values of the display mesh to send."""
+    return len(vertices) + len(faces) + (0 if colors is None else len(colors))
+
+
+def apply_offset_rotation_to_vertices_send(vertices, dataStorage) -> np.ndarray:
+    """Applies the send offsets and rotation to flat XYZ vertices, all at once."""
+    return (
+        transform.getSendTransform(dataStorage).apply_array(vertices, dim=3).ravel()
+    )
+
+
+def get_raster_channel_values(vals, val_min, vals_range) -> np.ndarray:
+    """Returns band values stretched to 0-255 (or as is, if range is 0), as integers."""
+    vals = np.nan_to_num(np.asarray(vals, dtype=float))
+    if vals_range == 0:
+        return np.trunc(vals).astype(np.int64)
+    return np.trunc(255 * (vals - val_min) / vals_range).astype(np.int64)
+
+
+def get_raster_valid_mask(vals, val_na) -> np.ndarray:
+    """Returns mask of the band values different from NoData value."""
+    vals = np.asarray(vals, dtype=float)
+    mask = ~np.isnan(vals)
+    if val_na is not None:
+        mask &= vals != val_na
+    return mask
+
+
+def get_raster_class_colors(vals, class_values, class_rgbs, val_na) -> np.ndarray:
+    """Returns colors of raster cells, classified by the lower bounds of renderer classes.
+    Cells without a class or with NoData value are transparent."""
+    vals = np.asarray(vals, dtype=float)
+    bounds = np.asarray(class_values, dtype=float)
+    no_class = len(bounds)
+    # color per class, the last item for cells without a class
+    colors_lut = np.array(
+        [(255 << 24) | (rgb[0] << 16) | (rgb[1] << 8) | rgb[2] for rgb in class_rgbs]
+        + [(0 << 24) | (0 << 16) | (0 << 8) | 0],
+        dtype=np.int64,
+    )
+
+    if np.all(bounds[:-1] <= bounds[1:]):
+        # class i covers values from bounds[i] up to (excluding) bounds[i+1]
+        class_index = np.searchsorted(bounds, vals, side="right") - 1
+        class_index[(class_index < 0) | np.isnan(vals)] = no_class
+    else:
+        # unsorted classes: the last matching class applies
+        class_index = np.full(vals.shape, no_class, dtype=np.int64)
+        for i in range(no_class):
+            mask = vals >= bounds[i]
+            if i < no_class - 1:
+                mask &= vals < bounds[i + 1]
+            class_index[mask] = i
+
+    if val_na is not None:
+        class_index[vals == val_na] = no_class
+    return colors_lut.take(class_index)
 
 
 def get_raster_colors(
@@ -337,9 +473,10 @@ def get_raster_colors(
     if rendererType == "multibandcolor":
 
         # mock values for R,G,B channels
-        vals_red = [0 for _ in rasterBandVals[0]]
-        vals_green = [0 for _ in rasterBandVals[0]]
-        vals_blue = [0 for _ in rasterBandVals[0]]
+        cell_count = len(rasterBandVals[0])
+        vals_red = np.zeros(cell_count, dtype=float)
+        vals_green = np.zeros(cell_count, dtype=float)
+        vals_blue = np.zeros(cell_count, dtype=float)
         vals_alpha = None
 
         vals_range_red = 1
@@ -392,50 +529,31 @@ def get_raster_colors(
                 val_na_alpha = rasterBandNoDataVal[band_index]
                 vals_alpha = rasterBandVals[band_index]
 
-        if vals_alpha is not None and 0 in vals_alpha:
+        if vals_alpha is not None and np.any(np.asarray(vals_alpha) == 0):
             have_transparent_cells = True
 
-        list_colors = [
-            (
-                (
-                    (
-                        255 << 24
-                        if vals_alpha is None or vals_range_alpha == 0
-                        else int(
-                            255 * (vals_alpha[ind] - val_min_alpha) / vals_range_alpha
-                        )
-                        << 24
-                    )
-                    | (
-                        (
-                            int(255 * (vals_red[ind] - val_min_red) / vals_range_red)
-                            << 16
-                        )
-                        if vals_range_red != 0
-                        else int(vals_red[ind]) << 16
-                    )
-                    | (
-                        int(255 * (vals_green[ind] - val_min_green) / vals_range_green)
-                        << 8
-                        if vals_range_green != 0
-                        else int(vals_green[ind]) << 8
-                    )
-                    | (
-                        int(255 * (vals_blue[ind] - val_min_blue) / vals_range_blue)
-                        if vals_range_blue != 0
-                        else int(vals_blue[ind])
-                    )
-                )
-                if (
-                    vals_red[ind] != val_na_red
-                    and vals_green[ind] != val_na_green
-                    and vals_blue[ind] != val_na_blue
-                )
-                else (0 << 24) | (0 << 16) | (0 << 8) | 0
+        if vals_alpha is None or vals_range_alpha == 0:
+            alpha = 255 << 24
+        else:
+            alpha = (
+                get_raster_channel_values(vals_alpha, val_min_alpha, vals_range_alpha)
+                << 24
             )
-            for ind, _ in enumerate(rasterBandVals[0])
-            for _ in range(4)
-        ]
+
+        cell_colors = np.where(
+            get_raster_valid_mask(vals_red, val_na_red)
+            & get_raster_valid_mask(vals_green, val_na_green)
+            & get_raster_valid_mask(vals_blue, val_na_blue),
+            alpha
+            | (get_raster_channel_values(vals_red, val_min_red, vals_range_red) << 16)
+            | (
+                get_raster_channel_values(vals_green, val_min_green, vals_range_green)
+                << 8
+            )
+            | get_raster_channel_values(vals_blue, val_min_blue, vals_range_blue),
+            (0 << 24) | (0 << 16) | (0 << 8) | 0,
+        )
+        list_colors = np.repeat(cell_colors, 4)
 
     elif rendererType == "paletted":
         try:
@@ -446,28 +564,15 @@ def get_raster_colors(
                 for class_ind in range(len(renderer_classes))
             ]
 
-            for val in rasterBandVals[bandIndex]:
-                rgb = None
-                color = (0 << 24) | (0 << 16) | (0 << 8) | 0
-
-                for class_ind in range(len(renderer_classes)):
-                    if rasterBandVals[bandIndex] == rasterBandNoDataVal[bandIndex]:
-                        rgb = None
-                    elif class_ind < len(renderer_classes) - 1:
-                        if val >= float(
-                            renderer_classes[class_ind].value
-                        ) and val < float(renderer_classes[class_ind + 1].value):
-                            rgb = class_rgbs[class_ind]
-                    elif class_ind == len(renderer_classes) - 1 and val >= float(
-                        renderer_classes[class_ind].value
-                    ):
-                        rgb = class_rgbs[class_ind]
-
-                if rgb is not None:
-                    color = (255 << 24) | (rgb[0] << 16) | (rgb[1] << 8) | rgb[2]
-
-                # add color value after looping through classes/categories
-                list_colors.extend([color, color, color, color])
+            class_values = [float(c.value) for c in renderer_classes]
+
+            cell_colors = get_raster_class_colors(
+                rasterBandVals[bandIndex],
+                class_values,
+                class_rgbs,
+                rasterBandNoDataVal[bandIndex],
+            )
+            list_colors = np.repeat(cell_colors, 4)
 
         except Exception as e:
             # log warning, but don't prevent conversion
@@ -498,28 +603,15 @@ def get_raster_colors(
                 for class_ind in range(len(renderer_classes))
             ]
 
-            for val in rasterBandVals[bandIndex]:
-                rgb = None
-                color = (0 << 24) | (0 << 16) | (0 << 8) | 0
-
-                for class_ind in range(len(renderer_classes)):
-                    if rasterBandVals[bandIndex] == rasterBandNoDataVal[bandIndex]:
-                        rgb = None
-                    elif class_ind < len(renderer_classes) - 1:
-                        if val >= float(renderer_classes[class_ind][0]) and val < float(
-                            renderer_classes[class_ind + 1][0]
-                        ):
-                            rgb = class_rgbs[class_ind]
-                    elif class_ind == len(renderer_classes) - 1 and val >= float(
-                        renderer_classes[class_ind][0]
-                    ):
-                        rgb = class_rgbs[class_ind]
-
-                if rgb is not None:
-                    color = (255 << 24) | (rgb[0] << 16) | (rgb[1] << 8) | rgb[2]
-
-                # add color value after looping through classes/categories
-                list_colors.extend([color, color, color, color])
+            class_values = [float(c[0]) for c in renderer_classes]
+
+            cell_colors = get_raster_class_colors(
+                rasterBandVals[bandIndex],
+                class_values,
+                class_rgbs,
+                rasterBandNoDataVal[bandIndex],
+            )
+            list_colors = np.repeat(cell_colors, 4)
 
         except Exception as e:
             # log warning, but don't prevent conversion
@@ -551,126 +643,192 @@ def get_raster_colors(
         pixMax = rasterBandMaxVal[0]
         vals_range = pixMax - pixMin
 
-        vals_alpha = [
-            1 if val != rasterBandNoDataVal[0] else 0 for val in rasterBandVals[0]
-        ]
-        vals_range_alpha = 0
-        val_min_alpha = 0
-        try:
-            val_min_alpha = min(vals_alpha)
-            vals_range_alpha = max(vals_alpha) - val_min_alpha
-            if vals_alpha is not None and 0 in vals_alpha:
-                have_transparent_cells = True
-        except:
-            pass
+        # cells with data are fully opaque, NoData cells are transparent
+        valid_mask = get_raster_valid_mask(rasterBandVals[0], rasterBandNoDataVal[0])
+        if not np.all(valid_mask):
+            have_transparent_cells = True
 
-        list_colors: List[int] = [
-            (
-                (
-                    255 << 24
-                    if vals_range_alpha == 0
-                    else int(255 * (vals_alpha[ind] - val_min_alpha) / vals_range_alpha)
-                    << 24
-                )
-                | (int(255 * (rasterBandVals[0][ind] - pixMin) / vals_range) << 16)
-                | (int(255 * (rasterBandVals[0][ind] - pixMin) / vals_range) << 8)
-                | int(255 * (rasterBandVals[0][ind] - pixMin) / vals_range)
-                if rasterBandVals[0][ind] != rasterBandNoDataVal[0]
-                else (0 << 24) | (0 << 16) | (0 << 8) | 0
-            )
-            for ind, _ in enumerate(rasterBandVals[0])
-            for _ in range(4)
-        ]
+        if vals_range != 0:
+            grey = get_raster_channel_values(rasterBandVals[0], pixMin, vals_range)
+        else:
+            grey = np.zeros(len(valid_mask), dtype=np.int64)
 
-    return list_colors, have_transparent_cells
+        cell_colors = np.where(
+            valid_mask,
+            (255 << 24) | (grey << 16) | (grey << 8) | grey,
+            (0 << 24) | (0 << 16) | (0 << 8) | 0,
+        )
+        list_colors = np.repeat(cell_colors, 4)
 
+    return np.asarray(list_colors, dtype=np.int64), have_transparent_cells
 
-def get_vertices_height(
-    vertices_filtered: List[float],
-    xy_z_values: dict,
-    vertices_list_index: int,
-    height_array,
-    indices: tuple,
-):
-    index1, index1_0, index2, index2_0 = indices
-    # top vertices ######################################
-    try:
-        z1 = xy_z_values[
-            (
-                vertices_filtered[vertices_list_index],
-                vertices_filtered[vertices_list_index + 1],
-            )
-        ]
-    except KeyError:
-        if index1 > 0 and index2 > 0:
-            z1 = height_array[index1_0][index2_0]
-        elif index1 > 0:
-            z1 = height_array[index1_0][index2]
-        elif index2 > 0:
-            z1 = height_array[index1][index2_0]
-        else:
-            z1 = height_array[index1][index2]
 
-        if z1 is not None:
-            xy_z_values[
-                (
-                    vertices_filtered[vertices_list_index],
-                    vertices_filtered[vertices_list_index + 1],
-                )
-            ] = z1
+def get_vertices_height(height_array, indices: tuple) -> np.ndarray:
+    """Returns heights of all raster cell corners, array larger by 1 than the raster size in both dimensions."""
+    index1, index1_0, index2, index2_0, valid = indices
+    rows, cols = index1.shape
 
-    #################### z4
-    try:
-        z4 = xy_z_values[
-            (
-                vertices_filtered[vertices_list_index + 9],
-                vertices_filtered[vertices_list_index + 10],
-            )
-        ]
-    except:
-        if index1 > 0:
-            z4 = height_array[index1_0][index2]
-        else:
-            z4 = height_array[index1][index2]
+    def heights_at(ind1, ind2, mask):
+        return np.where(mask, height_array[ind1, ind2], np.nan)
 
-        if z4 is not None:
-            xy_z_values[
-                (
-                    vertices_filtered[vertices_list_index + 9],
-                    vertices_filtered[vertices_list_index + 10],
-                )
-            ] = z4
+    array_z = np.empty((rows + 1, cols + 1), dtype=float)
+    # bottom-right corner of each cell
+    array_z[1:, 1:] = heights_at(index1, index2, valid)
+    # top corners of the first row
+    array_z[0, 1:] = heights_at(
+        np.where(index1[0] > 0, index1_0[0], index1[0]), index2[0], valid[0]
+    )
+    # left corners of the first column
+    array_z[1:, 0] = heights_at(
+        index1[:, 0], np.where(index2[:, 0] > 0, index2_0[:, 0], index2[:, 0]), valid[:, 0]
+    )
+    # top-left corner of the raster
+    array_z[0, 0] = heights_at(
+        index1_0[0, 0] if index1[0, 0] > 0 else index1[0, 0],
+        index2_0[0, 0] if index2[0, 0] > 0 else index2[0, 0],
+        valid[0, 0],
+    )
+    return array_z
 
-    # bottom vertices ######################################
-    z3 = height_array[index1][index2]
-    if z3 is not None:
-        xy_z_values[
-            (
-                vertices_filtered[vertices_list_index + 6],
-                vertices_filtered[vertices_list_index + 7],
-            )
-        ] = z3
 
-    try:
-        z2 = xy_z_values[
-            (
-                vertices_filtered[vertices_list_index + 3],
-                vertices_filtered[vertices_list_index + 4],
-            )
-        ]
-    except:
-        if index2 > 0:
-            z2 = height_array[index1][index2_0]
-        else:
-            z2 = height_array[index1][index2]
-        if z2 is not None:
-            xy_z_values[
-                (
-                    vertices_filtered[vertices_list_index + 3],
-                    vertices_filtered[vertices_list_index + 4],
-                )
-            ] = z2
-    return z1, z2, z3, z4
+def get_smoothed_heights(array_z: np.ndarray, sigma: float) -> np.ndarray:
+    """Fills unknown (NaN) corner heights by interpolation and smoothens them with a gaussian filter."""
+    array_z_filled = array_z.copy()
+    mask = np.isnan(array_z_filled)
+    array_z_filled[mask] = np.interp(
+        np.flatnonzero(mask), np.flatnonzero(~mask), array_z_filled[~mask]
+    )
+    return sp.ndimage.gaussian_filter(array_z_filled, sigma, mode="nearest")
+
+
+def get_raster_tile_halo(window, rasterSize, sigma: float) -> Tuple[int, int, int, int]:
+    """Returns number of cells (left, top, right, bottom) read around the tile for heights:
+    the cell shared with the previous tile and the radius of the gaussian filter,
+    so that the tile edges get the same heights as the neighbouring tiles."""
+    xoff, yoff, xsize, ysize = window
+    # gaussian_filter is truncated at 4 sigma
+    halo = int(4.0 * sigma + 0.5) + 1
+    return (
+        min(halo, xoff),
+        min(halo, yoff),
+        min(halo, rasterSize[0] - xoff - xsize),
+        min(halo, rasterSize[1] - yoff - ysize),
+    )
+
+
+def get_raster_tile_heights(
+    height_array, indices: tuple, halo: tuple, tileSize, sigma: float
+) -> Tuple[np.ndarray, Union[np.ndarray, None], np.ndarray]:
+    """Returns corner heights of the tile, smoothed corner heights (None if too few) and
+    the mask of cells within the elevation extent. Indices include the halo around
+    the tile, which is cropped after smoothing."""
+    left, top, _, _ = halo
+    rows, cols = tileSize[1], tileSize[0]
+    array_z = get_vertices_height(height_array, indices)
+    smoothed = None
+    if array_z.shape[1] > 2 and array_z.shape[0] > 2:
+        smoothed = get_smoothed_heights(array_z, sigma)
+        smoothed = smoothed[top : top + rows + 1, left : left + cols + 1]
+    cells_within = indices[4][top : top + rows, left : left + cols]
+    return array_z[top : top + rows + 1, left : left + cols + 1], smoothed, cells_within
+
+
+def set_raster_cells_height(
+    vertices: np.ndarray, heights: np.ndarray, cells_known: np.ndarray
+) -> None:
+    """Writes corner heights to the flat vertex array (4 vertices per cell) in place,
+    for the cells with known top-left height."""
+    rows, cols = cells_known.shape
+    cells_z = vertices.reshape(rows, cols, 4, 3)[:, :, :, 2]
+    cells_z[:, :, 0][cells_known] = heights[:-1, :-1][cells_known]
+    cells_z[:, :, 1][cells_known] = heights[1:, :-1][cells_known]
+    cells_z[:, :, 2][cells_known] = heights[1:, 1:][cells_known]
+    cells_z[:, :, 3][cells_known] = heights[:-1, 1:][cells_known]
+
+
+def is_raster_nodata_replaced(defaultNoData, valMin) -> bool:
+    """Whether the NoData value of the band is too small or unavailable, and needs to be replaced."""
+    const = float(-1 * math.pow(10, 30))
+    if isinstance(defaultNoData, (float, int)):
+        return defaultNoData < const
+    return (isinstance(defaultNoData, str) or defaultNoData is None) and valMin < const
+
+
+def get_raster_band_value_range(values) -> Tuple[Union[float, None], float]:
+    """Returns min of the actual (not extremely small) band values, or None, and max of all values."""
+    values = np.asarray(values).ravel()
+    const = float(-1 * math.pow(10, 30))
+    actual_values = values[values > const]
+    if np.issubdtype(values.dtype, np.floating):
+        actual_values = actual_values[~np.isnan(actual_values)]
+    actualMin = actual_values.min().item() if actual_values.size > 0 else None
+    return actualMin, np.nanmax(values).item()
+
+
+def get_raster_band_actual_min(value_ranges: List[Tuple]) -> float:
+    """Returns min of the actual band values from the ranges of all tiles."""
+    actual_mins = [r[0] for r in value_ranges if r[0] is not None]
+    if len(actual_mins) > 0:
+        return min(actual_mins)
+    # all values replaced with a "safe" fake NA value
+    return max(r[1] for r in value_ranges) + 1
+
+
+def get_raster_band_nodata(defaultNoData, valMin, valMax, actualMin) -> Tuple:
+    """Returns new NoData value, min and max of the band, if the default NoData value needs to be replaced."""
+    const = float(-1 * math.pow(10, 30))
+    # if default NA value is too small
+    if isinstance(defaultNoData, (float, int)) and defaultNoData < const:
+        # rewrite min of actual band values; create new NA value
+        return actualMin - 1000, actualMin, valMax
+    # if default val unaccessible and minimum val is too small
+    elif (isinstance(defaultNoData, str) or defaultNoData is None) and valMin < const:
+        # last, change minVal to actual one
+        return valMin, actualMin, valMax
+    return defaultNoData, valMin, valMax
+
+
+def normalize_raster_band_values(values, defaultNoData, valMin, valMax, actualMin=None):
+    """Replaces extremely small band values with an adequate NoData value, if the default one is too small or unavailable.
+    Min of the actual values is taken from the whole band if given, otherwise from the values.
+    Returns band values, NoData value, min and max."""
+    values = np.asarray(values).ravel()
+    if values.size == 0 or not is_raster_nodata_replaced(defaultNoData, valMin):
+        return values, defaultNoData, valMin, valMax
+
+    if actualMin is None:
+        actualMin = get_raster_band_actual_min([get_raster_band_value_range(values)])
+    noDataValNew, valMin, valMax = get_raster_band_nodata(
+        defaultNoData, valMin, valMax, actualMin
+    )
+
+    # replace list items to new NA val
+    const = float(-1 * math.pow(10, 30))
+    extreme_mask = values <= const
+    if np.any(extreme_mask):
+        values = np.where(extreme_mask, noDataValNew, values.astype(float))
+    return values, noDataValNew, valMin, valMax
+
+
+def get_raster_band_stats(selectedLayer, ds, index: int, tiles: List) -> Dict:
+    """Returns NoData value, min and max of the whole raster band, shared by all its tiles."""
+    # note: raster stats can be messed up and are not reliable (e.g. Min is larger than Max)
+    stats = selectedLayer.dataProvider().bandStatistics(
+        index + 1, QgsRasterBandStats.All
+    )
+    rb = ds.GetRasterBand(index + 1)
+    band_stats = {
+        "noData": rb.GetNoDataValue(),
+        "min": stats.minimumValue,
+        "max": stats.maximumValue,
+        "actualMin": None,
+    }
+    if is_raster_nodata_replaced(band_stats["noData"], band_stats["min"]):
+        # only 1 tile is read at a time
+        band_stats["actualMin"] = get_raster_band_actual_min(
+            [get_raster_band_value_range(rb.ReadAsArray(*window)) for window in tiles]
+        )
+    return band_stats
 
 
 def get_raster_band_data(
@@ -682,79 +840,68 @@ def get_raster_band_data(
     rasterBandVals,
     rasterBandMinVal,
     rasterBandMaxVal,
-) -> List[float]:
+    window=None,
+    band_stats=None,
+) -> np.ndarray:
     rasterBandNames.append(selectedLayer.bandName(index + 1))
-    rb = ds.GetRasterBand(index + 1)
-
-    # note: raster stats can be messed up and are not reliable (e.g. Min is larger than Max)
-    valMin = (
-        selectedLayer.dataProvider()
-        .bandStatistics(index + 1, QgsRasterBandStats.All)
-        .minimumValue
-    )
-    valMax = (
-        selectedLayer.dataProvider()
-        .bandStatistics(index + 1, QgsRasterBandStats.All)
-        .maximumValue
-    )
-    bandVals = rb.ReadAsArray().tolist()
-
-    bandValsFlat = []
-    [bandValsFlat.extend(item) for item in bandVals]
-    # look at mesh chunking
-
-    const = float(-1 * math.pow(10, 30))
-    defaultNoData = rb.GetNoDataValue()
-    # print(type(rb.GetNoDataValue()))
-
-    # check whether NA value is too small or raster has too small values
-    # assign min value of an actual list; re-assign NA val; replace list items to new NA val
-    try:
-        # create "safe" fake NA value; replace extreme values with it
-        fakeNA = max(bandValsFlat) + 1
-        bandValsFlatFake = [
-            fakeNA if val <= const else val for val in bandValsFlat
-        ]  # replace all values corresponding to NoData value
 
-        # if default NA value is too small
-        if (
-            isinstance(defaultNoData, float) or isinstance(defaultNoData, int)
-        ) and defaultNoData < const:
-            # find and rewrite min of actual band values; create new NA value
-            valMin = min(bandValsFlatFake)
-            noDataValNew = valMin - 1000  # use new adequate value
-            rasterBandNoDataVal.append(noDataValNew)
-            # replace fake NA with new NA
-            bandValsFlat = [
-                noDataValNew if val == fakeNA else val for val in bandValsFlatFake
-            ]  # replace all values corresponding to NoData value
-
-        # if default val unaccessible and minimum val is too small
-        elif (
-            isinstance(defaultNoData, str) or defaultNoData is None
-        ) and valMin < const:  # if there are extremely small values but default NA unaccessible
-            noDataValNew = valMin
-            rasterBandNoDataVal.append(noDataValNew)
-            # replace fake NA with new NA
-            bandValsFlat = [
-                noDataValNew if val == fakeNA else val for val in bandValsFlatFake
-            ]  # replace all values corresponding to NoData value
-            # last, change minValto actual one
-            valMin = min(bandValsFlatFake)
+    if window is None:
+        band_data = getCachedRasterBand(selectedLayer, index)
+    else:  # only read the tile (xoff, yoff, xsize, ysize)
+        rb = ds.GetRasterBand(index + 1)
+        band_data = {"array": rb.ReadAsArray(*window), "noData": rb.GetNoDataValue()}
 
-        else:
-            rasterBandNoDataVal.append(rb.GetNoDataValue())
-    except:
-        rasterBandNoDataVal.append(rb.GetNoDataValue())
+    if band_stats is None:
+        # note: raster stats can be messed up and are not reliable (e.g. Min is larger than Max)
+        stats = selectedLayer.dataProvider().bandStatistics(
+            index + 1, QgsRasterBandStats.All
+        )
+        band_stats = {
+            "noData": band_data["noData"],
+            "min": stats.minimumValue,
+            "max": stats.maximumValue,
+            "actualMin": None,
+        }
+    # not cached: only the raw band is kept while the layer is converted
+    bandValsFlat, noDataVal, valMin, valMax = normalize_raster_band_values(
+        band_data["array"],
+        band_stats["noData"],
+        band_stats["min"],
+        band_stats["max"],
+        band_stats["actualMin"],
+    )
 
+    rasterBandNoDataVal.append(noDataVal)
     rasterBandVals.append(bandValsFlat)
     rasterBandMinVal.append(valMin)
     rasterBandMaxVal.append(valMax)
     return bandValsFlat
 
 
+def get_height_array_from_band_values(band_values, no_data_value, shape):
+    array_band = np.asarray(band_values, dtype=float).reshape(shape)
+    const = float(-1 * math.pow(10, 30))
+    return np.where(
+        (array_band < const)
+        | (array_band > -1 * const)
+        | (array_band == no_data_value)
+        | (np.isinf(array_band)),
+        np.nan,
+        array_band,
+    )
+
+
+def get_height_array_from_raster_window(ds, window):
+    """Reads heights from the first band within the window (xoff, yoff, xsize, ysize)."""
+    rb = ds.GetRasterBand(1)
+    # extremely small values (replaced NoData) are unknown heights as well
+    return get_height_array_from_band_values(
+        rb.ReadAsArray(*window), rb.GetNoDataValue(), (window[3], window[2])
+    )
+
+
 def get_height_array_from_elevation_layer(elevationLayer):
-    elevation_arrays, _, _, all_na = getRasterArrays(elevationLayer)
+    (elevation_arrays, _, _, all_na), _ = getCachedElevationData(elevationLayer)
     if elevation_arrays is None:
         return None
     array_band = elevation_arrays[0]
@@ -896,8 +1043,7 @@ def get_elevation_indices(
     rasterResXY_reprojected,
     reprojectedOriginX,
     reprojectedOriginY,
-    h,
-    v,
+    rasterDimensions,
     elevationResX,
     elevationResY,
     elevationOriginX,
@@ -905,6 +1051,8 @@ def get_elevation_indices(
     elevationSizeX,
     elevationSizeY,
 ):
+    """Returns elevation array indices for every raster cell, and a mask of cells within the elevation extent."""
+    v, h = np.indices((rasterDimensions[1], rasterDimensions[0]))
     if texture_transform is True:  # texture
         # index1: index on y-scale
         posX, posY = getXYofArrayPoint(
@@ -914,42 +1062,112 @@ def get_elevation_indices(
             h,
             v,
         )
-
-        index1, index2, _, _ = getArrayIndicesFromXY(
-            (
-                elevationResX,
-                elevationResY,
-                elevationOriginX,
-                elevationOriginY,
-                elevationSizeX,
-                elevationSizeY,
-                None,
-                None,
-            ),
-            posX,
-            posY,
+        elevation_settings = (
+            elevationResX,
+            elevationResY,
+            elevationOriginX,
+            elevationOriginY,
+            elevationSizeX,
+            elevationSizeY,
+            None,
+            None,
         )
-
-        index1_0, index2_0, _, _ = getArrayIndicesFromXY(
-            (
-                elevationResX,
-                elevationResY,
-                elevationOriginX,
-                elevationOriginY,
-                elevationSizeX,
-                elevationSizeY,
-                None,
-                None,
-            ),
+        index1, index2, valid = getArrayIndicesFromXYArrays(
+            elevation_settings, posX, posY
+        )
+        index1_0, index2_0, valid_0 = getArrayIndicesFromXYArrays(
+            elevation_settings,
             posX - rasterResXY[0],
             posY - rasterResXY[1],
         )
+        valid &= valid_0
     else:  # elevation
         index1 = v
         index1_0 = v - 1
         index2 = h
         index2_0 = h - 1
-    return index1, index1_0, index2, index2_0
+        valid = np.ones(v.shape, dtype=bool)
+    return index1, index1_0, index2, index2_0, valid
+
+
+def remove_transparent_raster_cells(vertices, faces, colors):
+    """Removes raster cells (4 vertices each) with a fully transparent first vertex, and remaps the faces."""
+    colors = np.asarray(colors, dtype=np.int64).reshape(-1, 4)
+    cells_visible = ((colors[:, 0] & 0xFF000000) >> 24) != 0
+
+    # new index of each visible cell; vertex index = 4 * cell index + corner
+    cells_remapping = np.cumsum(cells_visible) - 1
+
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 5)
+    faces = faces[cells_visible[faces[:, 1] // 4]]
+    faces[:, 1:] = 4 * cells_remapping[faces[:, 1:] // 4] + faces[:, 1:] % 4
+
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 12)[cells_visible]
+    return vertices.ravel(), faces.ravel(), colors[cells_visible].ravel()
+
+
+def rasterFeaturesToSpeckle(
+    selectedLayer: "QgsRasterLayer",
+    projectCRS: "QgsCoordinateReferenceSystem",
+    project: "QgsProject",
+    plugin,
+    displayOrder: Optional[int] = None,
+) -> List[Base]:
+    """Converts raster layer to Speckle, one element per tile if the raster doesn't fit the memory budget.
+    Tiles are serialized to the local cache as soon as they are converted."""
+    dataStorage = plugin.dataStorage
+    if dataStorage is None:
+        return
+
+    try:
+        ds = gdal.Open(selectedLayer.source(), gdal.GA_ReadOnly)
+        tiles = get_raster_tiles(
+            selectedLayer.width(),
+            selectedLayer.height(),
+            selectedLayer.bandCount(),
+            ds.GetRasterBand(1).GetBlockSize(),
+            getattr(dataStorage, "raster_memory_budget", None),
+        )
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        tiles = [None]
+
+    try:
+        if len(tiles) == 1:
+            b = rasterFeatureToSpeckle(selectedLayer, projectCRS, project, plugin)
+            if b is not None:
+                b.applicationId = f"{selectedLayer.id()}_0"
+            return [b]
+
+        logToUser(
+            f"Raster layer '{selectedLayer.name()}' will be sent in {len(tiles)} tiles",
+            level=0,
+            plugin=plugin.dockwidget,
+        )
+        # NoData value, min and max are the same for all tiles
+        band_stats = [
+            get_raster_band_stats(selectedLayer, ds, index, tiles)
+            for index in range(selectedLayer.bandCount())
+        ]
+        ds = None
+
+        elements = []
+        for i, window in enumerate(tiles):
+            CANCELLATION_TOKEN.check()
+            show_progress(i, len(tiles), selectedLayer.name(), plugin)
+            b = rasterFeatureToSpeckle(
+                selectedLayer, projectCRS, project, plugin, window, band_stats
+            )
+            if b is None:
+                return None
+            b.applicationId = f"{selectedLayer.id()}_{i}"
+            if displayOrder is not None:
+                b["displayOrder"] = displayOrder
+            elements.append(cacheObject(b))
+        return elements
+    finally:
+        # band values are not needed after the layer is converted
+        clearRasterBandCache(selectedLayer)
 
 
 def rasterFeatureToSpeckle(
@@ -957,7 +1175,11 @@ def rasterFeatureToSpeckle(
     projectCRS: "QgsCoordinateReferenceSystem",
     project: "QgsProject",
     plugin,
+    window=None,
+    band_stats: Optional[List[Dict]] = None,
 ) -> Base:
+    """Converts raster layer (or its tile, given as xoff, yoff, xsize, ysize) to Speckle.
+    Band stats (NoData value, min and max) of the whole raster are used for the tiles."""
     dataStorage = plugin.dataStorage
     if dataStorage is None:
         return
@@ -972,6 +1194,9 @@ def rasterFeatureToSpeckle(
         texture_transform = isAppliedLayerTransformByKeywords(
             selectedLayer, ["texture"], [], dataStorage
         )
+        grid_transform = isAppliedLayerTransformByKeywords(
+            selectedLayer, ["grid", "mesh"], [], dataStorage
+        )
         if terrain_transform is True or texture_transform is True:
             b = GisTopography(units=dataStorage.currentUnits)
 
@@ -984,6 +1209,12 @@ def rasterFeatureToSpeckle(
         originX = ds.GetGeoTransform()[0]
         originY = ds.GetGeoTransform()[3]
 
+        if window is not None:
+            xoff, yoff, xsize, ysize = window
+            rasterDimensions = [xsize, ysize]
+            originX += xoff * rasterResXY[0]
+            originY += yoff * rasterResXY[1]
+
         reprojected_raster_stats = get_raster_reprojected_stats(
             project,
             projectCRS,
@@ -1014,6 +1245,7 @@ def rasterFeatureToSpeckle(
         rasterBandVals = []
         rasterBandNames = []
         for index in range(rasterBandCount):
+            CANCELLATION_TOKEN.check()
             bandValsFlat = get_raster_band_data(
                 selectedLayer,
                 ds,
@@ -1023,9 +1255,11 @@ def rasterFeatureToSpeckle(
                 rasterBandVals,
                 rasterBandMinVal,
                 rasterBandMaxVal,
+                window,
+                None if band_stats is None else band_stats[index],
             )
             b["@(10000)" + selectedLayer.bandName(index + 1) + "_values"] = (
-                bandValsFlat  # [0:int(max_values/rasterBandCount)]
+                bandValsFlat.tolist()  # [0:int(max_values/rasterBandCount)]
             )
 
         b.x_resolution = rasterResXY[0]
@@ -1039,7 +1273,6 @@ def rasterFeatureToSpeckle(
         b.noDataValue = rasterBandNoDataVal
 
         # creating a mesh
-        xy_z_values: Dict[tuple, float] = {}
         #############################################################
 
         elevationLayer = None
@@ -1122,7 +1355,27 @@ def rasterFeatureToSpeckle(
                 elevationLayer = elevation_layer_original
                 #################
 
-        if elevationLayer is not None:
+        sigma = 0.8  # for elevation
+        if texture_transform is True:
+            sigma = 1  # for texture
+
+        # tiles take heights around them, so that the edges match the neighbouring tiles
+        halo = (0, 0, 0, 0)
+        heightsDimensions = rasterDimensions
+        if window is not None:
+            halo = get_raster_tile_halo(
+                window, [selectedLayer.width(), selectedLayer.height()], sigma
+            )
+            heightsDimensions = [
+                rasterDimensions[0] + halo[0] + halo[2],
+                rasterDimensions[1] + halo[1] + halo[3],
+            ]
+
+        if terrain_transform is True and window is not None:
+            height_array = get_height_array_from_raster_window(
+                ds, (xoff - halo[0], yoff - halo[1], *heightsDimensions)
+            )
+        elif elevationLayer is not None:
             height_array = get_height_array_from_elevation_layer(elevationLayer)
             if height_array is None:
                 logToUser(
@@ -1131,41 +1384,28 @@ def rasterFeatureToSpeckle(
                     plugin=plugin.dockwidget,
                 )
 
-        largeTransform = False
-        if (
-            texture_transform is True
-            and height_array is not None
-            and rasterDimensions[1] * rasterDimensions[0] >= 250000
-        ):
-            # warning if >= 500x500 raster is being projected to any elevation
-            logToUser(
-                f"Texture transformation for the layer '{selectedLayer.name()}' might take a while 🕒",
-                level=0,
-                plugin=plugin.dockwidget,
-            )
-            largeTransform = True
         ############################################################
-        array_z = []  # size is larger by 1 than the raster size, in both dimensions
-
         faces_filtered = []
         colors_filtered = []
         vertices_filtered = []
 
         # construct mesh
         band1_values = rasterBandVals[0]
-        list_nested = [
-            (4, 4 * ind, 4 * ind + 1, 4 * ind + 2, 4 * ind + 3)
-            for ind, _ in enumerate(band1_values)
-        ]  # heavy function
-        faces_filtered = [
-            item for sublist in list_nested for item in sublist
-        ]  # heavy function
-        vertices_filtered = get_raster_mesh_coords(
-            reprojected_raster_stats,
-            rasterResXY_reprojected,
-            band1_values,
-            dataStorage,
-        )  # fast
+        gridSizeX = rasterDimensions_reprojected[0]
+        gridSizeY = len(band1_values) // gridSizeX
+        if grid_transform is True:
+            faces_filtered = get_raster_grid_mesh_faces(gridSizeX, gridSizeY)
+            vertices_filtered = get_raster_grid_mesh_coords(
+                reprojected_raster_stats, rasterResXY_reprojected, len(band1_values)
+            )
+        else:
+            faces_filtered = get_raster_mesh_faces(len(band1_values))
+            vertices_filtered = get_raster_mesh_coords(
+                reprojected_raster_stats,
+                rasterResXY_reprojected,
+                band1_values,
+                dataStorage,
+            )  # fast
         rendererType = selectedLayer.renderer().type()
         colors_filtered, have_transparent_cells = get_raster_colors(
             selectedLayer,
@@ -1177,111 +1417,41 @@ def rasterFeatureToSpeckle(
             plugin,
         )  # fast
         ###############################################################################
-        if texture_transform is True or terrain_transform is True:
-            for v in range(rasterDimensions[1]):  # each row, Y
-                if largeTransform is True:
-                    show_progress(v, rasterDimensions[1], selectedLayer.name(), plugin)
-
-                row_z = []
-                row_z_bottom = []
-                for h in range(rasterDimensions[0]):  # item in a row, X
-                    vertices_list_index = 3 * 4 * (v * rasterDimensions[0] + h)
-                    colors_list_index = 4 * (v * rasterDimensions[0] + h)
-
-                    z1 = z2 = z3 = z4 = 0
-                    index1 = index1_0 = None
-
-                    #############################################################
-                    if height_array is not None:
-                        index1, index1_0, index2, index2_0 = get_elevation_indices(
-                            texture_transform,
-                            rasterResXY,
-                            rasterResXY_reprojected,
-                            reprojectedOriginX,
-                            reprojectedOriginY,
-                            h,
-                            v,
-                            elevationResX,
-                            elevationResY,
-                            elevationOriginX,
-                            elevationOriginY,
-                            elevationSizeX,
-                            elevationSizeY,
-                        )
-                        if index1 is None or index1_0 is None:
-                            z1 = z2 = z3 = z4 = np.nan
-                        else:
-                            z1, z2, z3, z4 = get_vertices_height(
-                                vertices_filtered,
-                                xy_z_values,
-                                vertices_list_index,
-                                height_array,
-                                (index1, index1_0, index2, index2_0),
-                            )
-
-                        ### height list to smoothen later:
-                        if h == 0:
-                            row_z.append(z1)
-                            row_z_bottom.append(z2)
-                        row_z.append(z4)
-                        row_z_bottom.append(z3)
-
-                    # color vertices according to QGIS renderer
-                    if height_array is not None and (
-                        index1 is None or index1_0 is None
-                    ):  # transparent color
-                        colors_filtered[colors_list_index] = colors_filtered[
-                            colors_list_index + 1
-                        ] = colors_filtered[colors_list_index + 2] = colors_filtered[
-                            colors_list_index + 3
-                        ] = (
-                            (0 << 24) | (0 << 16) | (0 << 8) | 0
-                        )
-
-                if terrain_transform is True or texture_transform is True:
-                    if v == 0:
-                        array_z.append(row_z)
-                    array_z.append(row_z_bottom)
-
-        ## smoothen z-values
         if (
-            (terrain_transform is True or texture_transform is True)
-            and len(row_z) > 2
-            and len(array_z) > 2
-        ):
-            array_z_nans = np.array(array_z)
-
-            array_z_filled = np.array(array_z)
-            mask = np.isnan(array_z_filled)
-            array_z_filled[mask] = np.interp(
-                np.flatnonzero(mask), np.flatnonzero(~mask), array_z_filled[~mask]
+            texture_transform is True or terrain_transform is True
+        ) and height_array is not None:
+            elevation_indices = get_elevation_indices(
+                texture_transform,
+                rasterResXY,
+                rasterResXY_reprojected,
+                reprojectedOriginX - halo[0] * rasterResXY_reprojected[0],
+                reprojectedOriginY - halo[1] * rasterResXY_reprojected[1],
+                heightsDimensions,
+                elevationResX,
+                elevationResY,
+                elevationOriginX,
+                elevationOriginY,
+                elevationSizeX,
+                elevationSizeY,
             )
-
-            sigma = 0.8  # for elevation
-            if texture_transform is True:
-                sigma = 1  # for texture
-
-            gaussian_array = sp.ndimage.filters.gaussian_filter(
-                array_z_filled, sigma, mode="nearest"
+            # size is larger by 1 than the raster size, in both dimensions
+            # (smoothed z-values as well)
+            array_z, gaussian_array, cells_within = get_raster_tile_heights(
+                height_array, elevation_indices, halo, rasterDimensions, sigma
             )
 
-            # update vertices_filtered with z-value
-            for v in range(rasterDimensions[1]):  # each row, Y
-                for h in range(rasterDimensions[0]):  # item in a row, X
-                    vertices_list_index = 3 * 4 * (v * rasterDimensions[0] + h)
-                    if not np.isnan(array_z_nans[v][h]):
-                        vertices_filtered[vertices_list_index + 2] = gaussian_array[v][
-                            h
-                        ]
-                        vertices_filtered[vertices_list_index + 5] = gaussian_array[
-                            v + 1
-                        ][h]
-                        vertices_filtered[vertices_list_index + 8] = gaussian_array[
-                            v + 1
-                        ][h + 1]
-                        vertices_filtered[vertices_list_index + 11] = gaussian_array[v][
-                            h + 1
-                        ]
+            # cells outside of the elevation layer get transparent color
+            cells_outside = ~cells_within.ravel()
+            if np.any(cells_outside):
+                colors_filtered.reshape(-1, 4)[cells_outside] = (
+                    (0 << 24) | (0 << 16) | (0 << 8) | 0
+                )
+
+            if gaussian_array is not None:
+                # update vertices_filtered with z-value, for cells with known top-left height
+                # (not for grid meshes: only 1 transformation is applied per layer)
+                cells_known = ~np.isnan(array_z[:-1, :-1])
+                set_raster_cells_height(vertices_filtered, gaussian_array, cells_known)
 
         # apply offset & rotation
         vertices_filtered2 = apply_offset_rotation_to_vertices_send(
@@ -1289,56 +1459,52 @@ def rasterFeatureToSpeckle(
         )
 
         # delete faces using invisible vertices
-        if have_transparent_cells is True:
-            vertices_filtered_removed = []
-            colors_filtered_removed = []
-            deleted_vert = []
-            vertex_remapping = {}
-
-            for i, color in enumerate(colors_filtered):
-                if i % 4 != 0:  # only look a the first vertex of a square
-                    if vertex_remapping[i - 1] is None:
-                        vertex_remapping[i] = None
-                        deleted_vert.append(i)
-                    else:
-                        vertex_remapping[i] = vertex_remapping[i - 1] + 1
-                    continue
-                a, _, _, _ = get_a_r_g_b(color)
-                if a != 0:
-                    colors_filtered_removed.extend(colors_filtered[i : i + 4])
-                    vertices_filtered_removed.extend(
-                        vertices_filtered2[3 * i : 3 * i + 12]
-                    )
-                    vertex_remapping[i] = i - len(deleted_vert)
-                else:
-                    deleted_vert.append(i)
-                    vertex_remapping[i] = None
-
-            faces_filtered_removed = []
-            count = 0
-            for f in faces_filtered:
-                if count >= len(faces_filtered):
-                    break
-                # get first vertex color:
-                if vertex_remapping[faces_filtered[count + 1]] is not None:
-                    faces_filtered_removed.append(4)
-                    faces_filtered_removed.append(
-                        vertex_remapping[faces_filtered[count + 1]]
-                    )
-                    faces_filtered_removed.append(
-                        vertex_remapping[faces_filtered[count + 2]]
-                    )
-                    faces_filtered_removed.append(
-                        vertex_remapping[faces_filtered[count + 3]]
-                    )
-                    faces_filtered_removed.append(
-                        vertex_remapping[faces_filtered[count + 4]]
-                    )
-                count += 5
+        if grid_transform is True:
+            cell_colors = np.asarray(colors_filtered, dtype=np.int64).reshape(-1, 4)[
+                :, 0
+            ]
+            vertex_colors = get_raster_grid_vertex_colors(
+                cell_colors, gridSizeX, gridSizeY
+            )
+            if have_transparent_cells is True:
+                cells_visible = ((cell_colors & 0xFF000000) >> 24) != 0
+                (
+                    vertices_filtered_removed,
+                    faces_filtered_removed,
+                    colors_filtered_removed,
+                ) = remove_transparent_grid_cells(
+                    vertices_filtered2, faces_filtered, vertex_colors, cells_visible
+                )
+            else:
+                cells_visible = np.ones(len(cell_colors), dtype=bool)
+                vertices_filtered_removed = vertices_filtered2
+                colors_filtered_removed = vertex_colors
+                faces_filtered_removed = faces_filtered
+
+            # 12 coordinates, 5 face values and 4 colors per cell without shared vertices
+            cells_payload = 21 * int(np.count_nonzero(cells_visible))
+            grid_payload = get_raster_mesh_payload_size(
+                vertices_filtered_removed,
+                faces_filtered_removed,
+                colors_filtered_removed,
+            )
+            logToUser(
+                f"Raster layer '{selectedLayer.name()}' is sent as a grid mesh with shared vertices: {grid_payload} mesh values instead of {cells_payload} ({round(100 * grid_payload / max(cells_payload, 1))}%)",
+                level=0,
+                plugin=plugin.dockwidget,
+            )
+        elif have_transparent_cells is True:
+            (
+                vertices_filtered_removed,
+                faces_filtered_removed,
+                colors_filtered_removed,
+            ) = remove_transparent_raster_cells(
+                vertices_filtered2, faces_filtered, colors_filtered
+            )
         else:
-            vertices_filtered_removed = vertices_filtered2.copy()
-            colors_filtered_removed = colors_filtered.copy()
-            faces_filtered_removed = faces_filtered.copy()
+            vertices_filtered_removed = vertices_filtered2
+            colors_filtered_removed = colors_filtered
+            faces_filtered_removed = faces_filtered
 
         mesh = constructMeshFromRaster(
             vertices_filtered_removed,  # vertices_filtered2,
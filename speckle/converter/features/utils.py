@@ -1,12 +1,21 @@
 import inspect
 import random
 from typing import Any, Union
-from speckle.converter.layers.utils import getVariantFromValue, traverseDict
+from speckle.converter.layers.utils import (
+    getLayerTransform,
+    getVariantFromValue,
+    traverseDict,
+)
 
 from speckle.utils.panel_logging import logToUser
 
 from specklepy.objects import Base
 
+try:
+    from qgis.core import QgsFeatureRequest
+except ModuleNotFoundError:
+    pass
+
 
 def addFeatVariant(key, variant, value, f: "QgsFeature") -> "QgsFeature":
     try:
@@ -103,79 +112,106 @@ def updateFeat(feat: "QgsFeature", fields: "QgsFields", feature: Base) -> "QgsFe
     return feat
 
 
+def getLayerRandom(
+    layer: "QgsVectorLayer", transform: dict, dataStorage
+) -> random.Random:
+    """Returns the random generator for approximated heights of the layer, seeded if
+    the project variable 'speckle_extrusion_height_seed' is set."""
+    rng = transform.get("random")
+    if rng is None:
+        seed = None
+        extrusion_height_seed = getattr(dataStorage, "extrusion_height_seed", None)
+        if extrusion_height_seed is not None:
+            seed = f"{extrusion_height_seed}_{layer.id()}"
+        rng = random.Random(seed)
+        transform["random"] = rng
+    return rng
+
+
+def getFeatureHeightStats(
+    layer: "QgsVectorLayer", attribute: str, transform: dict
+) -> dict:
+    """Collects valid values of the extrusion attribute once per layer (without geometry)."""
+    stats = transform.get("height_stats")
+    if stats is None:
+        stats = {"middle": None}
+        try:
+            request = QgsFeatureRequest()
+            request.setFlags(QgsFeatureRequest.NoGeometry)
+            request.setSubsetOfAttributes([attribute], layer.fields())
+            all_existing_vals = [
+                f[attribute]
+                for f in layer.getFeatures(request)
+                if (
+                    f[attribute] is not None
+                    and (
+                        isinstance(f[attribute], float)
+                        or isinstance(f[attribute], int)
+                    )
+                )
+            ]
+            if len(all_existing_vals) > 5:
+                stats["middle"] = all_existing_vals[int(len(all_existing_vals) / 2)]
+        except Exception as e:
+            logToUser(e, level=2, func=inspect.stack()[0][3])
+        transform["height_stats"] = stats
+    return stats
+
+
 def getPolygonFeatureHeight(
     feature: "QgsFeature", layer: "QgsVectorLayer", dataStorage: "DataStorage"
 ) -> Union[int, float, None]:
     height = None
-    if dataStorage.savedTransforms is not None:
-        for item in dataStorage.savedTransforms:
-            layer_name = item.split("  ->  ")[0].split(" ('")[0]
-
-            ignore = False
-            if layer_name == layer.name():
-                transform_name = item.split("  ->  ")[1].lower()
-                if "ignore" in transform_name:
-                    ignore = True
-
-                attribute = None
-                if " ('" in item:
-                    attribute = item.split(" ('")[1].split("') ")[0]
-
-                if attribute is None and ignore is False:
-                    logToUser(
-                        "Attribute for extrusion not selected",
-                        level=1,
-                        func=inspect.stack()[0][3],
-                    )
+    transform = getLayerTransform(layer, dataStorage)
+    if transform is not None:
+        ignore = transform["ignore"]
+        attribute = transform["attribute"]
+
+        if attribute is None and ignore is False:
+            logToUser(
+                "Attribute for extrusion not selected",
+                level=1,
+                func=inspect.stack()[0][3],
+            )
+            return None
+
+        if transform["extrude"]:
+            # additional check:
+            try:
+                if dataStorage.project.crs().isGeographic():
                     return None
+            except:
+                return None
 
-                # print("Apply transform: " + transform_name)
-                if "extrude" in transform_name and "polygon" in transform_name:
-                    # additional check:
-                    try:
-                        if dataStorage.project.crs().isGeographic():
-                            return None
-                    except:
+            try:
+                existing_height = float(feature[attribute])
+                if (
+                    existing_height is None or str(feature[attribute]) == "NULL"
+                ):  # if attribute value invalid
+                    if ignore is True:
                         return None
-
-                    try:
-                        existing_height = float(feature[attribute])
-                        if (
-                            existing_height is None or str(feature[attribute]) == "NULL"
-                        ):  # if attribute value invalid
-                            if ignore is True:
-                                return None
-                            else:  # find approximate value
-                                all_existing_vals = [
-                                    f[attribute]
-                                    for f in layer.getFeatures()
-                                    if (
-                                        f[attribute] is not None
-                                        and (
-                                            isinstance(f[attribute], float)
-                                            or isinstance(f[attribute], int)
-                                        )
-                                    )
-                                ]
-                                try:
-                                    if len(all_existing_vals) > 5:
-                                        height_average = all_existing_vals[
-                                            int(len(all_existing_vals) / 2)
-                                        ]
-                                        height = random.randint(
-                                            height_average - 5, height_average + 5
-                                        )
-                                    else:
-                                        height = random.randint(10, 20)
-                                except:
-                                    height = random.randint(10, 20)
-                        else:  # if acceptable value: reading from existing attribute
-                            height = existing_height
-
-                    except:  # if no Height attribute
-                        if ignore is True:
-                            height = None
-                        else:
-                            height = random.randint(10, 20)
+                    else:  # find approximate value
+                        height_average = getFeatureHeightStats(
+                            layer, attribute, transform
+                        )["middle"]
+                        rng = getLayerRandom(layer, transform, dataStorage)
+                        try:
+                            if height_average is not None:
+                                height = rng.randint(
+                                    height_average - 5, height_average + 5
+                                )
+                            else:
+                                height = rng.randint(10, 20)
+                        except:
+                            height = rng.randint(10, 20)
+                else:  # if acceptable value: reading from existing attribute
+                    height = existing_height
+
+            except:  # if no Height attribute
+                if ignore is True:
+                    height = None
+                else:
+                    rng = getLayerRandom(layer, transform, dataStorage)
+                    height = rng.randint(10, 20)
 
     return height
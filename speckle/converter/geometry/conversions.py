@@ -37,6 +37,7 @@ from speckle.converter.geometry.polygon import (
     polygonToNative,
     hatchToNative,
 )
+from speckle.converter.geometry.transform import getTransform
 from speckle.converter.geometry.polyline import (
     compoudCurveToSpeckle,
     anyLineToSpeckle,
@@ -83,7 +84,7 @@ def convertToSpeckle(
         targetCRS = dataStorage.project.crs()
         xform = None
         if sourceCRS != targetCRS:
-            xform = QgsCoordinateTransform(sourceCRS, targetCRS, dataStorage.project)
+            xform = getTransform(sourceCRS, targetCRS, dataStorage.project)
 
         geom_original: Union[QgsGeometry, QgsAbstractGeometry] = feature.geometry()
 
@@ -1,21 +1,22 @@
 import inspect
 import math
+import numpy as np
 from typing import List, Tuple, Union
 from specklepy.objects.geometry import Mesh, Point
 from specklepy.objects.other import RenderMaterial
 
 import shapefile
 from shapefile import OUTER_RING
-from speckle.converter.geometry.point import (
-    pointToNative,
-)
 from speckle.converter.geometry.utils import (
-    apply_pt_transform_matrix,
+    apply_receive_matrix,
     fix_orientation,
     fix_orientation_triangle,
     projectToPolygon,
+    get_affine_matrix,
+    get_receive_crs_matrix,
+    get_receive_matrix,
+    get_scale_matrix,
     triangulatePolygon,
-    transform_speckle_pt_on_receive,
 )
 from speckle.converter.layers.symbology import featureColorfromNativeRenderer
 from speckle.converter.layers.utils import (
@@ -29,6 +30,7 @@ from speckle.utils.panel_logging import logToUser
 try:
     from qgis.core import (
         QgsMultiPolygon,
+        QgsPoint,
         QgsPolygon,
         QgsLineString,
         QgsFeature,
@@ -37,43 +39,91 @@ try:
 except ModuleNotFoundError:
     pass
 
-
-def deconstructSpeckleMesh(mesh: Mesh, dataStorage):
+# boundaries with more points are sampled before triangulation
+MAX_POLYGON_POINTS = 5000
+
+
+def getMeshVerticesNative(
+    mesh: Mesh, dataStorage, crs_transform: bool = False
+) -> np.ndarray:
+    """Returns mesh vertices (N x 3) with the instance matrix and units scale applied,
+    and optionally the receive rotation and offsets, as one composite transform."""
+    scale = get_scale_factor(mesh.units, dataStorage)
+    receive_matrix = get_scale_matrix(scale)
+    if dataStorage.matrix is not None:
+        instance_matrix = get_affine_matrix(dataStorage.matrix)
+        if instance_matrix is not None:
+            receive_matrix = instance_matrix @ receive_matrix
+    if crs_transform is True:
+        receive_matrix = receive_matrix @ get_receive_crs_matrix(dataStorage)
+    return apply_receive_matrix(mesh.vertices, receive_matrix)
+
+
+def getMeshFaceIndices(
+    faces: List[int], vertex_count: Union[int, None] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Decodes Speckle mesh faces (incl. legacy 0/1 triangle/quad markers) into
+    a flat array of vertex indices and face offsets into it (length: faces + 1).
+    Stops at the first face out of range, like the previous per-face loop."""
+    faces = np.asarray(faces, dtype=np.int64).ravel()
+    indices = None
+
+    # all triangles or all quads: no need to walk the face headers
+    for markers, size in (((0, 3), 3), ((1, 4), 4)):
+        if len(faces) > 0 and len(faces) % (size + 1) == 0:
+            if np.isin(faces[:: size + 1], markers).all():
+                indices = faces.reshape(-1, size + 1)[:, 1:].ravel()
+                offsets = np.arange(0, len(indices) + 1, size, dtype=np.int64)
+                break
+
+    if indices is None:
+        faces_list = faces.tolist()
+        starts = []
+        sizes = []
+        count = 0
+        while count < len(faces_list):
+            face_vertices = faces_list[count]
+            if face_vertices == 0:
+                face_vertices = 3
+            elif face_vertices == 1:
+                face_vertices = 4
+            if face_vertices < 0 or count + face_vertices >= len(faces_list):
+                break
+            starts.append(count + 1)
+            sizes.append(face_vertices)
+            count += face_vertices + 1
+
+        sizes = np.array(sizes, dtype=np.int64)
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(sizes)
+        positions = np.repeat(np.array(starts, dtype=np.int64) - offsets[:-1], sizes)
+        indices = faces[positions + np.arange(offsets[-1], dtype=np.int64)]
+
+    if vertex_count is not None:
+        invalid = np.flatnonzero((indices >= vertex_count) | (indices < -vertex_count))
+        if len(invalid) > 0:
+            face_count = np.searchsorted(offsets, invalid[0], side="right") - 1
+            offsets = offsets[: face_count + 1]
+            indices = indices[: offsets[-1]]
+
+    return indices, offsets
+
+
+def getMeshFaceParts(faces: List[int], vertices: np.ndarray):
+    """Splits mesh faces into lists of vertex coordinates (one per face)."""
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    indices, offsets = getMeshFaceIndices(faces, len(vertices))
+    coords = vertices[indices].tolist()
+    offsets = offsets.tolist()
+    parts_list = [coords[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+    types_list = [OUTER_RING] * len(parts_list)
+    return parts_list, types_list
+
+
+def deconstructSpeckleMesh(mesh: Mesh, dataStorage, crs_transform: bool = False):
     try:
-        scale = get_scale_factor(mesh.units, dataStorage)
-        parts_list = []
-        types_list = []
-
-        count = 0  # sequence of vertex (not of flat coord list)
-        for f in mesh.faces:  # real number of loops will be at least 3 times less
-            try:
-                vertices = mesh.faces[count]
-                if mesh.faces[count] == 0:
-                    vertices = 3
-                if mesh.faces[count] == 1:
-                    vertices = 4
-
-                face = []
-                for i in range(vertices):
-                    index_faces = count + 1 + i
-                    index_vertices = mesh.faces[index_faces] * 3
-
-                    pt = Point(
-                        x=mesh.vertices[index_vertices],
-                        y=mesh.vertices[index_vertices + 1],
-                        z=mesh.vertices[index_vertices + 2],
-                        units="m",
-                    )
-                    pt = apply_pt_transform_matrix(pt, dataStorage)
-                    face.append([scale * pt.x, scale * pt.y, scale * pt.z])
-
-                parts_list.append(face)
-                types_list.append(OUTER_RING)
-                count += vertices + 1
-            except:
-                break  # when out of range
-
-        return parts_list, types_list
+        vertices = getMeshVerticesNative(mesh, dataStorage, crs_transform)
+        return getMeshFaceParts(mesh.faces, vertices)
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3])
         return [], []
@@ -89,12 +139,9 @@ def fill_multi_mesh_parts(
             if not isinstance(mesh, Mesh):
                 continue
             try:
-                parts_list_x, types_list_x = deconstructSpeckleMesh(mesh, dataStorage)
-                for i, face in enumerate(parts_list_x):
-                    for k, p in enumerate(face):
-                        pt = Point(x=p[0], y=p[1], z=p[2], units=mesh.units)
-                        pt = transform_speckle_pt_on_receive(pt, dataStorage)
-                        parts_list_x[i][k] = [pt.x, pt.y, pt.z]
+                parts_list_x, types_list_x = deconstructSpeckleMesh(
+                    mesh, dataStorage, crs_transform=True
+                )
                 parts_list.extend(parts_list_x)
                 types_list.extend(types_list_x)
             except Exception as e:
@@ -132,12 +179,9 @@ def writeMeshToShp(meshes: List[Mesh], path: str, dataStorage):
 
 def fill_mesh_parts(w: shapefile.Writer, mesh: Mesh, geom_id: str, dataStorage):
     try:
-        parts_list, types_list = deconstructSpeckleMesh(mesh, dataStorage)
-        for i, face in enumerate(parts_list):
-            for k, p in enumerate(face):
-                pt = Point(x=p[0], y=p[1], z=p[2], units=mesh.units)
-                pt = transform_speckle_pt_on_receive(pt, dataStorage)
-                parts_list[i][k] = [pt.x, pt.y, pt.z]
+        parts_list, types_list = deconstructSpeckleMesh(
+            mesh, dataStorage, crs_transform=True
+        )
         w.multipatch(parts_list, partTypes=types_list)  # one type for each part
         w.record(geom_id)
 
@@ -156,7 +200,12 @@ def constructMeshFromRaster(
     try:
         if vertices is None or faces is None:
             return None
-        mesh = Mesh.create(vertices, faces, colors)
+        # raster meshes are built as arrays, convert them only once here
+        mesh = Mesh.create(
+            np.asarray(vertices, dtype=float).tolist(),
+            np.asarray(faces, dtype=np.int64).tolist(),
+            None if colors is None else np.asarray(colors, dtype=np.int64).tolist(),
+        )
         mesh.units = "m"
         return mesh
     except Exception as e:
@@ -182,6 +231,46 @@ def constructMesh(
         return None
 
 
+def getPolygonSimplificationCoef(polyBorder: List[Point]) -> int:
+    """Returns the step for sampling boundary points of very large polygons."""
+    coef = 1
+    if len(polyBorder) >= MAX_POLYGON_POINTS:
+        coef = math.floor(len(polyBorder) / MAX_POLYGON_POINTS)
+    return coef
+
+
+def getPolygonTriangulationInput(
+    polyBorder: List[Point], voidsAsPts: List[List[Point]], coef: int = 1
+) -> Tuple[List[float], List[List[float]], List[int]]:
+    """Returns flat coordinates of the outer ring and holes, the same as point
+    triplets, and the hole start indices, as expected by earcut."""
+    vertices3d_original_tuples = [
+        [polyBorder[coef * i].x, polyBorder[coef * i].y, polyBorder[coef * i].z]
+        for i, p in enumerate(polyBorder)
+        if coef * i < len(polyBorder)
+    ]
+    holes3d_tuples = [
+        [
+            [p[coef * i].x, p[coef * i].y, p[coef * i].z]
+            for i, v in enumerate(p)
+            if coef * i < len(p)
+        ]
+        for p in voidsAsPts
+    ]
+
+    vertices3d = [item for sub_list in vertices3d_original_tuples for item in sub_list]
+    vertices3d_tuples = vertices3d_original_tuples.copy()
+    hole_indices = []
+
+    for hole_tuple_list in holes3d_tuples:
+        current_count = int(len(vertices3d) / 3)
+        hole_indices.append(current_count)
+        vertices3d.extend(item for sub_list in hole_tuple_list for item in sub_list)
+        vertices3d_tuples.extend(hole_tuple_list)
+
+    return vertices3d, vertices3d_tuples, hole_indices
+
+
 def meshPartsFromPolygon(
     polyBorder: List[Point],
     voidsAsPts: List[List[Point]],
@@ -211,10 +300,8 @@ def meshPartsFromPolygon(
         total_vertices = 0
         iterations = 0
 
-        coef = 1
-        maxPoints = 5000
-        if len(polyBorder) >= maxPoints:
-            coef = math.floor(len(polyBorder) / maxPoints)
+        coef = getPolygonSimplificationCoef(polyBorder)
+        if len(polyBorder) >= MAX_POLYGON_POINTS:
             iterations = 1
 
         if len(polyBorder) < 3:
@@ -224,34 +311,9 @@ def meshPartsFromPolygon(
 
         universal_z_value = polyBorder[0].z
 
-        vertices3d_original_tuples = [
-            [polyBorder[coef * i].x, polyBorder[coef * i].y, polyBorder[coef * i].z]
-            for i, p in enumerate(polyBorder)
-            if coef * i < len(polyBorder)
-        ]
-        holes3d_tuples = [
-            [
-                [p[coef * i].x, p[coef * i].y, p[coef * i].z]
-                for i, v in enumerate(p)
-                if coef * i < len(p)
-            ]
-            for p in voidsAsPts
-        ]
-        # height_set = list(set([p[2] for p in vertices3d_original_tuples]))
-
-        vertices3d_original = [
-            item for sub_list in vertices3d_original_tuples for item in sub_list
-        ]
-
-        vertices3d = vertices3d_original.copy()
-        vertices3d_tuples = vertices3d_original_tuples.copy()
-        hole_indices = []
-
-        for hole_tuple_list in holes3d_tuples:
-            current_count = int(len(vertices3d) / 3)
-            hole_indices.append(current_count)
-            vertices3d.extend(item for sub_list in hole_tuple_list for item in sub_list)
-            vertices3d_tuples.extend(hole_tuple_list)
+        vertices3d, vertices3d_tuples, hole_indices = getPolygonTriangulationInput(
+            polyBorder, voidsAsPts, coef
+        )
 
         # get points from original geometry #################################
         triangle_list = []
@@ -494,16 +556,33 @@ def meshPartsFromPolygon(
 def meshToNative(meshes: List[Mesh], dataStorage) -> "QgsMultiPolygon":
     try:
         multiPolygon = QgsMultiPolygon()
+        units = dataStorage.currentUnits
+        if not isinstance(units, str):
+            units = "m"
         for mesh in meshes:
-            parts_list, types_list = deconstructSpeckleMesh(mesh, dataStorage)
-            for part in parts_list:
+            # same as deconstructSpeckleMesh followed by pointToNative for each vertex
+            try:
+                vertices = getMeshVerticesNative(mesh, dataStorage)
+                vertices[np.isnan(vertices[:, 2]), 2] = 0
+                vertices = apply_receive_matrix(
+                    vertices,
+                    get_receive_matrix(
+                        dataStorage, get_scale_factor(units, dataStorage)
+                    ),
+                )
+            except Exception as e:
+                logToUser(e, level=2, func=inspect.stack()[0][3])
+                continue
+
+            # closed rings: repeat the first vertex of each face at its end
+            indices, offsets = getMeshFaceIndices(mesh.faces, len(vertices))
+            ring_indices = np.insert(indices, offsets[1:], indices[offsets[:-1]])
+            ring_offsets = (offsets + np.arange(len(offsets))).tolist()
+            x, y, z = vertices[ring_indices].T.tolist()
+            for i in range(len(ring_offsets) - 1):
+                start, end = ring_offsets[i], ring_offsets[i + 1]
                 polygon = QgsPolygon()
-                units = dataStorage.currentUnits
-                if not isinstance(units, str):
-                    units = "m"
-                pts = [Point(x=pt[0], y=pt[1], z=pt[2], units=units) for pt in part]
-                pts.append(pts[0])
-                boundary = QgsLineString([pointToNative(pt, dataStorage) for pt in pts])
+                boundary = QgsLineString(x[start:end], y[start:end], z[start:end])
                 polygon.setExteriorRing(boundary)
 
                 if polygon is not None:
@@ -1,6 +1,6 @@
 import inspect
 import math
-from typing import Union
+from typing import List, Union
 import numpy as np
 
 try:
@@ -13,6 +13,8 @@ from speckle.converter.geometry.utils import (
     apply_pt_offsets_rotation_on_send,
     transform_speckle_pt_on_receive,
     apply_pt_transform_matrix,
+    apply_receive_matrix,
+    get_receive_matrix,
 )
 from plugin_utils.helpers import get_scale_factor
 from speckle.utils.panel_logging import logToUser
@@ -64,6 +66,32 @@ def pointToNative(pt: Point, dataStorage) -> "QgsPoint":
         return None
 
 
+def coordsToNative(
+    coords: Union[List[float], np.ndarray], units: Union[str, None], dataStorage
+) -> List["QgsPoint"]:
+    """Converts flat (or N x 3) Speckle coordinates to QgsPoints,
+    applying the units scale, instance matrix, rotation and offsets at once."""
+    coords = np.array(coords, dtype=float).reshape(-1, 3)
+    coords[np.isnan(coords[:, 2]), 2] = 0
+    scaleFactor = get_scale_factor(units, dataStorage)
+    coords = apply_receive_matrix(coords, get_receive_matrix(dataStorage, scaleFactor))
+    return [QgsPoint(x, y, z) for x, y, z in coords.tolist()]
+
+
+def pointsToNative(pts: List[Point], dataStorage) -> List["QgsPoint"]:
+    """Converts a list of Speckle Points to QgsPoints"""
+    try:
+        if len(pts) == 0:
+            return []
+        units = pts[0].units
+        if any(pt.units != units for pt in pts):
+            return [pointToNative(pt, dataStorage) for pt in pts]
+        return coordsToNative([[pt.x, pt.y, pt.z] for pt in pts], units, dataStorage)
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return [pointToNative(pt, dataStorage) for pt in pts]
+
+
 def pointToNativeWithoutTransforms(pt: Point, dataStorage) -> Union["QgsPoint", None]:
     """Converts a Speckle Point to QgsPoint"""
     try:
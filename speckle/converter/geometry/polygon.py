@@ -15,6 +15,7 @@ try:
         QgsFeature,
         QgsVectorLayer,
         QgsCoordinateReferenceSystem,
+        QgsWkbTypes,
     )
 except ModuleNotFoundError:
     pass
@@ -25,12 +26,21 @@ from specklepy.objects.geometry import Point, Line, Polyline, Arc, Polycurve
 from specklepy.objects import Base
 from specklepy.objects.GIS.geometry import GisPolygonGeometry
 
-from speckle.converter.geometry.mesh import meshPartsFromPolygon, constructMesh
+from speckle.converter.geometry.mesh import (
+    getPolygonSimplificationCoef,
+    getPolygonTriangulationInput,
+    meshPartsFromPolygon,
+    constructMesh,
+)
 from speckle.converter.geometry.polyline import (
     polylineFromVerticesToSpeckle,
     polylineToNative,
     unknownLineToSpeckle,
 )
+from speckle.converter.geometry.triangulation import (
+    TRIANGULATION_WORKERS,
+    precompute_triangulations,
+)
 from speckle.converter.geometry.utils import (
     projectToPolygon,
     speckleBoundaryToSpecklePts,
@@ -38,10 +48,10 @@ from speckle.converter.geometry.utils import (
 
 # from speckle.converter.geometry.utils import *
 from speckle.converter.layers.utils import (
-    get_raster_stats,
     getArrayIndicesFromXY,
+    getCachedElevationData,
     getElevationLayer,
-    getRasterArrays,
+    isAppliedLayerTransformByKeywords,
     moveVertically,
     reprojectPt,
 )
@@ -166,21 +176,22 @@ def getZaxisTranslation(layer, boundaryPts, dataStorage):
         min_z = 0
 
     if elevationLayer is not None:
-        all_arrays, all_mins, all_maxs, all_na = getRasterArrays(elevationLayer)
-        settings_elevation_layer = get_raster_stats(elevationLayer)
+        (
+            (all_arrays, all_mins, all_maxs, all_na),
+            settings_elevation_layer,
+        ) = getCachedElevationData(elevationLayer)
+        if all_arrays is None:
+            return None
         allElevations = []
-        for pt in boundaryPts:
-            # posX, posY = reprojectPt(
-            #    pt.x(), pt.y(), polygonWkt, polygonProj, rasterWkt, rasterProj
-            # )
-            reprojected_pt = transform.transform(
-                dataStorage.project,
-                QgsPointXY(pt.x(), pt.y()),
-                layer.crs(),
-                elevationLayer.crs(),
-            )
-            posX = reprojected_pt.x()
-            posY = reprojected_pt.y()
+        # reproject all boundary points at once
+        allX, allY = transform.transformCoords(
+            dataStorage.project,
+            [pt.x() for pt in boundaryPts],
+            [pt.y() for pt in boundaryPts],
+            layer.crs(),
+            elevationLayer.crs(),
+        )
+        for posX, posY in zip(allX, allY):
             index1, index2, remainder1, remainder2 = getArrayIndicesFromXY(
                 settings_elevation_layer, posX, posY
             )
@@ -221,6 +232,97 @@ def isFlat(ptList):
     return flat
 
 
+def getPolygonPartPts(
+    geom_original: "QgsAbstractGeometry",
+    feature: "QgsFeature",
+    layer: "QgsVectorLayer",
+    projectZval,
+    dataStorage,
+    xform=None,
+):
+    """Returns boundary and voids of a single polygon, and their points (voids projected on the boundary plane)."""
+    geom = geom_original.clone()
+    boundary, voidsNative = getPolyBoundaryVoids(
+        geom, feature, layer, dataStorage, xform
+    )
+
+    if projectZval is not None:
+        boundary = moveVertically(boundary, projectZval)
+
+    polyBorder = speckleBoundaryToSpecklePts(boundary, dataStorage)
+    voidsAsPts = []
+    if len(polyBorder) < 3:
+        return boundary, voidsNative, polyBorder, voidsAsPts
+
+    plane_pts = [
+        [polyBorder[0].x, polyBorder[0].y, polyBorder[0].z],
+        [polyBorder[1].x, polyBorder[1].y, polyBorder[1].z],
+        [polyBorder[2].x, polyBorder[2].y, polyBorder[2].z],
+    ]
+    for v_speckle in voidsNative:
+        pts_fixed = []
+        pts = speckleBoundaryToSpecklePts(v_speckle, dataStorage)
+        for pt in pts:
+            # project the pts on the plane
+            point = [pt.x, pt.y, 0]
+            z_val = projectToPolygon(point, plane_pts)
+            pts_fixed.append(Point(units="m", x=pt.x, y=pt.y, z=z_val))
+        voidsAsPts.append(pts_fixed)
+
+    return boundary, voidsNative, polyBorder, voidsAsPts
+
+
+def triangulatePolygonLayer(
+    layer: "QgsVectorLayer", features, dataStorage
+) -> Union[List, None]:
+    """Triangulates polygons of the layer in advance, in parallel processes.
+    Returns the number of polygon parts, or None if the layer is not eligible."""
+    try:
+        # extracting the rings twice only pays off with several processes
+        if TRIANGULATION_WORKERS < 2:
+            return None
+        if layer.geometryType() != QgsWkbTypes.PolygonGeometry:
+            return None
+        # meshes received earlier and polygons projected on elevation are converted differently
+        if layer.name().endswith("_as_Mesh") and "Speckle_ID" in layer.fields().names():
+            return None
+        if isAppliedLayerTransformByKeywords(
+            layer, ["polygon", "project", "elevation"], [], dataStorage
+        ):
+            return None
+
+        xform = None
+        if layer.crs() != dataStorage.project.crs():
+            xform = transform.getTransform(
+                layer.crs(), dataStorage.project.crs(), dataStorage.project
+            )
+
+        jobs = []
+        for feature in features:
+            geom = feature.geometry()
+            if geom is None or geom.isEmpty():
+                continue
+            if QgsWkbTypes.isSingleType(geom.wkbType()):
+                parts = [geom.constGet()]
+            else:
+                parts = geom.constGet().parts()
+            for part in parts:
+                _, _, polyBorder, voidsAsPts = getPolygonPartPts(
+                    part, feature, layer, None, dataStorage, xform
+                )
+                if len(polyBorder) < 3:
+                    continue
+                vertices3d, _, hole_indices = getPolygonTriangulationInput(
+                    polyBorder, voidsAsPts, getPolygonSimplificationCoef(polyBorder)
+                )
+                jobs.append((vertices3d, hole_indices))
+
+        return precompute_triangulations(jobs)
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return None
+
+
 def polygonToSpeckle(
     geom_original: "QgsAbstractGeometry",
     feature: "QgsFeature",
@@ -234,43 +336,16 @@ def polygonToSpeckle(
 
     iterations = 0
     try:
-        geom = geom_original.clone()
-        boundary, voidsNative = getPolyBoundaryVoids(
-            geom, feature, layer, dataStorage, xform
+        boundary, voidsNative, polyBorder, voidsAsPts = getPolygonPartPts(
+            geom_original, feature, layer, projectZval, dataStorage, xform
         )
-
-        if projectZval is not None:
-            boundary = moveVertically(boundary, projectZval)
-
-        polyBorder = speckleBoundaryToSpecklePts(boundary, dataStorage)
         if len(polyBorder) < 3:
             return None, None
-        voids = []
-        voidsAsPts = []
-
-        for v_speckle in voidsNative:
-            pts_fixed = []
-            pts = speckleBoundaryToSpecklePts(v_speckle, dataStorage)
-
-            plane_pts = [
-                [polyBorder[0].x, polyBorder[0].y, polyBorder[0].z],
-                [polyBorder[1].x, polyBorder[1].y, polyBorder[1].z],
-                [polyBorder[2].x, polyBorder[2].y, polyBorder[2].z],
-            ]
-            for pt in pts:
-                z_val = pt.z
-                # print(str(z_val))
-                # project the pts on the plane
-                point = [pt.x, pt.y, 0]
-                z_val = projectToPolygon(point, plane_pts)
-                pts_fixed.append(Point(units="m", x=pt.x, y=pt.y, z=z_val))
-
-            voids.append(
-                polylineFromVerticesToSpeckle(
-                    pts_fixed, True, feature, layer, dataStorage
-                )
-            )
-            voidsAsPts.append(pts_fixed)
+
+        voids = [
+            polylineFromVerticesToSpeckle(pts_fixed, True, feature, layer, dataStorage)
+            for pts_fixed in voidsAsPts
+        ]
 
         polygon = GisPolygonGeometry(units="m", boundary=boundary, voids=voids)
         iterations, vertices, faces, colors, iterations = meshPartsFromPolygon(
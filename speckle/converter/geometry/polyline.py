@@ -15,11 +15,17 @@ from specklepy.objects.geometry import (
     Plane,
     Interval,
 )
-from speckle.converter.geometry.point import pointToNative, pointToSpeckle
+from speckle.converter.geometry.point import (
+    coordsToNative,
+    pointsToNative,
+    pointToNative,
+    pointToSpeckle,
+)
 
 try:
     from qgis.core import (
         QgsGeometry,
+        QgsPoint,
         QgsLineString,
         QgsCompoundCurve,
         QgsCircularString,
@@ -315,9 +321,7 @@ def getArcCenter(
 def lineToNative(line: Line, dataStorage) -> "QgsLineString":
     """Converts a Speckle Line to QgsLineString"""
     try:
-        line = QgsLineString(
-            pointToNative(line.start, dataStorage), pointToNative(line.end, dataStorage)
-        )
+        line = QgsLineString(pointsToNative([line.start, line.end], dataStorage))
         return line
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3])
@@ -340,14 +344,13 @@ def polylineToNative(poly: Polyline, dataStorage) -> "QgsLineString":
         if isinstance(poly, Curve):
             poly = poly.displayValue
 
-        if isinstance(poly, Polyline) and poly.closed is False:
-            polyline = QgsLineString(
-                [pointToNative(pt, dataStorage) for pt in poly.as_points()]
-            )
-        else:  # Line or open Polyline
-            ptList = poly.as_points()
-            ptList.append(ptList[0])
-            polyline = QgsLineString([pointToNative(pt, dataStorage) for pt in ptList])
+        if not poly.value:
+            raise ValueError("Polyline has no points")
+        ptList = coordsToNative(poly.value, poly.units, dataStorage)
+        if not (isinstance(poly, Polyline) and poly.closed is False):
+            # Line or closed Polyline
+            ptList.append(QgsPoint(ptList[0]))
+        polyline = QgsLineString(ptList)
         return polyline
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3])
@@ -390,9 +393,7 @@ def arcToNative(poly: Arc, dataStorage) -> "QgsCircularString":
     """Converts a Speckle Arc to QgsCircularString"""
     try:
         arc = QgsCircularString(
-            pointToNative(poly.startPoint, dataStorage),
-            pointToNative(poly.midPoint, dataStorage),
-            pointToNative(poly.endPoint, dataStorage),
+            *pointsToNative([poly.startPoint, poly.midPoint, poly.endPoint], dataStorage)
         )
         return arc
     except Exception as e:
@@ -442,10 +443,7 @@ def polycurveToNative(poly: Polycurve, dataStorage) -> "QgsLineString":
                     if singleSegm == 1:
                         return converted
                 elif isinstance(segm, Circle):
-                    pts = [
-                        pointToNative(pt, dataStorage)
-                        for pt in speckleArcCircleToPoints(segm)
-                    ]
+                    pts = pointsToNative(speckleArcCircleToPoints(segm), dataStorage)
                     converted = QgsLineString(pts)  # QgsLineString
                     if singleSegm == 1:
                         return circleToNative(segm, dataStorage)
@@ -456,10 +454,9 @@ def polycurveToNative(poly: Polycurve, dataStorage) -> "QgsLineString":
                     if singleSegm == 1:
                         return arcToNative(segm, dataStorage)
                 elif isinstance(segm, Ellipse):
-                    pts = [
-                        pointToNative(pt, dataStorage)
-                        for pt in speckleEllipseToPoints(segm, dataStorage)
-                    ]
+                    pts = pointsToNative(
+                        speckleEllipseToPoints(segm, dataStorage), dataStorage
+                    )
                     converted = QgsLineString(pts)  # QgsLineString
                     if singleSegm == 1:
                         return arcToNative(segm, dataStorage)
@@ -1,21 +1,59 @@
 import inspect
+import math
+import threading
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
 
 try:
     from qgis.core import (
         QgsProject,
         QgsCoordinateReferenceSystem,
         QgsCoordinateTransform,
-        QgsPointXY,
-        QgsProject,
-        QgsCoordinateReferenceSystem,
-        QgsCoordinateTransform,
+        QgsLineString,
         QgsPointXY,
     )
+    from PyQt5.QtGui import QTransform
 except ModuleNotFoundError:
     pass
 
 from speckle.utils.panel_logging import logToUser
 
+# coordinate transforms reused during send and receive, keyed by (source CRS, destination CRS)
+TRANSFORM_CACHE: Dict[Tuple[str, str], "QgsCoordinateTransform"] = {}
+TRANSFORM_CACHE_LOCK = threading.Lock()
+
+# offsets and rotation applied on send, keyed by (crs_offset_x, crs_offset_y, crs_rotation)
+SEND_TRANSFORMS: Dict[Tuple, "SendTransform"] = {}
+
+
+def getCrsKey(crs: "QgsCoordinateReferenceSystem") -> str:
+    authid = crs.authid()
+    if authid is not None and authid != "":
+        return authid
+    return crs.toWkt()
+
+
+def getTransform(
+    crsSrc: "QgsCoordinateReferenceSystem",
+    crsDest: "QgsCoordinateReferenceSystem",
+    project: "QgsProject",
+) -> "QgsCoordinateTransform":
+    """Returns a cached transform between the CRSs, using the project transform context."""
+    key = (getCrsKey(crsSrc), getCrsKey(crsDest))
+    with TRANSFORM_CACHE_LOCK:
+        xform = TRANSFORM_CACHE.get(key)
+        if xform is None:
+            xform = QgsCoordinateTransform(crsSrc, crsDest, project.transformContext())
+            TRANSFORM_CACHE[key] = xform
+    return xform
+
+
+def clearTransformCache(*args):
+    """Drops cached transforms, e.g. when the project CRS or transform context changes."""
+    with TRANSFORM_CACHE_LOCK:
+        TRANSFORM_CACHE.clear()
+
 
 def transform(
     project: "QgsProject",
@@ -25,8 +63,7 @@ def transform(
 ) -> "QgsPointXY":
     """Transforms a QgsPointXY from the source CRS to the destination."""
     try:
-        transformContext = project.transformContext()
-        xform = QgsCoordinateTransform(crsSrc, crsDest, transformContext)
+        xform = getTransform(crsSrc, crsDest, project)
 
         # forward transformation: src -> dest
         dest = xform.transform(
@@ -36,3 +73,98 @@ def transform(
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3])
         return
+
+
+def transformCoords(
+    project: "QgsProject",
+    x: List[float],
+    y: List[float],
+    crsSrc: "QgsCoordinateReferenceSystem",
+    crsDest: "QgsCoordinateReferenceSystem",
+) -> Tuple[List[float], List[float]]:
+    """Transforms lists of X and Y coordinates from the source CRS to the destination in one call.
+    Returns empty lists if the coordinates cannot be transformed."""
+    try:
+        if len(x) == 0:
+            return [], []
+        line = QgsLineString(list(x), list(y))
+        line.transform(getTransform(crsSrc, crsDest, project))
+        return line.xVector(), line.yVector()
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return [], []
+
+
+class SendTransform:
+    """Project CRS offsets and rotation, compiled once and applied to coordinates on send.
+    Offsets are only applied if set as float, rotation if it is within (-360, 360)."""
+
+    def __init__(self, offset_x=None, offset_y=None, rotation=None):
+        self.identity = (offset_x == offset_y == rotation == 0) or (
+            offset_x is None and offset_y is None and rotation is None
+        )
+        self.offset_x = offset_x if isinstance(offset_x, float) else 0.0
+        self.offset_y = offset_y if isinstance(offset_y, float) else 0.0
+        self.rotate = isinstance(rotation, (float, int)) and -360 < rotation < 360
+        self.cos = 1.0
+        self.sin = 0.0
+        if self.rotate:
+            a = rotation * math.pi / 180
+            self.cos = math.cos(a)
+            self.sin = math.sin(a)
+
+    def apply(self, x: float, y: float) -> Tuple[float, float]:
+        if self.identity:
+            return x, y
+        if self.offset_x != 0:
+            x -= self.offset_x
+        if self.offset_y != 0:
+            y -= self.offset_y
+        if self.rotate:
+            x, y = x * self.cos + y * self.sin, -x * self.sin + y * self.cos
+        return x, y
+
+    def apply_array(self, coords, dim: int = 3) -> np.ndarray:
+        """Applies to an array of points (N x 2, N x 3, or flat with 'dim' values per point),
+        returns a new float array of the same shape."""
+        coords = np.array(coords, dtype=float)
+        if self.identity:
+            return coords
+        pts = coords.reshape(-1, coords.shape[-1] if coords.ndim == 2 else dim)
+        x = pts[:, 0] - self.offset_x
+        y = pts[:, 1] - self.offset_y
+        if self.rotate:
+            x, y = x * self.cos + y * self.sin, -x * self.sin + y * self.cos
+        pts[:, 0] = x
+        pts[:, 1] = y
+        return coords
+
+    def toQTransform(self) -> "QTransform":
+        """Same transformation as QTransform, e.g. for QgsGeometry.transform."""
+        c, s = self.cos, self.sin
+        ox, oy = self.offset_x, self.offset_y
+        return QTransform(c, -s, s, c, -(c * ox + s * oy), s * ox - c * oy)
+
+    def apply_geometry(self, geom: "QgsGeometry") -> "QgsGeometry":
+        """Transforms the geometry in place (2D only, Z and M values are kept)."""
+        if not self.identity:
+            geom.transform(self.toQTransform())
+        return geom
+
+
+def getSendTransform(dataStorage) -> SendTransform:
+    """Returns the compiled offsets and rotation of the current dataStorage settings."""
+    key = (
+        dataStorage.crs_offset_x,
+        dataStorage.crs_offset_y,
+        dataStorage.crs_rotation,
+    )
+    send_transform = SEND_TRANSFORMS.get(key)
+    if send_transform is None:
+        send_transform = SendTransform(*key)
+        SEND_TRANSFORMS[key] = send_transform
+    return send_transform
+
+
+def clearSendTransforms():
+    SEND_TRANSFORMS.clear()
@@ -0,0 +1,181 @@
+""" Batched polygon triangulation. Kept free of QGIS and specklepy imports,
+so that the worker processes only need to load earcut and numpy."""
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple, Union
+
+import earcut.earcut
+import numpy as np
+
+# polygons per task sent to a worker process
+TRIANGULATION_CHUNK_SIZE = 2000
+# smaller batches are triangulated in the current process
+TRIANGULATION_MIN_BATCH = 5000
+TRIANGULATION_WORKERS = max(1, min(8, (os.cpu_count() or 1) - 1))
+# polygon parts looked ahead, if some were not converted (e.g. the feature failed)
+TRIANGULATION_LOOKAHEAD = 16
+
+# worker processes, shared by all layers of one send operation
+TRIANGULATION_EXECUTOR: Dict[str, ProcessPoolExecutor] = {}
+TRIANGULATION_EXECUTOR_LOCK = threading.Lock()
+# triangulations computed in advance, in the order of polygon parts: for the layer
+# converted by each thread (by thread id)
+PRECOMPUTED_TRIANGULATIONS: Dict[int, Dict[str, Any]] = {}
+
+
+def triangulate_rings(vertices: List[float], holes: Union[List[int], None], dim=3):
+    """Triangulates a flat list of ring coordinates, returns a list of index triplets."""
+    if holes is not None and len(holes) == 0:
+        holes = None
+    triangles = earcut.earcut.earcut(vertices, holes, dim=dim)
+    return [
+        [triangles[3 * i], triangles[3 * i + 1], triangles[3 * i + 2]]
+        for i in range(len(triangles) // 3)
+    ]
+
+
+def _triangulate_chunk(
+    vertices: np.ndarray, vertex_offsets: np.ndarray, holes: List[List[int]]
+) -> List[Union[List[List[int]], None]]:
+    """Worker: triangulates polygons packed into one coordinate buffer."""
+    results = []
+    for i, hole_indices in enumerate(holes):
+        coords = vertices[vertex_offsets[i] : vertex_offsets[i + 1]].tolist()
+        try:
+            results.append(triangulate_rings(coords, hole_indices))
+        except Exception:
+            results.append(None)
+    return results
+
+
+def pack_rings(jobs: List[Tuple[List[float], List[int]]]):
+    """Packs (vertices, hole_indices) pairs into one coordinate buffer with offsets."""
+    vertex_offsets = np.zeros(len(jobs) + 1, dtype=np.int64)
+    vertex_offsets[1:] = np.cumsum([len(v) for v, _ in jobs])
+    vertices = np.fromiter(
+        (c for v, _ in jobs for c in v), dtype=np.float64, count=vertex_offsets[-1]
+    )
+    return vertices, vertex_offsets, [list(h) for _, h in jobs]
+
+
+def _get_packed_chunk(packed, start: int, end: int):
+    vertices, vertex_offsets, holes = packed
+    return (
+        vertices[vertex_offsets[start] : vertex_offsets[end]],
+        vertex_offsets[start : end + 1] - vertex_offsets[start],
+        holes[start:end],
+    )
+
+
+def get_process_executor(max_workers: int) -> ProcessPoolExecutor:
+    context = multiprocessing.get_context("spawn")
+    if sys.platform == "win32":
+        # inside QGIS sys.executable is the QGIS application, not Python
+        python_exe = os.path.join(sys.exec_prefix, "pythonw.exe")
+        if os.path.exists(python_exe):
+            context.set_executable(python_exe)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def get_triangulation_executor(max_workers: int) -> Union[ProcessPoolExecutor, None]:
+    """Returns the worker processes of the send operation, started on the first use."""
+    with TRIANGULATION_EXECUTOR_LOCK:
+        if "executor" not in TRIANGULATION_EXECUTOR:
+            try:
+                TRIANGULATION_EXECUTOR["executor"] = get_process_executor(max_workers)
+            except Exception:
+                return None
+        return TRIANGULATION_EXECUTOR["executor"]
+
+
+def shutdown_triangulation_executor():
+    with TRIANGULATION_EXECUTOR_LOCK:
+        executor = TRIANGULATION_EXECUTOR.pop("executor", None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def triangulate_rings_batch(
+    jobs: List[Tuple[List[float], List[int]]],
+    max_workers: Union[int, None] = None,
+    packed=None,
+) -> List[Union[List[List[int]], None]]:
+    """Triangulates (vertices, hole_indices) pairs across worker processes,
+    results are in the same order; None for polygons that failed."""
+    if max_workers is None:
+        max_workers = TRIANGULATION_WORKERS
+    if packed is None:
+        packed = pack_rings(jobs)
+    chunks = [
+        _get_packed_chunk(packed, i, min(i + TRIANGULATION_CHUNK_SIZE, len(jobs)))
+        for i in range(0, len(jobs), TRIANGULATION_CHUNK_SIZE)
+    ]
+
+    executor = None
+    if len(jobs) >= TRIANGULATION_MIN_BATCH and max_workers >= 2:
+        executor = get_triangulation_executor(max_workers)
+    if executor is None:
+        return [r for chunk in chunks for r in _triangulate_chunk(*chunk)]
+
+    results = []
+    futures = [executor.submit(_triangulate_chunk, *chunk) for chunk in chunks]
+    for chunk, future in zip(chunks, futures):
+        try:
+            results.extend(future.result())
+        except Exception:
+            # e.g. the worker process could not start: finish here
+            results.extend(_triangulate_chunk(*chunk))
+    return results
+
+
+def precompute_triangulations(
+    jobs: List[Tuple[List[float], List[int]]],
+    max_workers: Union[int, None] = None,
+) -> int:
+    """Triangulates the polygon parts of a layer in advance, in the order of conversion
+    by the current thread. Returns the number of polygon parts."""
+    clear_precomputed_triangulations()
+    packed = pack_rings(jobs)
+    PRECOMPUTED_TRIANGULATIONS[threading.get_ident()] = {
+        "packed": packed,
+        "triangles": triangulate_rings_batch(jobs, max_workers, packed),
+        "next": 0,
+    }
+    return len(jobs)
+
+
+def pop_precomputed_triangulation(vertices, holes) -> Union[List[List[int]], None]:
+    """Returns the next precomputed triangulation, if it was computed from the same input (only once)."""
+    precomputed = PRECOMPUTED_TRIANGULATIONS.get(threading.get_ident())
+    if precomputed is None:
+        return None
+    vertex_buffer, vertex_offsets, hole_list = precomputed["packed"]
+    holes = [] if holes is None else list(holes)
+    start = precomputed["next"]
+    coords = None
+    for i in range(start, min(start + TRIANGULATION_LOOKAHEAD, len(hole_list))):
+        if (
+            vertex_offsets[i + 1] - vertex_offsets[i] != len(vertices)
+            or hole_list[i] != holes
+        ):
+            continue
+        if coords is None:
+            coords = np.asarray(vertices, dtype=np.float64)
+        segment = vertex_buffer[vertex_offsets[i] : vertex_offsets[i + 1]]
+        if np.array_equal(segment, coords):
+            precomputed["next"] = i + 1
+            triangles = precomputed["triangles"][i]
+            precomputed["triangles"][i] = None
+            return triangles
+    return None
+
+
+def clear_precomputed_triangulations(all_threads: bool = False):
+    if all_threads is True:
+        PRECOMPUTED_TRIANGULATIONS.clear()
+    else:
+        PRECOMPUTED_TRIANGULATIONS.pop(threading.get_ident(), None)
@@ -25,6 +25,7 @@ try:
         Qgis,
         QgsPointXY,
         QgsGeometry,
+        QgsLineString,
         QgsRasterBandStats,
         QgsFeature,
         QgsFields,
@@ -38,6 +39,11 @@ try:
 except ModuleNotFoundError:
     pass
 
+from speckle.converter.geometry.transform import getSendTransform, getTransform
+from speckle.converter.geometry.triangulation import (
+    pop_precomputed_triangulation,
+    triangulate_rings,
+)
 from speckle.utils.panel_logging import logToUser
 
 import numpy as np
@@ -127,6 +133,65 @@ def projectToPolygon(
     return z
 
 
+# same tolerance as used by QgsPoint comparison
+POINT_TOLERANCE = 1e-8
+
+
+def _coordCell(value: float):
+    if math.isfinite(value):
+        return math.floor(value / (2 * POINT_TOLERANCE))
+    return str(value)
+
+
+def _coordsNear(a: float, b: float) -> bool:
+    if math.isnan(a) and math.isnan(b):
+        return True
+    return -POINT_TOLERANCE < a - b <= POINT_TOLERANCE
+
+
+def getRingCoordinates(ring) -> List[Tuple[float, float, float, float]]:
+    """Returns (x, y, z, m) of ring vertices, NaN where the ring has no Z or M values."""
+    if isinstance(ring, QgsLineString):
+        # read the coordinate arrays instead of iterating the vertices
+        xs = ring.xVector()
+        ys = ring.yVector()
+        zs = ring.zVector() if ring.is3D() else [math.nan] * len(xs)
+        ms = ring.mVector() if ring.isMeasure() else [math.nan] * len(xs)
+        return list(zip(xs, ys, zs, ms))
+    return [(pt.x(), pt.y(), pt.z(), pt.m()) for pt in ring.vertices()]
+
+
+def pointIndexFromCoords(
+    coords: List[Tuple[float, float, float, float]]
+) -> Dict[Tuple, List[int]]:
+    """Indexes points by grid cell, for lookups of (nearly) equal points."""
+    index: Dict[Tuple, List[int]] = {}
+    for i, pt in enumerate(coords):
+        index.setdefault((_coordCell(pt[0]), _coordCell(pt[1])), []).append(i)
+    return index
+
+
+def pointInIndex(
+    index: Dict[Tuple, List[int]],
+    coords: List[Tuple[float, float, float, float]],
+    pt: Tuple[float, float, float, float],
+) -> bool:
+    """Checks if an equal point (same as QgsPoint comparison) is indexed."""
+    cells_x = [_coordCell(pt[0])]
+    cells_y = [_coordCell(pt[1])]
+    if isinstance(cells_x[0], int):
+        cells_x = [cells_x[0] - 1, cells_x[0], cells_x[0] + 1]
+    if isinstance(cells_y[0], int):
+        cells_y = [cells_y[0] - 1, cells_y[0], cells_y[0] + 1]
+
+    for cell_x in cells_x:
+        for cell_y in cells_y:
+            for i in index.get((cell_x, cell_y), []):
+                if all(_coordsNear(a, b) for a, b in zip(coords[i], pt)):
+                    return True
+    return False
+
+
 def getPolyPtsSegments(
     geom: Any, dataStorage: "DataStorage", coef: Union[int, None] = None, xform=None
 ):
@@ -138,22 +203,22 @@ def getPolyPtsSegments(
         geom.transform(xform)
     try:
         extRing = geom.exteriorRing()
-        pt_iterator = extRing.vertices()
+        pt_list = getRingCoordinates(extRing)
     except:
         try:
             extRing = geom.constGet().exteriorRing()
-            pt_iterator = extRing.vertices()
+            pt_list = getRingCoordinates(extRing)
         except:
-            pt_iterator = geom.vertices()
+            pt_list = getRingCoordinates(geom)
 
     # get boundary points and segments
     pointListLocalOuter = []
     startLen = len(vertices)
-    for i, pt in enumerate(pt_iterator):
+    for i, pt in enumerate(pt_list):
         if (
             len(pointListLocalOuter) > 0
-            and pt.x() == pointListLocalOuter[0].x()
-            and pt.y() == pointListLocalOuter[0].y()
+            and pt[0] == pointListLocalOuter[0][0]
+            and pt[1] == pointListLocalOuter[0][1]
         ):
             # don't repeat 1st point
             pass
@@ -167,17 +232,17 @@ def getPolyPtsSegments(
                 # e.g. if coeff=5, we skip ponts 1,2,3,4, but add points 0 and 5
                 pass
 
+    send_transform = getSendTransform(dataStorage)
     for i, pt in enumerate(pointListLocalOuter):
-        x, y = apply_pt_offsets_rotation_on_send(pt.x(), pt.y(), dataStorage)
+        x, y = send_transform.apply(pt[0], pt[1])
         vertices.append([x, y])
-        try:
-            vertices3d.append([x, y, pt.z()])
-        except:
-            vertices3d.append([x, y, 0])
+        vertices3d.append([x, y, pt[2]])
 
         if i > 0:
             segmList.append([startLen + i - 1, startLen + i])
 
+    outerIndex = pointIndexFromCoords(pointListLocalOuter)
+
     # get voids points and segments
     try:
         geom = geom.constGet()
@@ -188,21 +253,19 @@ def getPolyPtsSegments(
 
         for k in range(intRingsNum):
             intRing = geom.interiorRing(k)
-            pt_iterator = intRing.vertices()
-
-            pt_list = list(pt_iterator)
+            pt_list = getRingCoordinates(intRing)
             pointListLocal = []
             startLen = len(vertices)
 
             for i, pt in enumerate(pt_list):
                 if (
                     len(pointListLocal) > 0
-                    and pt.x() == pointListLocal[0].x()
-                    and pt.y() == pointListLocal[0].y()
+                    and pt[0] == pointListLocal[0][0]
+                    and pt[1] == pointListLocal[0][1]
                 ):
                     # don't repeat 1st point
                     continue
-                elif pt not in pointListLocalOuter:
+                elif not pointInIndex(outerIndex, pointListLocalOuter, pt):
                     # make sure it's not already included in the outer part of geometry
 
                     if coef is None or len(pt_list) / coef < 5:
@@ -220,16 +283,12 @@ def getPolyPtsSegments(
             if len(pointListLocal) > 2:
                 holes.append(
                     [
-                        apply_pt_offsets_rotation_on_send(p.x(), p.y(), dataStorage)
-                        for p in pointListLocal
+                        send_transform.apply(p[0], p[1]) for p in pointListLocal
                     ]
                 )
             for i, pt in enumerate(pointListLocal):
-                x, y = apply_pt_offsets_rotation_on_send(pt.x(), pt.y(), dataStorage)
-                try:
-                    vertices3d.append([x, y, pt.z()])
-                except:
-                    vertices3d.append([x, y, None])
+                x, y = send_transform.apply(pt[0], pt[1])
+                vertices3d.append([x, y, pt[2]])
 
                 if i > 0:
                     segmList.append([startLen + i - 1, startLen + i])
@@ -262,16 +321,16 @@ def triangulatePolygon(
                 holes[i].extend(holes[i][:dimensions])
         """
 
+        # polygon might have been triangulated in advance, for the whole layer
+        triangle_tuples = pop_precomputed_triangulation(vertices, holes)
+        if triangle_tuples is not None:
+            return triangle_tuples
+
         if len(holes) == 0:
             holes = None
 
         try:
-            triangles = earcut.earcut.earcut(vertices, holes, dim=dimensions)
-            triangle_tuples = [
-                [triangles[3 * i], triangles[3 * i + 1], triangles[3 * i + 2]]
-                for i, _ in enumerate(triangles)
-                if i < len(triangles) / 3
-            ]
+            triangle_tuples = triangulate_rings(vertices, holes, dim=dimensions)
             # return_dict = {
             #    "vertices": vertices,
             #    "triangles": triangle_tuples,
@@ -287,69 +346,40 @@ def triangulatePolygon(
 
 
 def trianglateQuadMesh(mesh: Mesh) -> Union[Mesh, None]:
+    """Splits each quad (4 vertices, 4 colors) into 2 triangles; incomplete quads at the end are ignored."""
     new_mesh = None
     try:
-        new_v: List[float] = []
-        new_f: List[int] = []
-        new_c: List[int] = []
+        # values are kept as python objects, so that the output is the same as the input type
+        vertices = np.array(mesh.vertices, dtype=object)
+        quad_count = len(vertices) // 12
+        quads = vertices[: quad_count * 12].reshape(quad_count, 4, 3)
+        new_v: List[float] = quads[:, [0, 1, 2, 2, 3, 0], :].ravel().tolist()
+
+        # face indices as in the original implementation: 1 per quad, not per vertex
+        first = np.arange(quad_count, dtype=np.int64)
+        new_f: List[int] = (
+            np.column_stack(
+                [
+                    np.full(quad_count, 3),
+                    first,
+                    first + 1,
+                    first + 2,
+                    np.full(quad_count, 3),
+                    first + 3,
+                    first + 4,
+                    first + 5,
+                ]
+            )
+            .ravel()
+            .tolist()
+        )
 
-        # fill new color and vertices lists
+        new_c: List[int] = []
         if mesh.colors is not None:
-            used_ind_colors = []
-            for i, _ in enumerate(mesh.colors):
-                try:
-                    if i not in used_ind_colors:
-                        new_c.extend(
-                            [
-                                mesh.colors[i],
-                                mesh.colors[i + 1],
-                                mesh.colors[i + 2],
-                                mesh.colors[i + 2],
-                                mesh.colors[i + 3],
-                                mesh.colors[i],
-                            ]
-                        )
-                        used_ind_colors.extend([i, i + 1, i + 2, i + 3])
-                except Exception as e:
-                    print(e)
-
-        used_ind_vertex = []
-        for i, v in enumerate(mesh.vertices):
-            try:
-                if i not in used_ind_vertex:
-                    v0 = [mesh.vertices[i], mesh.vertices[i + 1], mesh.vertices[i + 2]]
-                    v1 = [
-                        mesh.vertices[i + 3],
-                        mesh.vertices[i + 4],
-                        mesh.vertices[i + 5],
-                    ]
-                    v2 = [
-                        mesh.vertices[i + 6],
-                        mesh.vertices[i + 7],
-                        mesh.vertices[i + 8],
-                    ]
-                    v3 = [
-                        mesh.vertices[i + 9],
-                        mesh.vertices[i + 10],
-                        mesh.vertices[i + 11],
-                    ]
+            colors = np.array(mesh.colors, dtype=object)
+            color_quads = colors[: len(colors) // 4 * 4].reshape(-1, 4)
+            new_c = color_quads[:, [0, 1, 2, 2, 3, 0]].ravel().tolist()
 
-                    new_v.extend(v0 + v1 + v2 + v2 + v3 + v0)
-                    new_f.extend(
-                        [
-                            int(3),
-                            int(i / 12),
-                            int(i / 12) + 1,
-                            int(i / 12) + 2,
-                            int(3),
-                            int(i / 12) + 3,
-                            int(i / 12) + 4,
-                            int(i / 12) + 5,
-                        ]
-                    )
-                    used_ind_vertex.extend(list(range(i, i + 12)))
-            except Exception as e:
-                print(e)
         new_mesh = Mesh.create(new_v, new_f, new_c)
         new_mesh.units = mesh.units
     except Exception as e:
@@ -710,29 +740,7 @@ def apply_pt_offsets_rotation_on_send(
     x: float, y: float, dataStorage
 ) -> Tuple[float, float]:  # on Send
     try:
-        offset_x = dataStorage.crs_offset_x
-        offset_y = dataStorage.crs_offset_y
-        rotation = dataStorage.crs_rotation
-        if offset_x == offset_y == rotation == 0:
-            return x, y
-        if offset_x is None and offset_y is None and rotation is None:
-            return x, y
-
-        if offset_x is not None and isinstance(offset_x, float):
-            x -= offset_x
-        if offset_y is not None and isinstance(offset_y, float):
-            y -= offset_y
-        if (
-            rotation is not None
-            and (isinstance(rotation, float) or isinstance(rotation, int))
-            and -360 < rotation < 360
-        ):
-            a = rotation * math.pi / 180
-            x2 = x * math.cos(a) + y * math.sin(a)
-            y2 = -x * math.sin(a) + y * math.cos(a)
-            x = x2
-            y = y2
-        return x, y
+        return getSendTransform(dataStorage).apply(x, y)
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3])
         raise e
@@ -829,9 +837,89 @@ def apply_pt_transform_matrix(pt: Point, dataStorage) -> Point:
     return pt
 
 
+def get_affine_matrix(matrix) -> Union[np.ndarray, None]:
+    """Returns a 4x4 matrix (applied to row vectors [x, y, z, 1]) as an affine ndarray:
+    like apply_pt_transform_matrix, the 4th result component is ignored."""
+    try:
+        affine = np.array(matrix, dtype=float).reshape(4, 4)
+        affine[:3, 3] = 0
+        affine[3, 3] = 1
+        return affine
+    except Exception as e:
+        print(e)
+    return None
+
+
+def get_scale_matrix(scale: float) -> np.ndarray:
+    return np.diag([scale, scale, scale, 1.0])
+
+
+def get_receive_crs_matrix(dataStorage) -> np.ndarray:
+    """Rotation and offsets of transform_speckle_pt_on_receive, as one 4x4 matrix."""
+    offset_x = dataStorage.crs_offset_x
+    offset_y = dataStorage.crs_offset_y
+    rotation = dataStorage.crs_rotation
+    crs_matrix = np.identity(4)
+
+    gisLayer = None
+    try:
+        gisLayer = dataStorage.latestHostApp.lower().endswith("gis")
+    except Exception as e:
+        print(e)
+
+    # for GIS layers, use the offsets and rotation of the received layer
+    if gisLayer is True:
+        try:
+            offset_x = dataStorage.current_layer_crs_offset_x
+            offset_y = dataStorage.current_layer_crs_offset_y
+            rotation = dataStorage.current_layer_crs_rotation
+        except Exception as e:
+            print(e)
+            return crs_matrix
+        if not isinstance(rotation, float):
+            rotation = None
+
+    if (
+        rotation is not None
+        and (isinstance(rotation, float) or isinstance(rotation, int))
+        and -360 < rotation < 360
+    ):
+        a = rotation * math.pi / 180
+        crs_matrix[0, 0] = crs_matrix[1, 1] = math.cos(a)
+        crs_matrix[0, 1] = math.sin(a)
+        crs_matrix[1, 0] = -math.sin(a)
+    if (
+        offset_x is not None
+        and isinstance(offset_x, float)
+        and offset_y is not None
+        and isinstance(offset_y, float)
+    ):
+        crs_matrix[3, 0] = offset_x
+        crs_matrix[3, 1] = offset_y
+    return crs_matrix
+
+
+def get_receive_matrix(dataStorage, scale: float = 1.0, crs: bool = True) -> np.ndarray:
+    """Composite of pointToNative: units scale, instance matrix, then rotation and offsets."""
+    receive_matrix = get_scale_matrix(scale)
+    if dataStorage.matrix is not None:
+        instance_matrix = get_affine_matrix(dataStorage.matrix)
+        if instance_matrix is not None:
+            receive_matrix = receive_matrix @ instance_matrix
+    if crs is True:
+        receive_matrix = receive_matrix @ get_receive_crs_matrix(dataStorage)
+    return receive_matrix
+
+
+def apply_receive_matrix(vertices, receive_matrix: np.ndarray) -> np.ndarray:
+    """Applies a 4x4 composite to flat or N x 3 vertices, returns N x 3 array."""
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    return vertices @ receive_matrix[:3, :3] + receive_matrix[3, :3]
+
+
 def apply_feature_crs_transform(f, sourceCRS, targetCRS, dataStorage):
     if sourceCRS != targetCRS:
-        xform = QgsCoordinateTransform(sourceCRS, targetCRS, dataStorage.project)
+        xform = getTransform(sourceCRS, targetCRS, dataStorage.project)
         geometry = f.geometry()
         geometry.transform(xform)
         f.setGeometry(geometry)
@@ -840,6 +928,6 @@ def apply_feature_crs_transform(f, sourceCRS, targetCRS, dataStorage):
 
 def apply_qgis_geometry_crs_transform(geometry, sourceCRS, targetCRS, dataStorage):
     if sourceCRS != targetCRS:
-        xform = QgsCoordinateTransform(sourceCRS, targetCRS, dataStorage.project)
+        xform = getTransform(sourceCRS, targetCRS, dataStorage.project)
         geometry.transform(xform)
     return geometry
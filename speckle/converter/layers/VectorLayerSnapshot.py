@@ -0,0 +1,58 @@
+from typing import List
+
+try:
+    from qgis.core import (
+        QgsCoordinateReferenceSystem,
+        QgsFeature,
+        QgsFields,
+        QgsVectorLayer,
+    )
+except ModuleNotFoundError:
+    pass
+
+
+class VectorLayerSnapshot:
+    """Copy of a vector layer taken on the sending thread (features, fields, CRS and
+    renderer), so that the layer can be converted in a worker thread.
+    Provides the QgsVectorLayer methods used by the converters."""
+
+    def __init__(self, layer: "QgsVectorLayer"):
+        self._id: str = layer.id()
+        self._name: str = layer.name()
+        self._crs = QgsCoordinateReferenceSystem(layer.crs())
+        self._fields = QgsFields(layer.fields())
+        self._wkbType = layer.wkbType()
+        self._geometryType = layer.geometryType()
+        renderer = layer.renderer()
+        self._renderer = renderer.clone() if renderer is not None else None
+        self._features: List["QgsFeature"] = [
+            QgsFeature(f) for f in layer.getFeatures()
+        ]
+
+    def id(self) -> str:
+        return self._id
+
+    def name(self) -> str:
+        return self._name
+
+    def crs(self) -> "QgsCoordinateReferenceSystem":
+        return self._crs
+
+    def fields(self) -> "QgsFields":
+        return self._fields
+
+    def wkbType(self):
+        return self._wkbType
+
+    def geometryType(self):
+        return self._geometryType
+
+    def renderer(self):
+        return self._renderer
+
+    def featureCount(self) -> int:
+        return len(self._features)
+
+    def getFeatures(self, request=None):
+        # the features are already read: the request (e.g. without geometry) is not needed
+        return iter(self._features)
@@ -2,11 +2,12 @@
 Contains all Layer related classes and methods.
 """
 
+import copy
 import enum
 import inspect
 import hashlib
 import math
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 from specklepy.objects import Base
 from specklepy.objects.geometry import (
     Mesh,
@@ -21,6 +22,7 @@ from specklepy.objects.geometry import (
 )
 import os
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 
 from plugin_utils.helpers import (
@@ -31,6 +33,7 @@ from plugin_utils.helpers import (
 )
 from speckle.converter.layers.GISAttributeFieldType import GISAttributeFieldType
 from speckle.converter.layers.GISLayerGeometryType import GISLayerGeometryType
+from speckle.converter.layers.VectorLayerSnapshot import VectorLayerSnapshot
 
 # from qgis._core import Qgis, QgsVectorLayer, QgsWkbTypes
 try:
@@ -62,6 +65,7 @@ try:
         osr,
     )
     from PyQt5.QtGui import QColor
+    from PyQt5.QtCore import QCoreApplication, QEvent
 except ModuleNotFoundError:
     pass
 
@@ -79,7 +83,7 @@ from speckle.converter.layers import (
 )
 from speckle.converter.features.feature_conversions import (
     featureToSpeckle,
-    rasterFeatureToSpeckle,
+    rasterFeaturesToSpeckle,
     featureToNative,
     nonGeomFeatureToNative,
     cadFeatureToNative,
@@ -89,12 +93,17 @@ from speckle.converter.layers.utils import (
     collectionsFromJson,
     colorFromSpeckle,
     colorFromSpeckle,
+    compileLayerTransforms,
     generate_qgis_app_id,
     generate_qgis_raster_app_id,
     getDisplayValueList,
     getElevationLayer,
     getLayerGeomType,
     getLayerAttributes,
+    getLayerTransform,
+    getFeaturesById,
+    getRasterTilesOffsets,
+    getRasterTileBand,
     isAppliedLayerTransformByKeywords,
     tryCreateGroup,
     tryCreateGroupTree,
@@ -102,6 +111,11 @@ from speckle.converter.layers.utils import (
     validateAttributeName,
 )
 from speckle.converter.geometry.mesh import writeMeshToShp
+from speckle.converter.geometry.polygon import triangulatePolygonLayer
+from speckle.converter.geometry.triangulation import (
+    TRIANGULATION_MIN_BATCH,
+    clear_precomputed_triangulations,
+)
 
 from speckle.converter.layers.symbology import (
     vectorRendererToNative,
@@ -113,8 +127,24 @@ from speckle.converter.layers.symbology import (
 import numpy as np
 
 from speckle.utils.panel_logging import logToUser
+from speckle.utils.serialization import CachedObject
 
 from plugin_utils.helpers import SYMBOL, UNSUPPORTED_PROVIDERS
+from plugin_utils.threads import CANCELLATION_TOKEN, AckQueue
+
+# vector layers converted at the same time on send
+LAYER_CONVERSION_WORKERS = min(4, os.cpu_count() or 1)
+
+# seconds spent on the Qt main thread to add each received layer, by layer name
+RECEIVE_MAIN_THREAD_TIMES: Dict[str, float] = {}
+
+# received layers converted, but not yet added by the main thread (limits memory use)
+# can be set in the project variable 'speckle_receive_max_layers_in_flight'
+RECEIVE_MAX_LAYERS_IN_FLIGHT = 4
+RECEIVE_QUEUE = AckQueue(RECEIVE_MAX_LAYERS_IN_FLIGHT)
+
+# features added at once by the main thread, before letting QGIS repaint the UI
+RECEIVE_FEATURES_CHUNK_SIZE = 5000
 
 GEOM_LINE_TYPES = [
     "Objects.Geometry.Line",
@@ -154,6 +184,10 @@ def convertSelectedLayersToSpeckle(
 
             jsonTree = jsonFromList(jsonTree, levels)
 
+        # parse saved transformations once for all layers
+        compileLayerTransforms(layers, plugin.dataStorage)
+
+        # validate all layers before converting
         for i, layer in enumerate(layers):
             data_provider_type = (
                 layer.providerType()
@@ -166,77 +200,71 @@ def convertSelectedLayersToSpeckle(
                 )
                 return None
 
-            logToUser(
-                f"Converting layer '{layer.name()}'...",
-                level=0,
-                plugin=plugin.dockwidget,
-            )
-            try:
-                for item in plugin.dataStorage.savedTransforms:
-                    layer_name = item.split("  ->  ")[0].split(" ('")[0]
-                    transform_name = item.split("  ->  ")[1]
-                    if layer_name == layer.name():
-                        logToUser(
-                            f"Applying transformation to layer '{layer_name}': '{transform_name}'",
-                            level=0,
-                            plugin=plugin.dockwidget,
-                        )
-            except Exception as e:
-                print(e)
-
-            if plugin.dataStorage.savedTransforms is not None:
-                for item in plugin.dataStorage.savedTransforms:
-                    layer_name = item.split("  ->  ")[0].split(" ('")[0]
-                    transform_name = item.split("  ->  ")[1].lower()
-
-                    # check all the conditions for transform
-                    if (
-                        isinstance(layer, QgsVectorLayer)
-                        and layer.name() == layer_name
-                        and "extrude" in transform_name
-                        and "polygon" in transform_name
-                    ):
-                        if plugin.dataStorage.project.crs().isGeographic():
-                            logToUser(
-                                "Extrusion cannot be applied when the project CRS is set to Geographic type",
-                                level=2,
-                                plugin=plugin.dockwidget,
-                            )
-                            return None
-
-                        attribute = None
-                        if " ('" in item:
-                            attribute = item.split(" ('")[1].split("') ")[0]
-                        if (
-                            attribute is None
-                            or str(attribute) not in layer.fields().names()
-                        ) and "ignore" in transform_name:
-                            logToUser(
-                                "Attribute for extrusion not found",
-                                level=2,
-                                plugin=plugin.dockwidget,
-                            )
-                            return None
-
-                    elif (
-                        isinstance(layer, QgsRasterLayer)
-                        and layer.name() == layer_name
-                        and "elevation" in transform_name
-                    ):
-                        if plugin.dataStorage.project.crs().isGeographic():
-                            logToUser(
-                                "Raster layer transformation cannot be applied when the project CRS is set to Geographic type",
-                                level=2,
-                                plugin=plugin.dockwidget,
-                            )
-                            return None
-
-            converted = layerToSpeckle(layer, projectCRS, plugin)
+            transform = getLayerTransform(layer, plugin.dataStorage)
+            if transform is None:
+                continue
+
+            # check all the conditions for transform
+            if isinstance(layer, QgsVectorLayer) and transform["extrude"]:
+                if plugin.dataStorage.project.crs().isGeographic():
+                    logToUser(
+                        "Extrusion cannot be applied when the project CRS is set to Geographic type",
+                        level=2,
+                        plugin=plugin.dockwidget,
+                    )
+                    return None
+
+                attribute = transform["attribute"]
+                if (
+                    attribute is None or str(attribute) not in layer.fields().names()
+                ) and transform["ignore"]:
+                    logToUser(
+                        "Attribute for extrusion not found",
+                        level=2,
+                        plugin=plugin.dockwidget,
+                    )
+                    return None
+
+            elif isinstance(layer, QgsRasterLayer) and transform["elevation"]:
+                if plugin.dataStorage.project.crs().isGeographic():
+                    logToUser(
+                        "Raster layer transformation cannot be applied when the project CRS is set to Geographic type",
+                        level=2,
+                        plugin=plugin.dockwidget,
+                    )
+                    return None
+
+        # layers are read here one by one (layer and provider APIs are not thread-safe),
+        # vector layers are converted from their snapshots in a thread pool
+        reports = [[] for _ in layers]
+        futures = []
+        executor = ThreadPoolExecutor(
+            max_workers=LAYER_CONVERSION_WORKERS,
+            thread_name_prefix="speckle_layer_conversion",
+        )
+        try:
+            for i, layer in enumerate(layers):
+                CANCELLATION_TOKEN.check()
+                # limit the number of layer snapshots kept in memory
+                waitForLayerConversions(futures, LAYER_CONVERSION_WORKERS - 1)
+                futures.append(
+                    convertLayerToSpeckle(
+                        layer, projectCRS, plugin, executor, i, reports[i]
+                    )
+                )
+            waitForLayerConversions(futures, 0)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # assemble the results in the order of the layers
+        for i, layer in enumerate(layers):
+            dataStorage.latestActionReport.extend(reports[i])
+            converted = futures[i].result()
             # print(converted)
             if converted is not None:
-                # add displayPriority to elements
+                # add displayPriority to elements (already set in the cached ones)
                 for el in converted.elements:
-                    if not isinstance(el, GisNonGeometryElement):
+                    if not isinstance(el, (GisNonGeometryElement, CachedObject)):
                         el["displayOrder"] = i
 
                 structure = tree_structure[i]
@@ -262,18 +290,72 @@ def convertSelectedLayersToSpeckle(
         return baseCollection
 
 
+def waitForLayerConversions(futures: List[Future], max_pending: int):
+    """Waits until at most 'max_pending' layers are being converted, stops on cancel."""
+    while True:
+        pending = [f for f in futures if not f.done()]
+        if len(pending) <= max_pending:
+            return
+        wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+        CANCELLATION_TOKEN.check()
+
+
+def convertLayerToSpeckle(
+    layer: Union["QgsVectorLayer", "QgsRasterLayer"],
+    projectCRS: "QgsCoordinateReferenceSystem",
+    plugin,
+    executor: ThreadPoolExecutor,
+    displayOrder: Optional[int] = None,
+    report: Optional[List[dict]] = None,
+) -> Future:
+    """Logs the applied transformations and starts the layer conversion. Vector layers are
+    converted in the executor from a snapshot, raster layers in the current thread."""
+    logToUser(
+        f"Converting layer '{layer.name()}'...",
+        level=0,
+        plugin=plugin.dockwidget,
+    )
+    try:
+        transform = getLayerTransform(layer, plugin.dataStorage)
+        if transform is not None:
+            logToUser(
+                f"Applying transformation to layer '{transform['layer_name']}': '{transform['label']}'",
+                level=0,
+                plugin=plugin.dockwidget,
+            )
+    except Exception as e:
+        print(e)
+
+    if isinstance(layer, QgsVectorLayer):
+        return executor.submit(
+            layerToSpeckle,
+            VectorLayerSnapshot(layer),
+            projectCRS,
+            plugin,
+            displayOrder,
+            report,
+        )
+    future = Future()
+    future.set_result(layerToSpeckle(layer, projectCRS, plugin, displayOrder, report))
+    return future
+
+
 def layerToSpeckle(
-    selectedLayer: Union["QgsVectorLayer", "QgsRasterLayer"],
+    selectedLayer: Union["QgsVectorLayer", "QgsRasterLayer", VectorLayerSnapshot],
     projectCRS: "QgsCoordinateReferenceSystem",
     plugin,
+    displayOrder: Optional[int] = None,
+    report: Optional[List[dict]] = None,
 ) -> Union[
     VectorLayer, RasterLayer
 ]:  # now the input is QgsVectorLayer instead of qgis._core.QgsLayerTreeLayer
-    """Converts a given QGIS Layer to Speckle"""
+    """Converts a given QGIS Layer (or a snapshot of a vector layer) to Speckle"""
+    dataStorage = plugin.dataStorage
+    if report is None:
+        report = dataStorage.latestActionReport
     try:
         # print("___layerToSpeckle")
-        dataStorage = plugin.dataStorage
-        dataStorage.latestActionFeaturesReport = []
+        features_report = []
         project: QgsProject = plugin.project
         layerName = selectedLayer.name()
 
@@ -318,7 +400,7 @@ def layerToSpeckle(
         renderer = selectedLayer.renderer()
         layerRenderer = rendererToSpeckle(renderer)
 
-        if isinstance(selectedLayer, QgsVectorLayer):
+        if isinstance(selectedLayer, (QgsVectorLayer, VectorLayerSnapshot)):
             fieldnames = []  # [str(field.name()) for field in selectedLayer.fields()]
             attributes = Base()
             for field in selectedLayer.fields():
@@ -384,18 +466,26 @@ def layerToSpeckle(
                     plugin=plugin.dockwidget,
                 )
 
+            # triangulate polygons of large layers in advance, in parallel processes
+            triangulated = None
+            if selectedLayer.featureCount() >= TRIANGULATION_MIN_BATCH:
+                triangulated = triangulatePolygonLayer(
+                    selectedLayer, selectedLayer.getFeatures(), plugin.dataStorage
+                )
+
             # write features
             all_errors_count = 0
             for i, f in enumerate(features):
-                dataStorage.latestActionFeaturesReport.append(
-                    {"feature_id": str(i + 1), "obj_type": "", "errors": ""}
-                )
+                CANCELLATION_TOKEN.check()
+                feature_report = {"feature_id": str(i + 1), "obj_type": "", "errors": ""}
+                features_report.append(feature_report)
                 b = featureToSpeckle(
                     fieldnames,
                     f,
                     geomType,
                     selectedLayer,
                     plugin.dataStorage,
+                    feature_report,
                 )
                 # if b is None: continue
 
@@ -415,14 +505,12 @@ def layerToSpeckle(
                     b.applicationId = generate_qgis_app_id(selectedLayer, f)
 
                 layerObjs.append(b)
-                if (
-                    dataStorage.latestActionFeaturesReport[
-                        len(dataStorage.latestActionFeaturesReport) - 1
-                    ]["errors"]
-                    != ""
-                ):
+                if feature_report["errors"] != "":
                     all_errors_count += 1
 
+            if triangulated is not None:
+                clear_precomputed_triangulations()
+
             # Convert layer to speckle
             layerBase = VectorLayer(
                 units=units_proj,
@@ -437,7 +525,7 @@ def layerToSpeckle(
                 geomType=geomType,
             )
             if all_errors_count == 0:
-                dataStorage.latestActionReport.append(
+                report.append(
                     {
                         "feature_id": layerName,
                         "obj_type": layerBase.speckle_type,
@@ -445,15 +533,15 @@ def layerToSpeckle(
                     }
                 )
             else:
-                dataStorage.latestActionReport.append(
+                report.append(
                     {
                         "feature_id": layerName,
                         "obj_type": layerBase.speckle_type,
                         "errors": f"{all_errors_count} features failed",
                     }
                 )
-            for item in dataStorage.latestActionFeaturesReport:
-                dataStorage.latestActionReport.append(item)
+            for item in features_report:
+                report.append(item)
 
             layerBase.renderer = layerRenderer
             # layerBase.applicationId = selectedLayer.id()
@@ -461,13 +549,12 @@ def layerToSpeckle(
             return layerBase
 
         elif isinstance(selectedLayer, QgsRasterLayer):
-            # write feature attributes
-            b = rasterFeatureToSpeckle(selectedLayer, projectCRS, project, plugin)
-            b.applicationId = (
-                f"{selectedLayer.id()}_0"  # generate_qgis_raster_app_id(selectedLayer)
+            # write feature attributes, 1 element per raster tile
+            elements = rasterFeaturesToSpeckle(
+                selectedLayer, projectCRS, project, plugin, displayOrder
             )
-            if b is None:
-                dataStorage.latestActionReport.append(
+            if elements is None or None in elements:
+                report.append(
                     {
                         "feature_id": layerName,
                         "obj_type": "Raster Layer",
@@ -475,7 +562,7 @@ def layerToSpeckle(
                     }
                 )
                 return None
-            layerObjs.append(b)
+            layerObjs.extend(elements)
             # Convert layer to speckle
             layerBase = RasterLayer(
                 units=units_proj,
@@ -488,7 +575,7 @@ def layerToSpeckle(
                 rasterCrs=layerCRS,
                 elements=layerObjs,
             )
-            dataStorage.latestActionReport.append(
+            report.append(
                 {
                     "feature_id": layerName,
                     "obj_type": layerBase.speckle_type,
@@ -501,7 +588,7 @@ def layerToSpeckle(
             return layerBase
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
-        dataStorage.latestActionReport.append(
+        report.append(
             {
                 "feature_id": layerName,
                 "obj_type": "",
@@ -557,36 +644,174 @@ def layerToNative(
         return
 
 
+def getReceivedLayerNames(
+    layerName: str, streamBranch: str, suffix: str = ""
+) -> Tuple[str, str]:
+    """Returns the name of the received layer and of its group in the layer tree."""
+    shortName = layerName.split(SYMBOL)[len(layerName.split(SYMBOL)) - 1][:50]
+    try:
+        layerName = layerName.split(shortName)[0] + shortName + suffix
+    except:
+        layerName = layerName + suffix
+    finalName = shortName + suffix
+
+    try:
+        groupName = streamBranch + SYMBOL + layerName.split(finalName)[0]
+    except:
+        groupName = streamBranch + SYMBOL + layerName
+    return finalName, groupName
+
+
+def getReceiveStorage(
+    dataStorage, units: Optional[str], matrix: Optional[list] = None, crs=None
+):
+    """Returns a copy of dataStorage with the units, matrix and CRS offsets of one
+    received layer. The shared dataStorage is not changed, because the main thread
+    is still adding the previous layers."""
+    layerStorage = copy.copy(dataStorage)
+    layerStorage.currentUnits = units
+    if units is None or units == "degrees":
+        layerStorage.currentUnits = "m"
+    layerStorage.matrix = matrix
+    if crs is not None:
+        try:
+            layerStorage.current_layer_crs_offset_x = crs.offset_x
+            layerStorage.current_layer_crs_offset_y = crs.offset_y
+            layerStorage.current_layer_crs_rotation = crs.rotation
+        except AttributeError:
+            pass  # CRS sent by older connectors, without offsets
+    return layerStorage
+
+
+def featuresToNative(
+    geomList: List[Base],
+    newFields: "QgsFields",
+    featureConverter,
+    dataStorage,
+    skipMessage: str,
+    collectColors: bool = False,
+) -> Tuple[List["QgsFeature"], List[str], List, List[dict]]:
+    """Converts Speckle objects to QgsFeatures with the given converter, called from the
+    receive thread. Returns features, their Speckle IDs and colors, and the report items."""
+    fets = []
+    fetIds = []
+    fetColors = []
+    report_features = []
+    for f in geomList:
+        # pre-fill report:
+        report_features.append(
+            {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
+        )
+
+        new_feat = featureConverter(f, newFields, dataStorage)
+        if new_feat is not None and new_feat != "":
+            fets.append(new_feat)
+            fetIds.append(f.id)
+            if collectColors is True:
+                fetColors = findFeatColors(fetColors, f)
+        else:
+            logToUser(skipMessage, level=2, func=inspect.stack()[0][3])
+            report_features[len(report_features) - 1].update({"errors": skipMessage})
+
+    return fets, fetIds, fetColors, report_features
+
+
+def emitToMainThread(signal, obj: dict):
+    """Hands the converted layer over to the main thread, waits while too many are queued."""
+    CANCELLATION_TOKEN.check()
+    while not RECEIVE_QUEUE.put():
+        # keep waiting (the wait stops on cancel), e.g. a large layer is being styled
+        logToUser(
+            "Waiting for QGIS to add the previous received layers",
+            level=0,
+            func=inspect.stack()[0][3],
+        )
+    signal.emit(obj)
+
+
+def logMainThreadTime(layerName: str, time_start: float):
+    """Records the time spent on the Qt main thread for the received layer."""
+    RECEIVE_MAIN_THREAD_TIMES[layerName] = time.perf_counter() - time_start
+
+
+def getMainThreadTimesSummary() -> Optional[str]:
+    """Total and longest time spent on the main thread by the received layers."""
+    if len(RECEIVE_MAIN_THREAD_TIMES) == 0:
+        return None
+    slowest = max(RECEIVE_MAIN_THREAD_TIMES, key=RECEIVE_MAIN_THREAD_TIMES.get)
+    total = sum(RECEIVE_MAIN_THREAD_TIMES.values())
+    return (
+        f"Time to add layers in QGIS: {total:.2f}s in total, "
+        f"{RECEIVE_MAIN_THREAD_TIMES[slowest]:.2f}s max ('{slowest}')"
+    )
+
+
+def addFeaturesInChunks(pr, fets: List["QgsFeature"]):
+    """Adds the features to the layer provider in chunks, repainting the UI in
+    between, so QGIS does not look frozen while a large layer is added.
+    Only repaints are processed: other received layers are not added in between."""
+    for i in range(0, len(fets), RECEIVE_FEATURES_CHUNK_SIZE):
+        if i > 0:
+            QCoreApplication.sendPostedEvents(None, QEvent.UpdateRequest)
+        pr.addFeatures(fets[i : i + RECEIVE_FEATURES_CHUNK_SIZE])
+
+
 def nonGeometryLayerToNative(
     geomList: List[Base], nameBase: str, val_id: str, streamBranch: str, plugin
 ):
     # print("01_____NON-GEOMETRY layer to native")
 
     try:
+        dataStorage = plugin.dataStorage
         layerName = removeSpecialCharacters(nameBase)
+        finalName, groupName = getReceivedLayerNames(layerName, streamBranch, "_Table")
+        dataStorage.latestActionLayers.append(finalName)
+
         newFields = getLayerAttributes(geomList)
+        if newFields is None:
+            newFields = QgsFields()
 
-        if plugin.dataStorage.latestHostApp.endswith("excel"):
-            plugin.dockwidget.signal_6.emit(
+        layerStorage = dataStorage
+        if not dataStorage.latestHostApp.endswith("excel"):
+            crs = dataStorage.project.crs()
+            layerStorage = getReceiveStorage(
+                dataStorage, str(QgsUnitTypes.encodeUnit(crs.mapUnits()))
+            )
+
+        # convert features here, the main thread only adds them to the new layer
+        fets, _, _, report_features = featuresToNative(
+            geomList,
+            newFields,
+            nonGeomFeatureToNative,
+            layerStorage,
+            "Table feature skipped due to invalid data",
+        )
+
+        if dataStorage.latestHostApp.endswith("excel"):
+            emitToMainThread(
+                plugin.dockwidget.signal_6,
                 {
                     "plugin": plugin,
-                    "layerName": layerName,
+                    "finalName": finalName,
+                    "groupName": groupName,
                     "val_id": val_id,
-                    "streamBranch": streamBranch,
                     "newFields": newFields,
-                    "geomList": geomList,
-                }
+                    "fets": fets,
+                    "report_features": report_features,
+                },
             )
         else:
-            plugin.dockwidget.signal_5.emit(
+            emitToMainThread(
+                plugin.dockwidget.signal_5,
                 {
                     "plugin": plugin,
-                    "layerName": layerName,
+                    "finalName": finalName,
+                    "groupName": groupName,
                     "layer_id": val_id,
-                    "streamBranch": streamBranch,
                     "newFields": newFields,
-                    "geomList": geomList,
-                }
+                    "fets": fets,
+                    "report_features": report_features,
+                },
             )
 
         return
@@ -599,68 +824,23 @@ def nonGeometryLayerToNative(
 def addExcelMainThread(obj: Tuple):
     # print("___addExcelMainThread")
     try:
+        time_start = time.perf_counter()
         finalName = ""
         plugin = obj["plugin"]
-        layerName = obj["layerName"]
-        streamBranch = obj["streamBranch"]
+        finalName = obj["finalName"]
+        groupName = obj["groupName"]
         val_id = obj["val_id"]
         newFields = obj["newFields"]
-        geomList = obj["geomList"]
+        fets = obj["fets"]
+        report_features = obj["report_features"]
         plugin.dockwidget.msgLog.removeBtnUrl("cancel")
 
         dataStorage = plugin.dataStorage
         project: QgsProject = plugin.dataStorage.project
 
         geomType = "None"
-        geom_print = "Table"
-
-        shortName = layerName.split(SYMBOL)[len(layerName.split(SYMBOL)) - 1][:50]
-        try:
-            layerName = layerName.split(shortName)[0] + shortName + ("_" + geom_print)
-        except:
-            layerName = layerName + ("_" + geom_print)
-        finalName = shortName + ("_" + geom_print)
-
-        try:
-            groupName = streamBranch + SYMBOL + layerName.split(finalName)[0]
-        except:
-            groupName = streamBranch + SYMBOL + layerName
         layerGroup = tryCreateGroupTree(project.layerTreeRoot(), groupName, plugin)
 
-        dataStorage.latestActionLayers.append(finalName)
-
-        ###########################################
-
-        # get features and attributes
-        fets = []
-        report_features = []
-        all_feature_errors_count = 0
-        # print("before newFields")
-        # print(newFields)
-        for f in geomList:
-            # print(f)
-            # pre-fill report:
-            report_features.append(
-                {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
-            )
-
-            new_feat = nonGeomFeatureToNative(f, newFields, plugin.dataStorage)
-            if new_feat is not None and new_feat != "":
-                fets.append(new_feat)
-            else:
-                logToUser(
-                    f"Table feature skipped due to invalid data",
-                    level=2,
-                    func=inspect.stack()[0][3],
-                )
-                report_features[len(report_features) - 1].update(
-                    {"errors": "Table feature skipped due to invalid data"}
-                )
-                all_feature_errors_count += 1
-
-        if newFields is None:
-            newFields = QgsFields()
-
         # print("04")
         vl = None
         vl = QgsVectorLayer(
@@ -674,7 +854,7 @@ def addExcelMainThread(obj: Tuple):
         pr.addAttributes(newFields.toList())
         vl.updateFields()
 
-        pr.addFeatures(fets)
+        addFeaturesInChunks(pr, fets)
         vl.updateExtents()
         vl.commitChanges()
 
@@ -710,6 +890,7 @@ def addExcelMainThread(obj: Tuple):
         for item in report_features:
             dataStorage.latestActionReport.append(item)
         dataStorage.latestConversionTime = datetime.now()
+        logMainThreadTime(finalName, time_start)
 
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
@@ -723,41 +904,32 @@ def addExcelMainThread(obj: Tuple):
             }
         )
         dataStorage.latestConversionTime = datetime.now()
+    finally:
+        # let the receive thread hand over the next layer
+        RECEIVE_QUEUE.ack()
 
 
 def addNonGeometryMainThread(obj: Tuple):
     # print("___addCadMainThread")
     try:
+        time_start = time.perf_counter()
         finalName = ""
+        geom_print = "Table"
         plugin = obj["plugin"]
-        layerName = obj["layerName"]
+        finalName = obj["finalName"]
+        groupName = obj["groupName"]
         layer_id = obj["layer_id"]
-        streamBranch = obj["streamBranch"]
         newFields = obj["newFields"]
-        geomList = obj["geomList"]
+        fets = obj["fets"]
+        report_features = obj["report_features"]
         plugin.dockwidget.msgLog.removeBtnUrl("cancel")
 
         project: QgsProject = plugin.dataStorage.project
         dataStorage = plugin.dataStorage
 
         geomType = "None"
-        geom_print = "Table"
-
-        shortName = layerName.split(SYMBOL)[len(layerName.split(SYMBOL)) - 1][:50]
-        try:
-            layerName = layerName.split(shortName)[0] + shortName + ("_" + geom_print)
-        except:
-            layerName = layerName + ("_" + geom_print)
-        finalName = shortName + ("_" + geom_print)
-
-        try:
-            groupName = streamBranch + SYMBOL + layerName.split(finalName)[0]
-        except:
-            groupName = streamBranch + SYMBOL + layerName
         layerGroup = tryCreateGroupTree(project.layerTreeRoot(), groupName, plugin)
 
-        dataStorage.latestActionLayers.append(finalName)
-
         ###########################################
         dummy = None
         root = project.layerTreeRoot()
@@ -773,13 +945,6 @@ def addNonGeometryMainThread(obj: Tuple):
         #################################################
 
         crs = project.crs()  # QgsCoordinateReferenceSystem.fromWkt(layer.crs.wkt)
-        plugin.dataStorage.currentUnits = str(QgsUnitTypes.encodeUnit(crs.mapUnits()))
-        if (
-            plugin.dataStorage.currentUnits is None
-            or plugin.dataStorage.currentUnits == "degrees"
-        ):
-            plugin.dataStorage.currentUnits = "m"
-        # authid = trySaveCRS(crs, streamBranch)
 
         if crs.isGeographic is True:
             logToUser(
@@ -797,43 +962,9 @@ def addNonGeometryMainThread(obj: Tuple):
         pr = vl.dataProvider()
         vl.startEditing()
 
-        # create list of Features (fets) and list of Layer fields (fields)
-        attrs = QgsFields()
-        fets = []
-        fetIds = []
-        fetColors = []
-
-        report_features = []
         all_feature_errors_count = 0
-        for f in geomList[:]:
-            # pre-fill report:
-            report_features.append(
-                {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
-            )
-
-            new_feat = nonGeomFeatureToNative(f, newFields, plugin.dataStorage)
-            # update attrs for the next feature (if more fields were added from previous feature)
-
-            # print("________cad feature to add")
-            if new_feat is not None and new_feat != "":
-                fets.append(new_feat)
-                for a in newFields.toList():
-                    attrs.append(a)
-
-                pr.addAttributes(
-                    newFields
-                )  # add new attributes from the current object
-                fetIds.append(f.id)
-                fetColors = findFeatColors(fetColors, f)
-            else:
-                logToUser(
-                    f"Table feature skipped due to invalid data",
-                    level=2,
-                    func=inspect.stack()[0][3],
-                )
-                report_features[len(report_features) - 1].update(
-                    {"errors": "Table feature skipped due to invalid data"}
-                )
+        for item in report_features:
+            if item["errors"] != "":
                 all_feature_errors_count += 1
 
         # add Layer attribute fields
@@ -841,7 +972,7 @@ def addNonGeometryMainThread(obj: Tuple):
         vl.updateFields()
 
         # pr = vl.dataProvider()
-        pr.addFeatures(fets)
+        addFeaturesInChunks(pr, fets)
         vl.updateExtents()
         vl.commitChanges()
 
@@ -872,6 +1003,7 @@ def addNonGeometryMainThread(obj: Tuple):
         for item in report_features:
             dataStorage.latestActionReport.append(item)
         dataStorage.latestConversionTime = datetime.now()
+        logMainThreadTime(finalName, time_start)
 
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
@@ -885,6 +1017,9 @@ def addNonGeometryMainThread(obj: Tuple):
             }
         )
         dataStorage.latestConversionTime = datetime.now()
+    finally:
+        # let the receive thread hand over the next layer
+        RECEIVE_QUEUE.ack()
 
 
 def geometryLayerToNative(
@@ -1015,65 +1150,17 @@ def bimVectorLayerToNative(
 ):
     # print("02_________BIM vector layer to native_____")
     try:
-        # project: QgsProject = plugin.project
-        # print(layerName_old)
+        dataStorage = plugin.dataStorage
+        project: QgsProject = dataStorage.project
 
         layerName = layerName_old  # [:50]
         layerName = removeSpecialCharacters(layerName)
-        # print(layerName)
-
-        # get Project CRS, use it by default for the new received layer
-        vl = None
-        # layerName = layerName + "_" + geomType
-        # print(layerName)
 
         r"""
         if "mesh" in geomType.lower():
             geomType = "MultiPolygonZ"
         """
 
-        newFields = getLayerAttributes(geomList)
-        # print("___________Layer fields_____________")
-        # print(newFields.toList())
-
-        plugin.dockwidget.signal_2.emit(
-            {
-                "plugin": plugin,
-                "geomType": geomType,
-                "layerName": layerName,
-                "layer_id": val_id,
-                "streamBranch": streamBranch,
-                "newFields": newFields,
-                "geomList": geomList,
-                "matrix": matrix,
-            }
-        )
-
-        return
-    except Exception as e:
-        logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
-        return
-
-
-def addBimMainThread(obj: Tuple):
-    try:
-        finalName = ""
-        plugin = obj["plugin"]
-        geomType = obj["geomType"]
-        layerName = obj["layerName"]
-        layer_id = obj["layer_id"]
-        streamBranch = obj["streamBranch"]
-        newFields = obj["newFields"]
-        geomList = obj["geomList"]
-        matrix = obj["matrix"]
-        plugin.dockwidget.msgLog.removeBtnUrl("cancel")
-
-        dataStorage = plugin.dataStorage
-        dataStorage.matrix = matrix
-        report_features = []
-
-        project: QgsProject = dataStorage.project
-
         geom_print = geomType
         if "multipolygon" in geom_print.lower():
             geom_print = "Mesh"
@@ -1082,51 +1169,21 @@ def addBimMainThread(obj: Tuple):
         elif "point" in geom_print.lower():
             geom_print = "Point"
 
-        shortName = layerName.split(SYMBOL)[len(layerName.split(SYMBOL)) - 1][:50]
-        # print(f"Final short name: {shortName}")
-        try:
-            layerName = (
-                layerName.split(shortName)[0] + shortName + ("_as_" + geom_print)
-            )
-        except:
-            layerName = layerName + ("_as_" + geom_print)
-        finalName = shortName + ("_as_" + geom_print)
+        finalName, groupName = getReceivedLayerNames(
+            layerName, streamBranch, "_as_" + geom_print
+        )
         dataStorage.latestActionLayers.append(finalName)
 
-        try:
-            groupName = streamBranch + SYMBOL + layerName.split(finalName)[0]
-        except:
-            groupName = streamBranch + SYMBOL + layerName
-        layerGroup = tryCreateGroupTree(project.layerTreeRoot(), groupName, plugin)
+        newFields = getLayerAttributes(geomList)
+        # print("___________Layer fields_____________")
+        # print(newFields.toList())
 
         # newName = f'{streamBranch.split("_")[len(streamBranch.split("_"))-1]}_{layerName}'
         newName_shp = f'{streamBranch.split("_")[len(streamBranch.split("_"))-1]}/{finalName[:30]}'
 
-        ###########################################
-        dummy = None
-        root = project.layerTreeRoot()
-        dataStorage.all_layers = getAllLayers(root)
-        if dataStorage.all_layers is not None:
-            if len(dataStorage.all_layers) == 0:
-                dummy = QgsVectorLayer(
-                    "Point?crs=EPSG:4326", "", "memory"
-                )  # do something to distinguish: stream_id_latest_name
-                crs = QgsCoordinateReferenceSystem(4326)
-                dummy.setCrs(crs)
-                project.addMapLayer(dummy, True)
-        #################################################
-
         crs = project.crs()  # QgsCoordinateReferenceSystem.fromWkt(layer.crs.wkt)
-        dataStorage.currentUnits = str(QgsUnitTypes.encodeUnit(crs.mapUnits()))
-        if dataStorage.currentUnits is None or dataStorage.currentUnits == "degrees":
-            dataStorage.currentUnits = "m"
-
-        if crs.isGeographic is True:
-            logToUser(
-                f"Project CRS is set to Geographic type, and objects in linear units might not be received correctly",
-                level=1,
-                func=inspect.stack()[0][3],
-            )
+        units = str(QgsUnitTypes.encodeUnit(crs.mapUnits()))
+        layerStorage = getReceiveStorage(dataStorage, units)
 
         p = (
             os.path.expandvars(r"%LOCALAPPDATA%")
@@ -1149,49 +1206,36 @@ def addBimMainThread(obj: Tuple):
         findOrCreatePath(path_bim)
         # print(path_bim)
 
-        shp = writeMeshToShp(geomList, path_bim + newName_shp, dataStorage)
-        dataStorage.matrix = None
+        shp = writeMeshToShp(
+            geomList,
+            path_bim + newName_shp,
+            getReceiveStorage(dataStorage, units, matrix),
+        )
         if shp is None:
             return
         # print("____ meshes saved___")
         # print(shp)
 
+        # read the written shapes once, indexed by Speckle id
         vl_shp = QgsVectorLayer(
             shp + ".shp", finalName, "ogr"
         )  # do something to distinguish: stream_id_latest_name
-        vl = QgsVectorLayer(
-            geomType + "?crs=" + crs.authid(), finalName, "memory"
-        )  # do something to distinguish: stream_id_latest_name
-        vl.setCrs(crs)
-        project.addMapLayer(vl, False)
-
-        pr = vl.dataProvider()
-        vl.startEditing()
+        shapes_by_id = getFeaturesById(vl_shp.getFeatures())
 
-        # add Layer attribute fields
-        pr.addAttributes(newFields)
-        vl.updateFields()
-
-        # create list of Features (fets) and list of Layer fields (fields)
-        # attrs = QgsFields()
+        # create list of Features (fets), the main thread only adds them to the new layer
         fets = []
         fetIds = []
         fetColors = []
 
         report_features = []
-        all_feature_errors_count = 0
-        for i, f in enumerate(geomList[:]):
+        for f in geomList[:]:
             # pre-fill report:
             report_features.append(
                 {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
             )
 
             try:
-                exist_feat: None = None
-                for n, shape in enumerate(vl_shp.getFeatures()):
-                    if shape["speckle_id"] == f.id:
-                        exist_feat = vl_shp.getFeature(n)
-                        break
+                exist_feat = shapes_by_id.get(f.id)
                 if exist_feat is None:
                     logToUser(
                         f"Feature skipped due to invalid geometry",
@@ -1204,12 +1248,11 @@ def addBimMainThread(obj: Tuple):
                     continue
 
                 new_feat = bimFeatureToNative(
-                    exist_feat, f, vl.fields(), crs, path_bim, dataStorage
+                    exist_feat, f, newFields, crs, path_bim, layerStorage
                 )
                 if new_feat is not None and new_feat != "":
                     fetColors = findFeatColors(fetColors, f)
                     fets.append(new_feat)
-                    vl.addFeature(new_feat)
                     fetIds.append(f.id)
                 else:
                     logToUser(
@@ -1225,6 +1268,91 @@ def addBimMainThread(obj: Tuple):
                 logToUser(e, level=2, func=inspect.stack()[0][3])
                 report_features[len(report_features) - 1].update({"errors": f"{e}"})
 
+        emitToMainThread(
+            plugin.dockwidget.signal_2,
+            {
+                "plugin": plugin,
+                "geomType": geomType,
+                "geom_print": geom_print,
+                "finalName": finalName,
+                "groupName": groupName,
+                "layer_id": val_id,
+                "newFields": newFields,
+                "fets": fets,
+                "fetIds": fetIds,
+                "fetColors": fetColors,
+                "report_features": report_features,
+            },
+        )
+
+        return
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
+        return
+
+
+def addBimMainThread(obj: Tuple):
+    try:
+        time_start = time.perf_counter()
+        finalName = ""
+        geom_print = ""
+        plugin = obj["plugin"]
+        geomType = obj["geomType"]
+        geom_print = obj["geom_print"]
+        finalName = obj["finalName"]
+        groupName = obj["groupName"]
+        layer_id = obj["layer_id"]
+        newFields = obj["newFields"]
+        fets = obj["fets"]
+        fetIds = obj["fetIds"]
+        fetColors = obj["fetColors"]
+        report_features = obj["report_features"]
+        plugin.dockwidget.msgLog.removeBtnUrl("cancel")
+
+        dataStorage = plugin.dataStorage
+        project: QgsProject = dataStorage.project
+
+        layerGroup = tryCreateGroupTree(project.layerTreeRoot(), groupName, plugin)
+
+        ###########################################
+        dummy = None
+        root = project.layerTreeRoot()
+        dataStorage.all_layers = getAllLayers(root)
+        if dataStorage.all_layers is not None:
+            if len(dataStorage.all_layers) == 0:
+                dummy = QgsVectorLayer(
+                    "Point?crs=EPSG:4326", "", "memory"
+                )  # do something to distinguish: stream_id_latest_name
+                crs = QgsCoordinateReferenceSystem(4326)
+                dummy.setCrs(crs)
+                project.addMapLayer(dummy, True)
+        #################################################
+
+        crs = project.crs()  # QgsCoordinateReferenceSystem.fromWkt(layer.crs.wkt)
+
+        if crs.isGeographic is True:
+            logToUser(
+                f"Project CRS is set to Geographic type, and objects in linear units might not be received correctly",
+                level=1,
+                func=inspect.stack()[0][3],
+            )
+
+        vl = QgsVectorLayer(
+            geomType + "?crs=" + crs.authid(), finalName, "memory"
+        )  # do something to distinguish: stream_id_latest_name
+        vl.setCrs(crs)
+        project.addMapLayer(vl, False)
+
+        pr = vl.dataProvider()
+        vl.startEditing()
+
+        # add Layer attribute fields
+        pr.addAttributes(newFields)
+        vl.updateFields()
+
+        all_feature_errors_count = 0
+
+        addFeaturesInChunks(pr, fets)
         vl.updateExtents()
         vl.commitChanges()
 
@@ -1305,6 +1433,7 @@ def addBimMainThread(obj: Tuple):
         for item in report_features:
             dataStorage.latestActionReport.append(item)
         dataStorage.latestConversionTime = datetime.now()
+        logMainThreadTime(finalName, time_start)
 
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
@@ -1318,6 +1447,9 @@ def addBimMainThread(obj: Tuple):
             }
         )
         dataStorage.latestConversionTime = datetime.now()
+    finally:
+        # let the receive thread hand over the next layer
+        RECEIVE_QUEUE.ack()
 
 
 def cadVectorLayerToNative(
@@ -1331,19 +1463,11 @@ def cadVectorLayerToNative(
 ) -> "QgsVectorLayer":
     # print("___________cadVectorLayerToNative")
     try:
+        dataStorage = plugin.dataStorage
         project: QgsProject = plugin.project
 
-        # get Project CRS, use it by default for the new received layer
-        vl = None
-
         layerName = removeSpecialCharacters(layerName)
 
-        # layerName = layerName + "_" + geomType
-        # print(layerName)
-
-        newName = (
-            f'{streamBranch.split("_")[len(streamBranch.split("_"))-1]}/{layerName}'
-        )
         r"""
         if geomType == "Points":
             geomType = "PointZ"
@@ -1351,21 +1475,53 @@ def cadVectorLayerToNative(
             geomType = "LineStringZ"
         """
 
+        geom_print = geomType
+        if "multipolygon" in geom_print.lower():
+            geom_print = "Mesh"
+        elif "linestring" in geom_print.lower():
+            geom_print = "Polyline"
+        elif "point" in geom_print.lower():
+            geom_print = "Point"
+
+        finalName, groupName = getReceivedLayerNames(
+            layerName, streamBranch, "_as_" + geom_print
+        )
+        dataStorage.latestActionLayers.append(finalName)
+
         newFields = getLayerAttributes(geomList)
         # print(newFields.toList())
         # print(geomList)
 
-        plugin.dockwidget.signal_3.emit(
+        crs = project.crs()  # QgsCoordinateReferenceSystem.fromWkt(layer.crs.wkt)
+        layerStorage = getReceiveStorage(
+            dataStorage, str(QgsUnitTypes.encodeUnit(crs.mapUnits())), matrix
+        )
+
+        # convert features here, the main thread only adds them to the new layer
+        fets, fetIds, fetColors, report_features = featuresToNative(
+            geomList,
+            newFields,
+            cadFeatureToNative,
+            layerStorage,
+            "Feature skipped due to invalid geometry",
+            collectColors=True,
+        )
+
+        emitToMainThread(
+            plugin.dockwidget.signal_3,
             {
                 "plugin": plugin,
                 "geomType": geomType,
-                "layerName": layerName,
+                "geom_print": geom_print,
+                "finalName": finalName,
+                "groupName": groupName,
                 "layer_id": val_id,
-                "streamBranch": streamBranch,
                 "newFields": newFields,
-                "geomList": geomList,
-                "matrix": matrix,
-            }
+                "fets": fets,
+                "fetIds": fetIds,
+                "fetColors": fetColors,
+                "report_features": report_features,
+            },
         )
 
         return
@@ -1377,47 +1533,27 @@ def cadVectorLayerToNative(
 def addCadMainThread(obj: Tuple):
     # print("___addCadMainThread")
     try:
+        time_start = time.perf_counter()
         finalName = ""
+        geom_print = ""
         plugin = obj["plugin"]
         geomType = obj["geomType"]
-        layerName = obj["layerName"]
+        geom_print = obj["geom_print"]
+        finalName = obj["finalName"]
+        groupName = obj["groupName"]
         layer_id = obj["layer_id"]
-        streamBranch = obj["streamBranch"]
         newFields = obj["newFields"]
-        geomList = obj["geomList"]
-        matrix = obj["matrix"]
+        fets = obj["fets"]
+        fetIds = obj["fetIds"]
+        fetColors = obj["fetColors"]
+        report_features = obj["report_features"]
         plugin.dockwidget.msgLog.removeBtnUrl("cancel")
 
         project: QgsProject = plugin.dataStorage.project
         dataStorage = plugin.dataStorage
-        dataStorage.matrix = matrix
 
-        geom_print = geomType
-        if "multipolygon" in geom_print.lower():
-            geom_print = "Mesh"
-        elif "linestring" in geom_print.lower():
-            geom_print = "Polyline"
-        elif "point" in geom_print.lower():
-            geom_print = "Point"
-
-        shortName = layerName.split(SYMBOL)[len(layerName.split(SYMBOL)) - 1][:50]
-
-        try:
-            layerName = (
-                layerName.split(shortName)[0] + shortName + ("_as_" + geom_print)
-            )
-        except:
-            layerName = layerName + ("_as_" + geom_print)
-        finalName = shortName + ("_as_" + geom_print)
-
-        try:
-            groupName = streamBranch + SYMBOL + layerName.split(finalName)[0]
-        except:
-            groupName = streamBranch + SYMBOL + layerName
         layerGroup = tryCreateGroupTree(project.layerTreeRoot(), groupName, plugin)
 
-        dataStorage.latestActionLayers.append(finalName)
-
         ###########################################
         dummy = None
         root = project.layerTreeRoot()
@@ -1433,13 +1569,6 @@ def addCadMainThread(obj: Tuple):
         #################################################
 
         crs = project.crs()  # QgsCoordinateReferenceSystem.fromWkt(layer.crs.wkt)
-        plugin.dataStorage.currentUnits = str(QgsUnitTypes.encodeUnit(crs.mapUnits()))
-        if (
-            plugin.dataStorage.currentUnits is None
-            or plugin.dataStorage.currentUnits == "degrees"
-        ):
-            plugin.dataStorage.currentUnits = "m"
-        # authid = trySaveCRS(crs, streamBranch)
 
         if crs.isGeographic is True:
             logToUser(
@@ -1457,53 +1586,17 @@ def addCadMainThread(obj: Tuple):
         pr = vl.dataProvider()
         vl.startEditing()
 
-        # create list of Features (fets) and list of Layer fields (fields)
-        attrs = QgsFields()
-        fets = []
-        fetIds = []
-        fetColors = []
-
-        report_features = []
         all_feature_errors_count = 0
-        for f in geomList[:]:
-            # pre-fill report:
-            report_features.append(
-                {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
-            )
-
-            new_feat = cadFeatureToNative(f, newFields, plugin.dataStorage)
-            # update attrs for the next feature (if more fields were added from previous feature)
-
-            # print("________cad feature to add")
-            if new_feat is not None and new_feat != "":
-                fets.append(new_feat)
-                for a in newFields.toList():
-                    attrs.append(a)
-
-                pr.addAttributes(
-                    newFields
-                )  # add new attributes from the current object
-                fetIds.append(f.id)
-                fetColors = findFeatColors(fetColors, f)
-            else:
-                logToUser(
-                    f"Feature skipped due to invalid geometry",
-                    level=2,
-                    func=inspect.stack()[0][3],
-                )
-                report_features[len(report_features) - 1].update(
-                    {"errors": "Feature skipped due to invalid geometry"}
-                )
+        for item in report_features:
+            if item["errors"] != "":
                 all_feature_errors_count += 1
 
-        dataStorage.matrix = None
-
         # add Layer attribute fields
         pr.addAttributes(newFields)
         vl.updateFields()
 
         # pr = vl.dataProvider()
-        pr.addFeatures(fets)
+        addFeaturesInChunks(pr, fets)
         vl.updateExtents()
         vl.commitChanges()
 
@@ -1585,6 +1678,7 @@ def addCadMainThread(obj: Tuple):
         for item in report_features:
             dataStorage.latestActionReport.append(item)
         dataStorage.latestConversionTime = datetime.now()
+        logMainThreadTime(finalName, time_start)
 
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
@@ -1598,6 +1692,9 @@ def addCadMainThread(obj: Tuple):
             }
         )
         dataStorage.latestConversionTime = datetime.now()
+    finally:
+        # let the receive thread hand over the next layer
+        RECEIVE_QUEUE.ack()
 
 
 def vectorLayerToNative(
@@ -1605,7 +1702,7 @@ def vectorLayerToNative(
 ):
     try:
         # print("vectorLayerToNative")
-        project: QgsProject = plugin.project
+        dataStorage = plugin.dataStorage
         layerName = removeSpecialCharacters(nameBase + SYMBOL + layer.name)
         # print(layerName)
 
@@ -1616,21 +1713,40 @@ def vectorLayerToNative(
             layer.geomType
         )
 
-        fets = []
-        # print("before newFields")
+        layerStorage = getReceiveStorage(dataStorage, layer.crs.units, crs=layer.crs)
+
+        if newName.endswith("_as_Mesh"):
+            newName = newName[:-8]
+
+        finalName, groupName = getReceivedLayerNames(newName, streamBranch)
+        dataStorage.latestActionLayers.append(finalName)
+
+        # get features and attributes here, the main thread only adds them to the new layer
+        newFields = getLayerAttributes(layer.elements)
+        if newFields is None:
+            newFields = QgsFields()
+        fets, _, _, report_features = featuresToNative(
+            layer.elements,
+            newFields,
+            featureToNative,
+            layerStorage,
+            f"'{geomType}' feature skipped due to invalid data",
+        )
 
-        newFields = QgsFields()
         objectEmit = {
             "plugin": plugin,
             "geomType": geomType,
             "newName": newName,
+            "finalName": finalName,
+            "groupName": groupName,
             "streamBranch": streamBranch,
             "wkt": layer.crs.wkt,
             "layer": layer,
             "newFields": newFields,
             "fets": fets,
+            "report_features": report_features,
         }
-        plugin.dockwidget.signal_1.emit(objectEmit)
+        emitToMainThread(plugin.dockwidget.signal_1, objectEmit)
 
         return
 
@@ -1642,84 +1758,26 @@ def vectorLayerToNative(
 def addVectorMainThread(obj: Tuple):
     # print("___addVectorMainThread")
     try:
+        time_start = time.perf_counter()
         finalName = ""
         plugin = obj["plugin"]
         geomType = obj["geomType"]
         newName = obj["newName"]
+        finalName = obj["finalName"]
+        groupName = obj["groupName"]
         streamBranch = obj["streamBranch"]
         wkt = obj["wkt"]
         layer = obj["layer"]
         newFields = obj["newFields"]
         fets = obj["fets"]
+        report_features = obj["report_features"]
         plugin.dockwidget.msgLog.removeBtnUrl("cancel")
 
         dataStorage = plugin.dataStorage
-
-        plugin.dataStorage.currentUnits = layer.crs.units
-        if (
-            plugin.dataStorage.currentUnits is None
-            or plugin.dataStorage.currentUnits == "degrees"
-        ):
-            plugin.dataStorage.currentUnits = "m"
-        try:
-            dataStorage.current_layer_crs_offset_x = layer.crs.offset_x
-            dataStorage.current_layer_crs_offset_y = layer.crs.offset_y
-            dataStorage.current_layer_crs_rotation = layer.crs.rotation
-        except AttributeError as e:
-            print(e)
-
         project: QgsProject = plugin.dataStorage.project
 
-        if newName.endswith("_as_Mesh"):
-            newName = newName[:-8]
-
-        # print(layer.name)
-
-        shortName = newName.split(SYMBOL)[len(newName.split(SYMBOL)) - 1][:50]
-        try:
-            layerName = newName.split(shortName)[0] + shortName  # + ("_" + geom_print)
-        except:
-            layerName = newName
-        finalName = shortName  # + ("_" + geom_print)
-        # print(f"Final layer name: {finalName}")
-        try:
-            groupName = streamBranch + SYMBOL + layerName.split(finalName)[0]
-        except:
-            groupName = streamBranch + SYMBOL + layerName
         layerGroup = tryCreateGroupTree(project.layerTreeRoot(), groupName, plugin)
 
-        dataStorage.latestActionLayers.append(finalName)
-        ###########################################
-
-        # get features and attributes
-        fets = []
-        report_features = []
-        all_feature_errors_count = 0
-        # print("before newFields")
-        newFields = getLayerAttributes(layer.elements)
-        for f in layer.elements:
-            # pre-fill report:
-            report_features.append(
-                {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
-            )
-
-            new_feat = featureToNative(f, newFields, plugin.dataStorage)
-            if new_feat is not None and new_feat != "":
-                fets.append(new_feat)
-            else:
-                logToUser(
-                    f"'{geomType}' feature skipped due to invalid data",
-                    level=2,
-                    func=inspect.stack()[0][3],
-                )
-                report_features[len(report_features) - 1].update(
-                    {"errors": f"'{geomType}' feature skipped due to invalid data"}
-                )
-                all_feature_errors_count += 1
-
-        if newFields is None:
-            newFields = QgsFields()
-
         # add dummy layer to secure correct CRS
         # print("before dummy layer")
         dummy = None
@@ -1773,7 +1831,7 @@ def addVectorMainThread(obj: Tuple):
         pr.addAttributes(newFields.toList())
         vl.updateFields()
 
-        pr.addFeatures(fets)
+        addFeaturesInChunks(pr, fets)
         vl.updateExtents()
         vl.commitChanges()
 
@@ -1913,6 +1971,7 @@ def addVectorMainThread(obj: Tuple):
         for item in report_features:
             dataStorage.latestActionReport.append(item)
         dataStorage.latestConversionTime = datetime.now()
+        logMainThreadTime(finalName, time_start)
 
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
@@ -1926,6 +1985,9 @@ def addVectorMainThread(obj: Tuple):
             }
         )
         dataStorage.latestConversionTime = datetime.now()
+    finally:
+        # let the receive thread hand over the next layer
+        RECEIVE_QUEUE.ack()
 
 
 def rasterLayerToNative(layer: RasterLayer, streamBranch: str, nameBase: str, plugin):
@@ -1936,14 +1998,16 @@ def rasterLayerToNative(layer: RasterLayer, streamBranch: str, nameBase: str, pl
 
         newName = layerName  # f'{streamBranch.split("_")[len(streamBranch.split("_"))-1]}_{layerName}'
 
-        plugin.dockwidget.signal_4.emit(
+        emitToMainThread(
+            plugin.dockwidget.signal_4,
             {
                 "plugin": plugin,
                 "layerName": layerName,
                 "newName": newName,
                 "streamBranch": streamBranch,
                 "layer": layer,
-            }
+                "layerStorage": getReceiveStorage(plugin.dataStorage, layer.crs.units),
+            },
         )
 
         return
@@ -1960,18 +2024,12 @@ def addRasterMainThread(obj: Tuple):
         newName = obj["newName"]
         streamBranch = obj["streamBranch"]
         layer = obj["layer"]
+        layerStorage = obj["layerStorage"]
         plugin.dockwidget.msgLog.removeBtnUrl("cancel")
 
         project: QgsProject = plugin.dataStorage.project
         dataStorage = plugin.dataStorage
 
-        plugin.dataStorage.currentUnits = layer.crs.units
-        if (
-            plugin.dataStorage.currentUnits is None
-            or plugin.dataStorage.currentUnits == "degrees"
-        ):
-            plugin.dataStorage.currentUnits = "m"
-
         shortName = newName.split(SYMBOL)[len(newName.split(SYMBOL)) - 1][:50]
         # print(f"Final short name: {shortName}")
         try:
@@ -2030,7 +2088,9 @@ def addRasterMainThread(obj: Tuple):
             bandNames = feat.band_names
         except:
             bandNames = feat["Band names"]
-        bandValues = [feat["@(10000)" + name + "_values"] for name in bandNames]
+
+        # large rasters are sent in tiles: place each of them in the same grid
+        raster_tiles = getRasterTilesOffsets(layer.elements)
 
         if source_folder == "":
             p = (
@@ -2057,8 +2117,8 @@ def addRasterMainThread(obj: Tuple):
         try:
             ds = driver.Create(
                 fn,
-                xsize=feat.x_size,
-                ysize=feat.y_size,
+                xsize=max([xoff + tile.x_size for tile, xoff, _ in raster_tiles]),
+                ysize=max([yoff + tile.y_size for tile, _, yoff in raster_tiles]),
                 bands=feat.band_count,
                 eType=gdal.GDT_Float32,
             )
@@ -2083,19 +2143,12 @@ def addRasterMainThread(obj: Tuple):
             b_count = feat["Band count"]
 
         for i in range(b_count):
-            rasterband = np.array(bandValues[i])
-            try:
-                rasterband = np.reshape(rasterband, (feat.y_size, feat.x_size))
-            except Exception as e:
-                rasterband = np.reshape(
-                    rasterband, (feat["Y pixels"], feat["X pixels"])
-                )
-
             band = ds.GetRasterBand(
                 i + 1
             )  # https://pcjericks.github.io/py-gdalogr-cookbook/raster_layers.html
 
             # get noDataVal or use default
+            noDataVal = None
             try:
                 try:
                     noDataVal = feat.noDataValue[i]
@@ -2108,7 +2161,20 @@ def addRasterMainThread(obj: Tuple):
             except:
                 pass
 
-            band.WriteArray(rasterband)  # or "rasterband.T"
+            if len(raster_tiles) == 1:
+                rasterband = np.array(feat["@(10000)" + bandNames[i] + "_values"])
+                try:
+                    rasterband = np.reshape(rasterband, (feat.y_size, feat.x_size))
+                except Exception as e:
+                    rasterband = np.reshape(
+                        rasterband, (feat["Y pixels"], feat["X pixels"])
+                    )
+                band.WriteArray(rasterband)  # or "rasterband.T"
+            else:
+                # 1 tile at a time, with the NoData value of the layer
+                for tile, xoff, yoff in raster_tiles:
+                    tile_band = getRasterTileBand(tile, bandNames[i], i, noDataVal)
+                    band.WriteArray(tile_band, xoff, yoff)
 
         # create GDAL transformation in format [top-left x coord, cell width, 0, top-left y coord, 0, cell height]
         pt = None
@@ -2131,9 +2197,7 @@ def addRasterMainThread(obj: Tuple):
                 displayVal = feat["displayValue"]
             if displayVal is not None:
                 if isinstance(displayVal[0], Point):
-                    pt = pointToNativeWithoutTransforms(
-                        displayVal[0], plugin.dataStorage
-                    )
+                    pt = pointToNativeWithoutTransforms(displayVal[0], layerStorage)
                     ptSpeckle = displayVal[0]
                 if isinstance(displayVal[0], Mesh):
                     pt = QgsPoint(displayVal[0].vertices[0], displayVal[0].vertices[1])
@@ -2207,3 +2271,6 @@ def addRasterMainThread(obj: Tuple):
             }
         )
         dataStorage.latestConversionTime = datetime.now()
+    finally:
+        # let the receive thread hand over the next layer
+        RECEIVE_QUEUE.ack()
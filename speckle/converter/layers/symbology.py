@@ -1,4 +1,6 @@
+import bisect
 import inspect
+import math
 from typing import Any, Dict, Tuple, Union
 
 try:
@@ -35,84 +37,176 @@ from speckle.converter.layers.GISLayerGeometryType import GISLayerGeometryType
 # TODO QML format: https://gis.stackexchange.com/questions/202230/loading-style-qml-file-to-layer-via-pyqgis
 
 
+# compiled color lookups of the layer renderers, reused during a send
+FEATURE_COLOR_RESOLVERS: Dict[str, Dict[str, Any]] = {}
+DEFAULT_FEATURE_COLOR = (255 << 24) | (245 << 16) | (245 << 8) | 245
+
+COLORED_RENDERER_TYPES = [
+    "categorizedSymbol",
+    "25dRenderer",
+    "invertedPolygonRenderer",
+    "mergedFeatureRenderer",
+    "RuleRenderer",
+    "nullSymbol",
+    "singleSymbol",
+    "graduatedSymbol",
+]
+
+
+def colorToSpeckleInt(color) -> int:
+    # construct RGB color
+    try:
+        r, g, b = color.getRgb()[:3]
+    except:
+        r, g, b = [int(i) for i in color.replace(" ", "").split(",")[:3]]
+    return (255 << 24) | (r << 16) | (g << 8) | b
+
+
+def compileFeatureColorResolver(layer: "QgsVectorLayer") -> Dict[str, Any]:
+    """Reads the layer renderer once and returns lookup tables for feature colors."""
+    renderer = layer.renderer()
+    renderer_type = renderer.type()
+    resolver = {"type": "constant", "color": DEFAULT_FEATURE_COLOR, "cache": {}}
+    if renderer_type not in COLORED_RENDERER_TYPES:
+        return resolver
+
+    color = QColor.fromRgb(245, 245, 245)
+    if renderer_type == "singleSymbol":
+        color = renderer.symbol().color()
+
+    elif renderer_type == "categorizedSymbol":
+        sSymb = renderer.sourceSymbol()
+        if sSymb is not None:
+            color = sSymb.color()
+        resolver["type"] = "categorized"
+        # get the name of attribute used for classification
+        resolver["attribute"] = renderer.classAttribute()
+        # first category index by value: numeric categories are compared as floats,
+        # others as strings; an attribute that is not a number is compared as string to all
+        numeric_categories = {}
+        text_categories = {}
+        all_categories = {}
+        category_colors = []
+        other_color = None
+        for i, obj in enumerate(renderer.categories()):
+            category_colors.append(colorToSpeckleInt(obj.symbol().color()))
+            try:
+                value = float(obj.value())
+                if not math.isnan(value):  # NaN is never equal to a value
+                    numeric_categories.setdefault(value, i)
+            except:
+                text_categories.setdefault(str(obj.value()), i)
+            all_categories.setdefault(str(obj.value()), i)
+            if str(obj.value()) == "None" or str(obj.value()) == "":
+                # other category
+                other_color = category_colors[i]
+        resolver.update(
+            {
+                "numeric": numeric_categories,
+                "text": text_categories,
+                "all": all_categories,
+                "colors": category_colors,
+                "other_color": other_color,
+            }
+        )
+
+    elif renderer_type == "graduatedSymbol":
+        color = renderer.sourceSymbol().color()
+        # get the name of attribute used for classification
+        resolver["attribute"] = renderer.legendClassificationAttribute()
+        if renderer.graduatedMethod() == 0:  # if the styling is by color (not by size)
+            resolver["type"] = "graduated"
+            ranges = [
+                (obj.lowerValue(), obj.upperValue(), colorToSpeckleInt(obj.symbol().color()))
+                for obj in renderer.ranges()
+            ]
+            resolver["lower"] = [r[0] for r in ranges]
+            resolver["upper"] = [r[1] for r in ranges]
+            resolver["colors"] = [r[2] for r in ranges]
+            # bisect only works for ascending ranges that don't overlap
+            resolver["sorted"] = all(r[0] <= r[1] for r in ranges) and all(
+                ranges[i][1] <= ranges[i + 1][0] for i in range(len(ranges) - 1)
+            )
+
+    resolver["color"] = colorToSpeckleInt(color)
+    return resolver
+
+
+def getFeatureColorResolver(layer: "QgsVectorLayer") -> Dict[str, Any]:
+    resolver = FEATURE_COLOR_RESOLVERS.get(layer.id())
+    if resolver is None:
+        resolver = compileFeatureColorResolver(layer)
+        FEATURE_COLOR_RESOLVERS[layer.id()] = resolver
+    return resolver
+
+
+def clearFeatureColorResolvers():
+    FEATURE_COLOR_RESOLVERS.clear()
+
+
+def resolveFeatureColor(resolver: Dict[str, Any], value) -> int:
+    """Returns the color for the classification attribute value of a feature."""
+    if resolver["type"] == "categorized":
+        try:
+            index = resolver["numeric"].get(float(value))
+            text_index = resolver["text"].get(str(value))
+            if index is None or (text_index is not None and text_index < index):
+                index = text_index
+        except:
+            index = resolver["all"].get(str(value))
+        if index is not None:
+            return resolver["colors"][index]
+        if resolver["other_color"] is not None:
+            return resolver["other_color"]
+
+    elif resolver["type"] == "graduated":
+        lower = resolver["lower"]
+        upper = resolver["upper"]
+        if resolver["sorted"] is True:
+            i = bisect.bisect_right(lower, value) - 1
+            # touching ranges: the lower one is listed first
+            while i > 0 and value <= upper[i - 1]:
+                i -= 1
+            if i >= 0 and value <= upper[i]:
+                return resolver["colors"][i]
+        else:
+            for i, _ in enumerate(lower):
+                if value >= lower[i] and value <= upper[i]:
+                    return resolver["colors"][i]
+
+    return resolver["color"]
+
+
 def featureColorfromNativeRenderer(
     feature: "QgsFeature", layer: "QgsVectorLayer"
 ) -> int:
-    # case with one color for the entire layer
     try:
-        renderer = layer.renderer()
-        if (
-            renderer.type() == "categorizedSymbol"
-            or renderer.type() == "25dRenderer"
-            or renderer.type() == "invertedPolygonRenderer"
-            or renderer.type() == "mergedFeatureRenderer"
-            or renderer.type() == "RuleRenderer"
-            or renderer.type() == "nullSymbol"
-            or renderer.type() == "singleSymbol"
-            or renderer.type() == "graduatedSymbol"
-        ):
-            # get color value
-            color = QColor.fromRgb(245, 245, 245)
-            if renderer.type() == "singleSymbol":
-                color = renderer.symbol().color()
-            elif renderer.type() == "categorizedSymbol":
-                sSymb = renderer.sourceSymbol()
-                if sSymb is not None:
-                    color = sSymb.color()
-                category = (
-                    renderer.classAttribute()
-                )  # get the name of attribute used for classification
-                try:
-                    feature.attribute(category)
-                    renderer.categories()
-                except:
-                    logToUser(
-                        f"Attribute '{category}' used for the layer '{layer.name()}' symbology is not found",
-                        level=2,
-                        func=inspect.stack()[0][3],
-                    )
-                    return (255 << 24) | (245 << 16) | (245 << 8) | 245
+        resolver = getFeatureColorResolver(layer)
+        if resolver["type"] == "constant":
+            return resolver["color"]
 
-                for obj in renderer.categories():
-                    try:
-                        if float(obj.value()) == float(feature.attribute(category)):
-                            color = obj.symbol().color()
-                            break
-                    except:
-                        if str(obj.value()) == str(feature.attribute(category)):
-                            color = obj.symbol().color()
-                            break
-                    if (
-                        str(obj.value()) == "None" or str(obj.value()) == ""
-                    ):  # other category
-                        color = obj.symbol().color()
-            elif renderer.type() == "graduatedSymbol":
-                color = renderer.sourceSymbol().color()
-                category = (
-                    renderer.legendClassificationAttribute()
-                )  # get the name of attribute used for classification
-                if (
-                    renderer.graduatedMethod() == 0
-                ):  # if the styling is by color (not by size)
-                    for obj in renderer.ranges():
-                        if (
-                            feature.attribute(category) >= obj.lowerValue()
-                            and feature.attribute(category) <= obj.upperValue()
-                        ):
-                            color = obj.symbol().color()
-                            break
-            # construct RGB color
-            try:
-                r, g, b = color.getRgb()[:3]
-            except:
-                r, g, b = [int(i) for i in color.replace(" ", "").split(",")[:3]]
-            col = (255 << 24) | (r << 16) | (g << 8) | b
-            return col
-        else:
-            return (255 << 24) | (245 << 16) | (245 << 8) | 245
+        cache = resolver["cache"]
+        feature_id = feature.id()
+        if feature_id in cache:
+            return cache[feature_id]
+
+        category = resolver["attribute"]
+        try:
+            value = feature.attribute(category)
+        except:
+            logToUser(
+                f"Attribute '{category}' used for the layer '{layer.name()}' symbology is not found",
+                level=2,
+                func=inspect.stack()[0][3],
+            )
+            return DEFAULT_FEATURE_COLOR
+
+        col = resolveFeatureColor(resolver, value)
+        cache[feature_id] = col
+        return col
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3])
-        return (255 << 24) | (245 << 16) | (245 << 8) | 245
+        return DEFAULT_FEATURE_COLOR
 
 
 def gradientColorRampToSpeckle(
@@ -1,6 +1,8 @@
 import copy
 import hashlib
 import inspect
+import os
+import threading
 import time
 from plugin_utils.helpers import SYMBOL
 from typing import Any, Dict, List, Tuple, Union
@@ -60,6 +62,29 @@ ATTRS_REMOVE = [
     "displayValue",
 ]
 
+# elevation layer data, kept for the duration of one send operation
+ELEVATION_CACHE: Dict[Tuple[str, Any], Tuple] = {}
+# raw raster bands, kept until the raster layer is converted
+RASTER_BAND_CACHE: Dict[Tuple[str, Any, int], Dict[str, Any]] = {}
+# guards the caches only, files are read outside of the lock
+RASTER_CACHE_LOCK = threading.Lock()
+
+# transformations of the layers, parsed from dataStorage.savedTransforms
+LAYER_TRANSFORMS: Dict[str, Union[Dict[str, Any], None]] = {}
+LAYER_TRANSFORMS_LOCK = threading.Lock()
+# send raster display meshes as a grid of shared vertices, instead of 4 vertices per cell
+RASTER_GRID_MESH_TRANSFORM = "Raster to mesh with shared vertices (grid)"
+
+# default memory budget (MB) for converting a single raster tile on send,
+# can be set in the project variable 'speckle_raster_memory_budget'
+RASTER_MEMORY_BUDGET = 1024
+# peak memory (bytes) taken by 1 raster cell while a tile is converted and cached,
+# measured with scripts/benchmark_raster_memory.py: display mesh of 4 vertices
+# (12 floats, 5 face and 4 color ints) as arrays and as lists, and its serialized chunks
+RASTER_CELL_BYTES = 1200
+# each band value as array item (8) and list item (32)
+RASTER_CELL_BAND_BYTES = 40
+
 
 def generate_qgis_app_id(
     layer: Union["QgsRasterLayer", "QgsVectorLayer"],
@@ -288,105 +313,71 @@ def colorFromSpeckle(rgb):
         return QColor.fromRgb(245, 245, 245)
 
 
-def getLayerAttributes(features: List[Base]) -> "QgsFields":
-    try:
-        # print("___________getLayerAttributes")
-        fields = QgsFields()
-        all_props = []
-        for feature in features:
-            # print(feature)
-            if feature is None:
-                continue
-            # get object properties to add as attributes
+def addAttributeType(schema: Dict[str, Any], name: str, variant) -> None:
+    """Adds the attribute to the schema (name -> QVariant type, in the order of appearance).
+    The first type found is kept, like QgsFields.append ignores duplicate names."""
+    if name not in schema:
+        schema[name] = variant
+
+
+def getLayerAttributeTypes(features: List[Base]) -> Dict[str, Any]:
+    """Collects the flattened attribute names and their types in one pass over the features."""
+    schema = {}
+    for feature in features:
+        # print(feature)
+        if feature is None:
+            continue
+        # get object properties to add as attributes
+        try:
+            dynamicProps = (
+                feature.attributes.get_dynamic_member_names()
+            )  # for 2.14 onwards
+        except:
+            dynamicProps = feature.get_dynamic_member_names()
+        # attrsToRemove = ['speckleTyp','geometry','applicationId','bbox','displayStyle', 'id', 'renderMaterial', 'geometry', 'displayMesh', 'displayValue']
+        for att in ATTRS_REMOVE:
             try:
-                dynamicProps = (
-                    feature.attributes.get_dynamic_member_names()
-                )  # for 2.14 onwards
+                dynamicProps.remove(att)
             except:
-                dynamicProps = feature.get_dynamic_member_names()
-            # attrsToRemove = ['speckleTyp','geometry','applicationId','bbox','displayStyle', 'id', 'renderMaterial', 'geometry', 'displayMesh', 'displayValue']
-            for att in ATTRS_REMOVE:
-                try:
-                    dynamicProps.remove(att)
-                except:
-                    pass
+                pass
 
-            dynamicProps.sort()
-            # print(dynamicProps)
-
-            # add field names and variands
-            for name in dynamicProps:
-                try:
-                    value = feature.attributes[name]
-                except:
-                    value = feature[name]
+        dynamicProps.sort()
 
+        # add field names and variants
+        for name in dynamicProps:
+            try:
+                value = feature.attributes[name]
+            except:
+                value = feature[name]
+
+            if value and isinstance(value, list):
+                # go thought the list items
+                for i, val_item in enumerate(value):
+                    newF, _ = traverseDict({}, {}, name + "_" + str(i), val_item, 1)
+                    for k, v in newF.items():
+                        addAttributeType(schema, k, v)
+            elif isinstance(value, (dict, Base)):
+                newF, _ = traverseDict({}, {}, name, value, 1)
+                for k, v in newF.items():
+                    addAttributeType(schema, k, v)
+            else:  # single value, same as traverseDict
                 variant = getVariantFromValue(value)
-                if not variant:
-                    variant = None  # LongLong #4
-
-                # go thought the dictionary object
-                if value and isinstance(
-                    value, list
-                ):  # and isinstance(value[0], dict) :
-                    for i, val_item in enumerate(value):
-                        newF, newVals = traverseDict(
-                            {}, {}, name + "_" + str(i), val_item, 1
-                        )
+                if variant is None:
+                    variant = QVariant.String
+                addAttributeType(schema, name, variant)
 
-                        for i, (k, v) in enumerate(newF.items()):
-                            if k not in all_props:
-                                all_props.append(k)
-                            if k not in fields.names():
-                                fields.append(QgsField(k, v))  # fields.update({k: v})
-                            else:  # check if the field was empty previously:
-                                index = fields.indexFromName(k)
-                                oldVariant = fields.field(index).type()
-                                # replace if new one is NOT Float (too large integers)
-                                # if oldVariant != "FLOAT" and v == "FLOAT":
-                                #    fields.append(QgsField(k, v)) # fields.update({k: v})
-                                # replace if new one is NOT LongLong or IS String
-                                if (
-                                    oldVariant != QVariant.String
-                                    and v == QVariant.String
-                                ):
-                                    fields.append(
-                                        QgsField(k, v)
-                                    )  # fields.update({k: v})
-
-                # add a field if not existing yet
-                else:  # if str, Base, etc
-                    # print(f"atrribute '{value}' is a Base/str/etc")
-                    newF, newVals = traverseDict({}, {}, name, value, 1)
-                    # print(newF)
-                    # print(newVals)
-
-                    for i, (k, v) in enumerate(newF.items()):
-                        if k not in all_props:
-                            all_props.append(k)
-                        # print(all_props)
-
-                        if k not in fields.names():
-                            fields.append(
-                                QgsField(k, v)
-                            )  # fields.update({k: v}) #if variant is known
-                        else:  # check if the field was empty previously:
-                            index = fields.indexFromName(k)
-                            oldVariant = fields.field(index).type()
-                            # replace if new one is NOT Float (too large integers)
-                            # if oldVariant != "FLOAT" and v == "FLOAT":
-                            #    fields.append(QgsField(k, v)) # fields.update({k: v})
-                            # replace if new one is NOT LongLong or IS String
-                            if oldVariant != QVariant.String and v == QVariant.String:
-                                fields.append(QgsField(k, v))  # fields.update({k: v})
-
-        # replace all empty ones with String
-        all_props.append("Speckle_ID")
-        for name in all_props:
-            all_field_names = fields.names()
-            if name not in all_field_names:
-                fields.append(QgsField(name, QVariant.String))
+    # the ID is always a String field
+    if "Speckle_ID" not in schema:
+        schema["Speckle_ID"] = QVariant.String
+    return schema
 
+
+def getLayerAttributes(features: List[Base]) -> "QgsFields":
+    try:
+        # print("___________getLayerAttributes")
+        fields = QgsFields()
+        for name, variant in getLayerAttributeTypes(features).items():
+            fields.append(QgsField(name, variant))
         return fields
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3])
@@ -548,51 +539,120 @@ def getArrayIndicesFromXY(settings, x, y):
         return ind1, ind2, remainder1, remainder2
 
 
+def getArrayIndicesFromXYArrays(settings, x, y):
+    """Get cell x&y indices on a given layer for arrays of XY coordinates; same rules as getArrayIndicesFromXY.
+    Returns index arrays and a mask of points inside the layer extent (invalid indices are set to 0)."""
+    resX, resY, minX, minY, sizeX, sizeY, wkt, proj = settings
+
+    def closestIndices(values, size):
+        # try deviating +- 1
+        indices = np.trunc(values)
+        indices_less = np.trunc(values - 1)
+        indices = np.where(
+            (0 <= indices) & (indices < size),
+            indices,
+            np.where(
+                (0 <= indices_less) & (indices_less < size),
+                indices_less,
+                np.trunc(values + 1),
+            ),
+        )
+        return indices
+
+    ind2 = closestIndices((np.asarray(x, dtype=float) - minX) / resX, sizeX)
+    ind1 = closestIndices((np.asarray(y, dtype=float) - minY) / resY, sizeY)
+    valid = (0 <= ind2) & (ind2 < sizeX) & (0 <= ind1) & (ind1 < sizeY)
+
+    ind1 = np.where(valid, ind1, 0).astype(np.int64)
+    ind2 = np.where(valid, ind2, 0).astype(np.int64)
+    return ind1, ind2, valid
+
+
 def getXYofArrayPoint(rasterResXY, minX, minY, indexX, indexY):
     x = minX + rasterResXY[0] * indexX
     y = minY + rasterResXY[1] * indexY
     return x, y
 
 
-def isAppliedLayerTransformByKeywords(
-    layer, keywordsYes: List[str], keywordsNo: List[str], dataStorage
-):
-    correctTransform = False
+def parseLayerTransform(item: str) -> Dict[str, Any]:
+    """Parses a saved transformation record: "layer name ('attribute')  ->  Transformation name"."""
+    label = item.split("  ->  ")[1]
+    name = label.lower()
+    attribute = None
+    if " ('" in item:
+        attribute = item.split(" ('")[1].split("') ")[0]
+    return {
+        "layer_name": item.split("  ->  ")[0].split(" ('")[0],
+        "label": label,
+        "name": name,
+        "attribute": attribute,
+        "ignore": "ignore" in name,
+        "extrude": "extrude" in name and "polygon" in name,
+        "project_elevation": "polygon" in name
+        and "project" in name
+        and "elevation" in name,
+        "elevation": "elevation" in name,
+        "texture": "texture" in name,
+        "grid_mesh": "grid" in name and "mesh" in name,
+    }
+
+
+def compileLayerTransforms(layers: List, dataStorage) -> Dict[str, Any]:
+    """Parses saved transformations once, for the layers to be sent (keyed by layer id)."""
+    transforms_by_name = {}
     if dataStorage.savedTransforms is not None:
-        all_saved_transforms = [
-            item.split("  ->  ")[1] for item in dataStorage.savedTransforms
-        ]
-        all_saved_transform_layers = [
-            item.split("  ->  ")[0].split(" ('")[0]
-            for item in dataStorage.savedTransforms
-        ]
+        for item in dataStorage.savedTransforms:
+            # only one transformation per layer, the last record applies
+            transform = parseLayerTransform(item)
+            transforms_by_name[transform["layer_name"]] = transform
+
+    with LAYER_TRANSFORMS_LOCK:
+        LAYER_TRANSFORMS.clear()
+        for layer in layers:
+            transform = transforms_by_name.get(layer.name())
+            # copy, so that values computed per layer are not shared between layers
+            LAYER_TRANSFORMS[layer.id()] = (
+                dict(transform) if transform is not None else None
+            )
+    return LAYER_TRANSFORMS
+
 
+def getLayerTransform(layer, dataStorage) -> Union[Dict[str, Any], None]:
+    """Returns the parsed transformation of the layer, or None if no transformation is applied."""
+    try:
+        return LAYER_TRANSFORMS[layer.id()]
+    except KeyError:
+        pass
+
+    # layer is not part of the current send: parse its records now
+    transform = None
+    if dataStorage.savedTransforms is not None:
         for item in dataStorage.savedTransforms:
-            layer_name_recorded = item.split("  ->  ")[0].split(" ('")[0]
-            transform_name_recorded = item.split("  ->  ")[1]
-
-            if layer_name_recorded == layer.name():
-                if len(keywordsYes) > 0 or len(keywordsNo) > 0:
-                    correctTransform = True
-                for word in keywordsYes:
-                    if word in transform_name_recorded.lower():
-                        pass
-                    else:
-                        correctTransform = False
-                        break
-                for word in keywordsNo:
-                    if word not in transform_name_recorded.lower():
-                        pass
-                    else:
-                        correctTransform = False
-                        break
+            if item.split("  ->  ")[0].split(" ('")[0] == layer.name():
+                transform = parseLayerTransform(item)
+    with LAYER_TRANSFORMS_LOCK:
+        LAYER_TRANSFORMS[layer.id()] = transform
+    return transform
+
 
-            # if correctTransform is True and layer_name_recorded == layer.name():
-            #    # find a layer for meshing, if mesh transformation exists
-            #    for l in dataStorage.all_layers:
-            #        if layer_name_recorded == l.name():
-            #            return l
-    return correctTransform
+def clearLayerTransforms():
+    with LAYER_TRANSFORMS_LOCK:
+        LAYER_TRANSFORMS.clear()
+
+
+def isAppliedLayerTransformByKeywords(
+    layer, keywordsYes: List[str], keywordsNo: List[str], dataStorage
+):
+    transform = getLayerTransform(layer, dataStorage)
+    if transform is None or (len(keywordsYes) == 0 and len(keywordsNo) == 0):
+        return False
+    for word in keywordsYes:
+        if word not in transform["name"]:
+            return False
+    for word in keywordsNo:
+        if word in transform["name"]:
+            return False
+    return True
 
 
 def getElevationLayer(dataStorage):
@@ -622,29 +682,101 @@ def get_raster_stats(rasterLayer):
             .toProj()
             .replace(" +type=crs", "")
         )
-        sizeX, sizeY = (band.ReadAsArray().shape[1], band.ReadAsArray().shape[0])
+        sizeX, sizeY = (band.XSize, band.YSize)
 
         return xres, yres, originX, originY, sizeX, sizeY, rasterWkt, rasterProj
     except Exception as e:
         return None, None, None, None, None, None, None, None
 
 
+def get_raster_tiles(
+    width: int, height: int, band_count: int, block_size, memory_budget=None
+) -> List[Tuple[int, int, int, int]]:
+    """Returns raster windows (xoff, yoff, xsize, ysize) aligned to GDAL blocks, each fitting the memory budget (MB)."""
+    if memory_budget is None or memory_budget <= 0:
+        memory_budget = RASTER_MEMORY_BUDGET
+    max_cells = int(
+        memory_budget
+        * 1024
+        * 1024
+        / (RASTER_CELL_BYTES + RASTER_CELL_BAND_BYTES * max(band_count, 1))
+    )
+    if width * height <= max_cells:
+        return [(0, 0, width, height)]
+
+    block_x, block_y = max(int(block_size[0]), 1), max(int(block_size[1]), 1)
+    tile_width = width
+    tile_height = block_y
+    if width * block_y > max_cells:
+        # even 1 row of blocks doesn't fit, split the rows
+        tile_width = max(block_x, (max_cells // block_y) // block_x * block_x)
+    else:
+        tile_height = max(block_y, (max_cells // width) // block_y * block_y)
+
+    return [
+        (x, y, min(tile_width, width - x), min(tile_height, height - y))
+        for y in range(0, height, tile_height)
+        for x in range(0, width, tile_width)
+    ]
+
+
+def getFeaturesById(features, field: str = "speckle_id") -> Dict[Any, Any]:
+    """Indexes the features by the value of the field, in one pass; the first feature wins."""
+    features_by_id = {}
+    for feature in features:
+        key = feature[field]
+        if key not in features_by_id:
+            features_by_id[key] = feature
+    return features_by_id
+
+
+def getRasterTilesOffsets(elements: List) -> List[Tuple[Any, int, int]]:
+    """Returns received raster tiles with their pixel offsets (x, y) from the first tile."""
+    first = elements[0]
+    if len(elements) == 1:
+        return [(first, 0, 0)]
+    tiles = []
+    for tile in elements:
+        xoff = int(round((tile.x_origin - first.x_origin) / first.x_resolution))
+        yoff = int(round((tile.y_origin - first.y_origin) / first.y_resolution))
+        tiles.append((tile, xoff, yoff))
+    return tiles
+
+
+def getRasterTileBand(tile, bandName: str, index: int, noDataVal) -> np.ndarray:
+    """Returns values of the received raster tile band as 2D array, with the tile NoData cells set to the layer NoData value."""
+    values = np.array(tile["@(10000)" + bandName + "_values"], dtype=float).reshape(
+        (tile.y_size, tile.x_size)
+    )
+    try:
+        tileNoData = float(tile.noDataValue[index])
+        noDataVal = float(noDataVal)
+    except:
+        return values
+    # tiles sent by older versions can have different NoData values
+    if tileNoData != noDataVal:
+        if np.isnan(tileNoData):
+            values[np.isnan(values)] = noDataVal
+        else:
+            values[values == tileNoData] = noDataVal
+    return values
+
+
 def getRasterArrays(elevationLayer):
     const = float(-1 * math.pow(10, 30))
 
     try:
-        elevationSource = gdal.Open(elevationLayer.source(), gdal.GA_ReadOnly)
-
         all_arrays = []
         all_mins = []
         all_maxs = []
         all_na = []
 
         for b in range(elevationLayer.bandCount()):
-            band = elevationSource.GetRasterBand(b + 1)
-            val_NA = band.GetNoDataValue()
+            # reuse the band if it was already read for sending, but don't keep it
+            band_data = getCachedRasterBand(elevationLayer, b, cache=False)
+            val_NA = band_data["noData"]
 
-            array_band = band.ReadAsArray()
+            array_band = band_data["array"]
             fakeArray = np.where(
                 (array_band < const)
                 | (array_band > -1 * const)
@@ -667,6 +799,78 @@ def getRasterArrays(elevationLayer):
         return (None, None, None, None)
 
 
+def getLayerSourceStamp(layer):
+    """Returns modification time of the layer source file, if available."""
+    try:
+        source = layer.source().split("|")[0]
+        return os.path.getmtime(source)
+    except Exception:
+        return None
+
+
+def getCachedElevationData(elevationLayer):
+    """Returns raster arrays and stats of the elevation layer, reading the file only once per send."""
+    try:
+        key = (elevationLayer.id(), getLayerSourceStamp(elevationLayer))
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return (None, None, None, None), get_raster_stats(elevationLayer)
+
+    with RASTER_CACHE_LOCK:
+        cached = ELEVATION_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    raster_arrays = getRasterArrays(elevationLayer)
+    raster_stats = get_raster_stats(elevationLayer)
+    if raster_arrays[0] is None:
+        # don't cache failed reads
+        return raster_arrays, raster_stats
+
+    with RASTER_CACHE_LOCK:
+        if key not in ELEVATION_CACHE:
+            # drop outdated entries of the same layer
+            for k in [k for k in ELEVATION_CACHE if k[0] == key[0]]:
+                del ELEVATION_CACHE[k]
+            ELEVATION_CACHE[key] = (raster_arrays, raster_stats)
+        return ELEVATION_CACHE[key]
+
+
+def getCachedRasterBand(layer, band_index: int, cache: bool = True) -> Dict[str, Any]:
+    """Returns raw values and NoData value of the raster band (index from 0),
+    reading the band only once while the layer is converted."""
+    key = (layer.id(), getLayerSourceStamp(layer), band_index)
+    with RASTER_CACHE_LOCK:
+        cached = RASTER_BAND_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    ds = gdal.Open(layer.source(), gdal.GA_ReadOnly)
+    band = ds.GetRasterBand(band_index + 1)
+    band_data = {"array": band.ReadAsArray(), "noData": band.GetNoDataValue()}
+    if cache is True:
+        with RASTER_CACHE_LOCK:
+            for k in [
+                k for k in RASTER_BAND_CACHE if k[0] == key[0] and k[2] == key[2]
+            ]:
+                del RASTER_BAND_CACHE[k]
+            RASTER_BAND_CACHE[key] = band_data
+    return band_data
+
+
+def clearRasterBandCache(layer):
+    """Drops the cached bands of the layer, e.g. once it is converted."""
+    with RASTER_CACHE_LOCK:
+        for k in [k for k in RASTER_BAND_CACHE if k[0] == layer.id()]:
+            del RASTER_BAND_CACHE[k]
+
+
+def clearRasterCache():
+    with RASTER_CACHE_LOCK:
+        ELEVATION_CACHE.clear()
+        RASTER_BAND_CACHE.clear()
+
+
 def moveVertically(poly, height):
     if isinstance(poly, Polycurve):
         for segm in poly.segments:
@@ -748,6 +952,17 @@ def tryCreateGroup(project, groupName, plugin=None):
     return layerGroup
 
 
+def addJsonItemPath(tree: Dict, full_path_str: str) -> Dict:
+    """Adds the path to the nested dictionary in place (same result as findUpdateJsonItemPath, without copying the tree)."""
+    if tree is None:
+        return tree
+    branch = tree
+    for x in full_path_str.split(SYMBOL):
+        if len(x) > 0:
+            branch = branch.setdefault(x, {})
+    return tree
+
+
 def findUpdateJsonItemPath(tree: Dict, full_path_str: str):
     try:
         new_tree = copy.deepcopy(tree)
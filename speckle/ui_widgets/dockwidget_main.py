@@ -1,5 +1,6 @@
 import threading
 from plugin_utils.helpers import string_diff
+from plugin_utils.threads import CANCELLATION_TOKEN
 from specklepy_qt_ui.qt_ui.dockwidget_main import (
     SpeckleQGISDialog as SpeckleQGISDialog_UI,
 )
@@ -115,9 +116,14 @@ class SpeckleQGISDialog(SpeckleQGISDialog_UI, FORM_CLASS):
             return
 
     def cancelOperations(self):
+        CANCELLATION_TOKEN.cancel()
+        # the threads stop at their next cancellation check; only wait for them
+        # from another worker thread, so that the UI doesn't freeze
+        current = threading.current_thread()
+        if current is threading.main_thread():
+            return
         for t in threading.enumerate():
-            if "speckle_" in t.name:
-                t.kill()
+            if "speckle_" in t.name and t is not current:
                 t.join()
 
     def overwriteStartSettings(self):
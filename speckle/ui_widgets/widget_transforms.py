@@ -1,7 +1,11 @@
 import inspect
 import os
 from speckle.converter.layers import getAllLayers
-from speckle.converter.layers.utils import getElevationLayer, getLayerGeomType
+from speckle.converter.layers.utils import (
+    RASTER_GRID_MESH_TRANSFORM,
+    getElevationLayer,
+    getLayerGeomType,
+)
 from specklepy_qt_ui.qt_ui.widget_transforms import MappingSendDialog
 from specklepy_qt_ui.qt_ui.utils.logger import displayUserMsg
 
@@ -39,6 +43,12 @@ class MappingSendDialogQGIS(MappingSendDialog, FORM_CLASS):
         self.attrDropdown.setEnabled(False)
         self.dialog_button.setText("Apply")
 
+        # transformations only available in QGIS
+        if RASTER_GRID_MESH_TRANSFORM not in self.dataStorage.transformsCatalog:
+            self.dataStorage.transformsCatalog = list(
+                self.dataStorage.transformsCatalog
+            ) + [RASTER_GRID_MESH_TRANSFORM]
+
         self.populateTransforms()
         self.populateLayersByTransform()
         self.populateSavedTransforms(self.dataStorage)
@@ -240,6 +250,12 @@ class MappingSendDialogQGIS(MappingSendDialog, FORM_CLASS):
                             except:
                                 pass
 
+                elif "grid" in transform.lower() and "mesh" in transform.lower():
+                    if isinstance(layer, QgsRasterLayer):
+                        if layer.providerType() in UNSUPPORTED_PROVIDERS:
+                            continue
+                        listItem = layer.name()
+
                 if listItem is not None:
                     layers_dropdown.append(listItem)
                     self.layerDropdown.addItem(listItem)
@@ -239,6 +239,67 @@ def set_transformations(dataStorage):
         return False
 
 
+def get_raster_memory_budget(dataStorage):
+    """Reads memory budget (MB) for sending raster tiles from the project variable
+    'speckle_raster_memory_budget' (Project Properties -> Variables)."""
+    try:
+        from qgis.core import QgsExpressionContextUtils
+
+        proj = dataStorage.project
+        record = QgsExpressionContextUtils.projectScope(proj).variable(
+            "speckle_raster_memory_budget"
+        )
+        try:
+            dataStorage.raster_memory_budget = float(record)
+        except (TypeError, ValueError):
+            dataStorage.raster_memory_budget = None
+
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return
+
+
+def get_extrusion_height_seed(dataStorage):
+    """Reads the seed for approximated extrusion heights (for features without height)
+    from the project variable 'speckle_extrusion_height_seed', to get the same heights
+    on every send."""
+    try:
+        from qgis.core import QgsExpressionContextUtils
+
+        proj = dataStorage.project
+        record = QgsExpressionContextUtils.projectScope(proj).variable(
+            "speckle_extrusion_height_seed"
+        )
+        try:
+            dataStorage.extrusion_height_seed = int(record)
+        except (TypeError, ValueError):
+            dataStorage.extrusion_height_seed = None
+
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return
+
+
+def get_receive_max_layers_in_flight(dataStorage):
+    """Reads how many received layers can wait for QGIS to add them, from the project
+    variable 'speckle_receive_max_layers_in_flight'."""
+    try:
+        from qgis.core import QgsExpressionContextUtils
+
+        proj = dataStorage.project
+        record = QgsExpressionContextUtils.projectScope(proj).variable(
+            "speckle_receive_max_layers_in_flight"
+        )
+        try:
+            dataStorage.receive_max_layers_in_flight = int(record)
+        except (TypeError, ValueError):
+            dataStorage.receive_max_layers_in_flight = None
+
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return
+
+
 def get_elevationLayer(dataStorage):
     try:
         # get from saved project, set to local vars
@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects import Base
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+
+class CachedObject(Base):
+    """Placeholder of an object already serialized to the local cache during conversion."""
+
+    _objectId: str = None
+    # detached children of the object, with their depth
+    _closure: Dict[str, int] = None
+
+
+class CachedObjectSerializer(BaseObjectSerializer):
+    """Serializer copying the cached objects to the write transports, instead of traversing them."""
+
+    def __init__(
+        self, cache: SQLiteTransport, write_transports: List[AbstractTransport]
+    ) -> None:
+        super().__init__(write_transports=[cache] + list(write_transports))
+        self.cache = cache
+
+    def _traverse_base(self, base: Base) -> Tuple[str, Dict[str, Any]]:
+        if not isinstance(base, CachedObject):
+            return super()._traverse_base(base)
+
+        # the object is always detached, its reference is added by the parent
+        self.detach_lineage.pop()
+        depth = len(self.detach_lineage)
+        obj_id = base._objectId
+        for parent in self.lineage:
+            family = self.family_tree.setdefault(parent, {})
+            for ref_id, ref_depth in base._closure.items():
+                if ref_id not in family or family[ref_id] > depth + ref_depth:
+                    family[ref_id] = depth + ref_depth
+
+        for ref_id in [obj_id] + list(base._closure):
+            serialized_object = self.cache.get_object(ref_id)
+            if serialized_object is None:
+                raise SpeckleException(f"Object {ref_id} not found in the local cache")
+            for t in self.write_transports[1:]:
+                t.save_object(id=ref_id, serialized_object=serialized_object)
+
+        return obj_id, {"referencedId": obj_id, "speckle_type": "reference"}
+
+
+def cacheObject(base: Base, cache: Optional[SQLiteTransport] = None) -> CachedObject:
+    """Serializes the object to the local cache, so it's not kept in memory until the send."""
+    transport = cache if cache is not None else SQLiteTransport()
+    try:
+        serializer = BaseObjectSerializer(write_transports=[transport])
+        obj_id, obj = serializer.traverse_base(base)
+    finally:
+        if cache is None:
+            transport.close()
+
+    placeholder = CachedObject()
+    placeholder._objectId = obj_id
+    placeholder._closure = obj.get("__closure", {})
+    return placeholder
+
+
+def sendObject(
+    base: Base,
+    transports: List[AbstractTransport],
+    cache: Optional[SQLiteTransport] = None,
+) -> str:
+    """Sends the object like operations.send, including the objects cached during conversion."""
+    transport = cache if cache is not None else SQLiteTransport()
+    try:
+        serializer = CachedObjectSerializer(transport, transports)
+        obj_id, _ = serializer.write_json(base=base)
+    finally:
+        if cache is None:
+            transport.close()
+    return obj_id
@@ -9,7 +9,7 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
 import threading
-from plugin_utils.threads import KThread
+from plugin_utils.threads import CANCELLATION_TOKEN, KThread
 from plugin_utils.helpers import (
     constructCommitURL,
     get_project_workspace_id,
@@ -76,8 +76,22 @@ from speckle.converter.layers.layer_conversions import (
     addRasterMainThread,
     addVectorMainThread,
     convertSelectedLayersToSpeckle,
+    getMainThreadTimesSummary,
+    RECEIVE_MAIN_THREAD_TIMES,
+    RECEIVE_MAX_LAYERS_IN_FLIGHT,
+    RECEIVE_QUEUE,
 )
 from speckle.converter.layers import findAndClearLayerGroup
+from speckle.converter.geometry.transform import (
+    clearSendTransforms,
+    clearTransformCache,
+)
+from speckle.converter.geometry.triangulation import (
+    clear_precomputed_triangulations,
+    shutdown_triangulation_executor,
+)
+from speckle.converter.layers.symbology import clearFeatureColorResolvers
+from speckle.converter.layers.utils import clearLayerTransforms, clearRasterCache
 
 from specklepy_qt_ui.qt_ui.DataStorage import DataStorage
 
@@ -85,6 +99,7 @@ from specklepy_qt_ui.qt_ui.widget_add_stream import AddStreamModalDialog
 from specklepy_qt_ui.qt_ui.widget_create_stream import CreateStreamModalDialog
 from specklepy_qt_ui.qt_ui.widget_create_branch import CreateBranchModalDialog
 from speckle.utils.panel_logging import logToUser
+from speckle.utils.serialization import sendObject
 
 # Import the code for the dialog
 from speckle.utils.validation import (
@@ -338,6 +353,9 @@ class SpeckleQGIS:
                 )
                 return
 
+        # a new operation: clear the cancellation of the previous one
+        CANCELLATION_TOKEN.reset()
+
         # set the project instance
         self.project = QgsProject.instance()
         self.dataStorage.project = self.project
@@ -455,6 +473,11 @@ class SpeckleQGIS:
 
     def onSend(self, message: str):
         """Handles action when Send button is pressed."""
+        from speckle.utils.project_vars import (
+            get_extrusion_height_seed,
+            get_raster_memory_budget,
+        )
+
         # logToUser("Some message here", level = 0, func = inspect.stack()[0][3], plugin=self.dockwidget )
         try:
             if not self.dockwidget:
@@ -540,10 +563,26 @@ class SpeckleQGIS:
 
             # conversions
             time_start_conversion = datetime.now()
-            base_obj = convertSelectedLayersToSpeckle(
-                base_obj, layers, tree_structure, projectCRS, self
-            )
+            get_raster_memory_budget(self.dataStorage)
+            get_extrusion_height_seed(self.dataStorage)
+            clearRasterCache()
+            clearTransformCache()
+            clearSendTransforms()
+            clearFeatureColorResolvers()
+            try:
+                base_obj = convertSelectedLayersToSpeckle(
+                    base_obj, layers, tree_structure, projectCRS, self
+                )
+            finally:
+                # release raster data read during the conversion
+                clearRasterCache()
+                clearLayerTransforms()
+                clearSendTransforms()
+                clearFeatureColorResolvers()
+                clear_precomputed_triangulations(all_threads=True)
+                shutdown_triangulation_executor()
             time_end_conversion = datetime.now()
+            CANCELLATION_TOKEN.check()
 
             if (
                 base_obj is None
@@ -595,8 +634,9 @@ class SpeckleQGIS:
         try:
             self.dockwidget.signal_remove_btn_url.emit("cancel")
             time_start_transfer = datetime.now()
-            # this serialises the block and sends it to the transport
-            objId = operations.send(base=base_obj, transports=[transport])
+            # this serialises the block and sends it to the transport,
+            # together with the raster tiles cached during conversion
+            objId = sendObject(base=base_obj, transports=[transport])
             time_end_transfer = datetime.now()
         except Exception as e:
             logToUser(
@@ -808,6 +848,7 @@ class SpeckleQGIS:
 
     def onReceive(self):
         """Handles action when the Receive button is pressed"""
+        from speckle.utils.project_vars import get_receive_max_layers_in_flight
         # print("Receive")
 
         try:
@@ -820,6 +861,7 @@ class SpeckleQGIS:
             self.dataStorage.flat_report_receive = {}
 
             self.dataStorage.latestHostApp = ""
+            clearTransformCache()
 
             # Check if stream id/url is empty
             if self.active_stream is None:
@@ -897,6 +939,7 @@ class SpeckleQGIS:
             time_start_transfer = datetime.now()
             commitObj = operations.receive(objId, transport, None)
             time_end_transfer = datetime.now()
+            CANCELLATION_TOKEN.check()
             self.dockwidget.signal_remove_btn_url.emit("cancel")
 
             projectCRS = self.project.crs()
@@ -989,13 +1032,24 @@ class SpeckleQGIS:
 
             self.dataStorage.latestActionLayers = []
             self.dataStorage.latestActionReport = []
+            RECEIVE_MAIN_THREAD_TIMES.clear()
+            get_receive_max_layers_in_flight(self.dataStorage)
+            RECEIVE_QUEUE.reset(
+                getattr(self.dataStorage, "receive_max_layers_in_flight", None)
+                or RECEIVE_MAX_LAYERS_IN_FLIGHT
+            )
 
             # conversions
             time_start_conversion = self.dataStorage.latestConversionTime = (
                 datetime.now()
             )
             traverseObject(self, commitObj, callback, check, str(newGroupName), "")
+            # wait for the main thread to add the last layers, before reporting
+            RECEIVE_QUEUE.join()
             time_end_conversion = self.dataStorage.latestConversionTime
+            main_thread_summary = getMainThreadTimesSummary()
+            if main_thread_summary is not None:
+                logToUser(main_thread_summary, level=0, plugin=self.dockwidget)
 
             # add time stats to the report
             self.dataStorage.latestActionTime = str(
@@ -1059,6 +1113,7 @@ class SpeckleQGIS:
                 get_crs_offsets,
                 get_project_saved_layers,
                 get_transformations,
+                get_raster_memory_budget,
             )
 
             self.project = QgsProject.instance()
@@ -1081,6 +1136,7 @@ class SpeckleQGIS:
                 get_rotation(self.dataStorage)
                 get_survey_point(self.dataStorage)
                 get_crs_offsets(self.dataStorage)
+                get_raster_memory_budget(self.dataStorage)
                 get_project_saved_layers(self)
                 self.dockwidget.populateSavedLayerDropdown(self)
 
@@ -1101,6 +1157,7 @@ class SpeckleQGIS:
             get_elevationLayer,
             get_project_saved_layers,
             get_transformations,
+            get_raster_memory_budget,
         )
 
         # Create the dialog with elements (after translation) and keep reference
@@ -1130,6 +1187,8 @@ class SpeckleQGIS:
 
                 self.project.fileNameChanged.connect(self.reloadUI)
                 self.project.homePathChanged.connect(self.reloadUI)
+                self.project.crsChanged.connect(clearTransformCache)
+                self.project.transformContextChanged.connect(clearTransformCache)
 
                 self.dockwidget.runButton.clicked.connect(self.onRunButtonClicked)
 
@@ -1159,6 +1218,7 @@ class SpeckleQGIS:
             get_rotation(self.dataStorage)
             get_survey_point(self.dataStorage)
             get_crs_offsets(self.dataStorage)
+            get_raster_memory_budget(self.dataStorage)
             get_project_saved_layers(self)
             self.dockwidget.populateSavedLayerDropdown(self)
             get_elevationLayer(self.dataStorage)
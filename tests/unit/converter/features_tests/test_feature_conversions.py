@@ -1,3 +1,7 @@
+import numpy as np
+import pytest
+import scipy as sp
+
 from speckle.converter.features.feature_conversions import (
     featureToSpeckle,
     rasterFeatureToSpeckle,
@@ -5,4 +9,408 @@ from speckle.converter.features.feature_conversions import (
     bimFeatureToNative,
     nonGeomFeatureToNative,
     cadFeatureToNative,
+    get_raster_mesh_faces,
+    get_raster_grid_mesh_faces,
+    get_raster_grid_vertex_colors,
+    remove_transparent_grid_cells,
+    apply_offset_rotation_to_vertices_send,
+    remove_transparent_raster_cells,
+    normalize_raster_band_values,
+    get_raster_band_value_range,
+    get_raster_band_actual_min,
+    get_raster_class_colors,
+    get_raster_colors,
+    get_raster_mesh_coords,
+    get_elevation_indices,
+    get_vertices_height,
+    get_smoothed_heights,
+    set_raster_cells_height,
+    get_raster_tile_halo,
+    get_raster_tile_heights,
 )
+from speckle.converter.layers.utils import getArrayIndicesFromXY, getXYofArrayPoint
+
+
+def test_get_raster_mesh_faces():
+    faces = get_raster_mesh_faces(2)
+    assert faces.tolist() == [4, 0, 1, 2, 3, 4, 4, 5, 6, 7]
+
+
+def test_get_raster_grid_mesh_faces():
+    # 2 x 1 cells share the middle edge: 6 vertices
+    faces = get_raster_grid_mesh_faces(2, 1)
+    assert faces.tolist() == [4, 0, 3, 4, 1, 4, 1, 4, 5, 2]
+
+
+def test_get_raster_grid_vertex_colors():
+    red = (255 << 24) | (200 << 16)
+    blue = (255 << 24) | 100
+    colors = get_raster_grid_vertex_colors(np.array([red, blue, 0]), 3, 1)
+    assert colors.tolist() == [
+        red,
+        (255 << 24) | (100 << 16) | 50,
+        blue,
+        0,
+    ] * 2
+
+
+def test_remove_transparent_grid_cells():
+    vertices = np.arange(6 * 3, dtype=float)
+    faces = get_raster_grid_mesh_faces(2, 1)
+    colors = np.arange(6)
+    vertices_new, faces_new, colors_new = remove_transparent_grid_cells(
+        vertices, faces, colors, np.array([False, True])
+    )
+    assert faces_new.tolist() == [4, 0, 2, 3, 1]
+    assert colors_new.tolist() == [1, 2, 4, 5]
+    assert len(vertices_new) == 4 * 3
+
+
+def test_apply_offset_rotation_to_vertices_send():
+    class Storage:
+        crs_offset_x = 10.0
+        crs_offset_y = 20.0
+        crs_rotation = 90
+
+    vertices = apply_offset_rotation_to_vertices_send([11.0, 20.0, 5.0], Storage())
+    assert len(vertices) == 3
+    assert abs(vertices[0]) < 1e-9
+    assert abs(vertices[1] + 1) < 1e-9
+    assert vertices[2] == 5.0
+
+
+@pytest.mark.parametrize("nodata_ratio", [0.1, 0.5, 0.9])
+def test_remove_transparent_raster_cells(nodata_ratio):
+    count = 1000
+    visible_count = count - int(count * nodata_ratio)
+    cell_colors = [(255 << 24) | 100] * visible_count + [0] * (count - visible_count)
+    colors = [c for c in cell_colors for _ in range(4)]
+    vertices = [float(i) for i in range(count * 12)]
+    faces = get_raster_mesh_faces(count)
+
+    vertices_new, faces_new, colors_new = remove_transparent_raster_cells(
+        vertices, faces, colors
+    )
+    assert len(vertices_new) == visible_count * 12
+    assert len(colors_new) == visible_count * 4
+    assert faces_new.tolist() == get_raster_mesh_faces(visible_count).tolist()
+    assert vertices_new.tolist() == vertices[: visible_count * 12]
+
+
+def test_remove_transparent_raster_cells_interleaved():
+    count = 200
+    visible = np.random.default_rng(0).random(count) > 0.5
+    visible[:2] = [False, True]
+    cell_colors = np.where(visible, (255 << 24) | 100, (0 << 24) | 100)
+    colors = np.repeat(cell_colors, 4)
+    vertices = np.arange(count * 12, dtype=float)
+    faces = get_raster_mesh_faces(count)
+
+    vertices_new, faces_new, colors_new = remove_transparent_raster_cells(
+        vertices, faces, colors
+    )
+    # same as removing invisible cells one by one
+    visible_cells = [i for i in range(count) if visible[i]]
+    assert vertices_new.tolist() == [
+        vertices[12 * i + k] for i in visible_cells for k in range(12)
+    ]
+    assert colors_new.tolist() == [
+        cell_colors[i] for i in visible_cells for _ in range(4)
+    ]
+    assert faces_new.tolist() == get_raster_mesh_faces(len(visible_cells)).tolist()
+
+
+def test_normalize_raster_band_values_small_nodata():
+    values, no_data, val_min, val_max = normalize_raster_band_values(
+        [1.0, -3.4e38, 5.0], -3.4e38, -3.4e38, 5.0
+    )
+    assert no_data == -999.0
+    assert val_min == 1.0
+    assert val_max == 5.0
+    assert values.tolist() == [1.0, -999.0, 5.0]
+
+
+def test_normalize_raster_band_values_valid_nodata():
+    values, no_data, val_min, val_max = normalize_raster_band_values(
+        [1, 0, 5], 0.0, 0, 5
+    )
+    assert no_data == 0.0
+    assert values.tolist() == [1, 0, 5]
+
+
+def test_normalize_raster_band_values_tiles_share_nodata():
+    band = np.array([[7.0, -3.4e38, 5.0], [2.0, 9.0, -3.4e38]])
+    tiles = [band[:, :1], band[:, 1:]]
+    actual_min = get_raster_band_actual_min(
+        [get_raster_band_value_range(t) for t in tiles]
+    )
+    assert actual_min == 2.0
+
+    whole = normalize_raster_band_values(band, -3.4e38, -3.4e38, 9.0)
+    for tile in tiles:
+        values, no_data, val_min, val_max = normalize_raster_band_values(
+            tile, -3.4e38, -3.4e38, 9.0, actual_min
+        )
+        # same as for the whole band, even if the tile has other values
+        assert (no_data, val_min, val_max) == whole[1:]
+        assert -3.4e38 not in values.tolist()
+    assert whole[1] == -998.0
+
+
+def test_get_raster_band_actual_min_all_extreme():
+    tiles = [np.array([-3.4e38, 4.0]), np.array([-3.4e38, -3.4e38])]
+    ranges = [get_raster_band_value_range(t) for t in tiles]
+    assert ranges[1][0] is None
+    assert get_raster_band_actual_min(ranges) == 4.0
+    assert get_raster_band_actual_min([ranges[1]]) == -3.4e38 + 1
+
+
+def test_get_raster_class_colors():
+    class_rgbs = [(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255)]
+    colors = get_raster_class_colors([-1, 0, 1.5, 2, 3, 100], [0, 1, 2], class_rgbs, 3)
+    red = (255 << 24) | (255 << 16)
+    green = (255 << 24) | (255 << 8)
+    blue = (255 << 24) | 255
+    # below the first class and NoData cells are transparent
+    assert colors.tolist() == [0, red, green, blue, 0, blue]
+
+
+def test_get_raster_class_colors_unsorted():
+    class_rgbs = [(255, 0, 0, 255), (0, 255, 0, 255)]
+    colors = get_raster_class_colors([0, 5, 10], [5, 0], class_rgbs, None)
+    green = (255 << 24) | (255 << 8)
+    assert colors.tolist() == [green, green, green]
+
+
+def test_get_raster_colors_multiband_missing_channels():
+    class Renderer:
+        def redBand(self):
+            return 1
+
+        def greenBand(self):
+            return 0
+
+        def blueBand(self):
+            return 0
+
+        def alphaBand(self):
+            return -1
+
+    class Layer:
+        def renderer(self):
+            return Renderer()
+
+    colors, have_transparent_cells = get_raster_colors(
+        Layer(),
+        [np.array([0.0, 127.5, 255.0])],
+        [None],
+        [0],
+        [255],
+        "multibandcolor",
+        None,
+    )
+    # channels without a band are 0
+    assert colors.tolist()[::4] == [
+        (255 << 24),
+        (255 << 24) | (127 << 16),
+        (255 << 24) | (255 << 16),
+    ]
+    assert len(colors) == 12
+    assert have_transparent_cells is False
+
+
+class Point:
+    def __init__(self, x, y):
+        self._x = x
+        self._y = y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+
+def old_vertices_height(vertices, xy_z_values, i, height_array, indices):
+    """Corner heights of 1 raster cell, as computed before array operations."""
+    index1, index1_0, index2, index2_0 = indices
+    key1 = (vertices[i], vertices[i + 1])
+    if key1 in xy_z_values:
+        z1 = xy_z_values[key1]
+    else:
+        if index1 > 0 and index2 > 0:
+            z1 = height_array[index1_0][index2_0]
+        elif index1 > 0:
+            z1 = height_array[index1_0][index2]
+        elif index2 > 0:
+            z1 = height_array[index1][index2_0]
+        else:
+            z1 = height_array[index1][index2]
+        xy_z_values[key1] = z1
+    key4 = (vertices[i + 9], vertices[i + 10])
+    if key4 in xy_z_values:
+        z4 = xy_z_values[key4]
+    else:
+        z4 = height_array[index1_0 if index1 > 0 else index1][index2]
+        xy_z_values[key4] = z4
+    z3 = height_array[index1][index2]
+    xy_z_values[(vertices[i + 6], vertices[i + 7])] = z3
+    key2 = (vertices[i + 3], vertices[i + 4])
+    if key2 in xy_z_values:
+        z2 = xy_z_values[key2]
+    else:
+        z2 = height_array[index1][index2_0 if index2 > 0 else index2]
+        xy_z_values[key2] = z2
+    return z1, z2, z3, z4
+
+
+def old_cells_height(vertices, height_array, sizeX, sizeY, get_indices, sigma):
+    """Per-cell loop of sampling and smoothing raster heights, before array operations."""
+    vertices = list(vertices)
+    xy_z_values = {}
+    array_z = []
+    for v in range(sizeY):
+        row_z = []
+        row_z_bottom = []
+        for h in range(sizeX):
+            i = 12 * (v * sizeX + h)
+            index1, index1_0, index2, index2_0 = get_indices(h, v)
+            if index1 is None or index1_0 is None:
+                z1 = z2 = z3 = z4 = np.nan
+            else:
+                z1, z2, z3, z4 = old_vertices_height(
+                    vertices,
+                    xy_z_values,
+                    i,
+                    height_array,
+                    (index1, index1_0, index2, index2_0),
+                )
+            if h == 0:
+                row_z.append(z1)
+                row_z_bottom.append(z2)
+            row_z.append(z4)
+            row_z_bottom.append(z3)
+        if v == 0:
+            array_z.append(row_z)
+        array_z.append(row_z_bottom)
+
+    array_z_nans = np.array(array_z)
+    array_z_filled = np.array(array_z)
+    mask = np.isnan(array_z_filled)
+    array_z_filled[mask] = np.interp(
+        np.flatnonzero(mask), np.flatnonzero(~mask), array_z_filled[~mask]
+    )
+    gaussian_array = sp.ndimage.gaussian_filter(array_z_filled, sigma, mode="nearest")
+    for v in range(sizeY):
+        for h in range(sizeX):
+            i = 12 * (v * sizeX + h)
+            if not np.isnan(array_z_nans[v][h]):
+                vertices[i + 2] = gaussian_array[v][h]
+                vertices[i + 5] = gaussian_array[v + 1][h]
+                vertices[i + 8] = gaussian_array[v + 1][h + 1]
+                vertices[i + 11] = gaussian_array[v][h + 1]
+    return array_z_nans, vertices
+
+
+@pytest.mark.parametrize("texture_transform", [False, True])
+def test_raster_heights_same_as_cell_loop(texture_transform):
+    sizeX, sizeY = 7, 5
+    resXY = [2.0, -2.0]
+    origin = Point(100.0, 200.0)
+    stats = (
+        Point(origin.x() + resXY[0] * sizeX, origin.y()),
+        origin,
+        None,
+        Point(origin.x(), origin.y() + resXY[1] * sizeY),
+        resXY,
+        (sizeX, sizeY),
+    )
+    vertices = get_raster_mesh_coords(stats, resXY, np.zeros(sizeX * sizeY), None)
+
+    rng = np.random.default_rng(1)
+    if texture_transform is True:
+        # elevation raster is coarser and doesn't cover the last columns
+        elevation = (3.0, -3.0, 99.0, 201.0, 4, 4, None, None)
+        height_array = rng.uniform(0, 50, (4, 4))
+        height_array[1, 2] = np.nan
+    else:
+        elevation = (*resXY, origin.x(), origin.y(), sizeX, sizeY, None, None)
+        height_array = rng.uniform(0, 50, (sizeY, sizeX))
+        height_array[2, 3] = np.nan
+
+    def get_indices(h, v):
+        if texture_transform is False:
+            return v, v - 1, h, h - 1
+        posX, posY = getXYofArrayPoint(resXY, origin.x(), origin.y(), h, v)
+        index1, index2, _, _ = getArrayIndicesFromXY(elevation, posX, posY)
+        index1_0, index2_0, _, _ = getArrayIndicesFromXY(
+            elevation, posX - resXY[0], posY - resXY[1]
+        )
+        return index1, index1_0, index2, index2_0
+
+    sigma = 1 if texture_transform is True else 0.8
+    old_array_z, old_vertices = old_cells_height(
+        vertices, height_array, sizeX, sizeY, get_indices, sigma
+    )
+
+    indices = get_elevation_indices(
+        texture_transform,
+        resXY,
+        resXY,
+        origin.x(),
+        origin.y(),
+        (sizeX, sizeY),
+        *elevation[:6],
+    )
+    array_z = get_vertices_height(height_array, indices)
+    new_vertices = vertices.copy()
+    set_raster_cells_height(
+        new_vertices,
+        get_smoothed_heights(array_z, sigma),
+        ~np.isnan(array_z[:-1, :-1]),
+    )
+
+    assert np.any(np.isnan(array_z))
+    np.testing.assert_array_equal(array_z, old_array_z)
+    np.testing.assert_allclose(new_vertices, old_vertices)
+
+
+@pytest.mark.parametrize("sigma", [0.8, 1])
+def test_raster_tile_heights_match_on_shared_edges(sigma):
+    sizeX, sizeY = 30, 24
+    height_array = np.random.default_rng(2).uniform(0, 50, (sizeY, sizeX))
+    tiles = [(0, 0, 13, 10), (13, 0, 17, 10), (0, 10, 13, 14), (13, 10, 17, 14)]
+
+    def tile_heights(window):
+        xoff, yoff, xsize, ysize = window
+        left, top, right, bottom = halo = get_raster_tile_halo(
+            window, (sizeX, sizeY), sigma
+        )
+        heights = height_array[
+            yoff - top : yoff + ysize + bottom, xoff - left : xoff + xsize + right
+        ]
+        indices = get_elevation_indices(
+            False,
+            None,
+            None,
+            None,
+            None,
+            (xsize + left + right, ysize + top + bottom),
+            *[None] * 6,
+        )
+        return get_raster_tile_heights(heights, indices, halo, (xsize, ysize), sigma)
+
+    whole_z, whole_smoothed, _ = tile_heights((0, 0, sizeX, sizeY))
+    results = [tile_heights(window) for window in tiles]
+    for (xoff, yoff, xsize, ysize), (array_z, smoothed, within) in zip(tiles, results):
+        assert within.shape == (ysize, xsize)
+        rows = slice(yoff, yoff + ysize + 1)
+        cols = slice(xoff, xoff + xsize + 1)
+        np.testing.assert_array_equal(array_z, whole_z[rows, cols])
+        np.testing.assert_allclose(smoothed, whole_smoothed[rows, cols], rtol=1e-12)
+
+    # shared edges of the neighbouring tiles get the same heights
+    (_, left_z, _), (_, right_z, _) = results[0], results[1]
+    np.testing.assert_array_equal(left_z[:, -1], right_z[:, 0])
+    (_, top_z, _), (_, bottom_z, _) = results[0], results[2]
+    np.testing.assert_array_equal(top_z[-1, :], bottom_z[0, :])
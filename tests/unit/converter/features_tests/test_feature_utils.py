@@ -2,4 +2,28 @@ from speckle.converter.features.utils import (
     addFeatVariant,
     updateFeat,
     getPolygonFeatureHeight,
+    getLayerRandom,
+    getFeatureHeightStats,
 )
+
+
+class Layer:
+    def id(self):
+        return "layer_id"
+
+
+class Storage:
+    extrusion_height_seed = 1
+
+
+def test_getLayerRandom_seeded():
+    random1 = getLayerRandom(Layer(), {}, Storage())
+    random2 = getLayerRandom(Layer(), {}, Storage())
+    values1 = [random1.randint(10, 20) for _ in range(20)]
+    values2 = [random2.randint(10, 20) for _ in range(20)]
+    assert values1 == values2
+
+
+def test_getFeatureHeightStats_reused():
+    transform = {"height_stats": {"middle": 12}}
+    assert getFeatureHeightStats(Layer(), "height", transform)["middle"] == 12
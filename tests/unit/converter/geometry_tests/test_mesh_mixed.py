@@ -1,5 +1,6 @@
 from speckle.converter.geometry.mesh import (
     deconstructSpeckleMesh,
+    getMeshFaceIndices,
     fill_multi_mesh_parts,
     writeMeshToShp,
     fill_mesh_parts,
@@ -22,6 +23,21 @@ def test_deconstructSpeckleMesh(mesh, data_storage):
     assert isinstance(result[0], list) and isinstance(result[1], list)
 
 
+def test_getMeshFaceIndices_mixed_faces():
+    # legacy triangle marker, quad, pentagon, then a face out of range of the array
+    faces = [0, 0, 1, 2, 4, 0, 1, 2, 3, 5, 0, 1, 2, 3, 4, 3, 0, 1]
+    indices, offsets = getMeshFaceIndices(faces, vertex_count=5)
+    assert indices.tolist() == [0, 1, 2, 0, 1, 2, 3, 0, 1, 2, 3, 4]
+    assert offsets.tolist() == [0, 3, 7, 12]
+
+
+def test_getMeshFaceIndices_vertex_out_of_range():
+    faces = [3, 0, 1, 2, 3, 1, 2, 9, 3, 0, 2, 1]
+    indices, offsets = getMeshFaceIndices(faces, vertex_count=3)
+    assert indices.tolist() == [0, 1, 2]
+    assert offsets.tolist() == [0, 3]
+
+
 def test_fill_multi_mesh_parts(mesh, data_storage):
     path = pathlib.Path(__file__).parent.resolve()
     w = shapefile.Writer(path)
@@ -1 +1,139 @@
-from speckle.converter.geometry.transform import transform
+import numpy as np
+import pytest
+
+import speckle.converter.geometry.transform as transform_module
+from speckle.converter.geometry.transform import (
+    SendTransform,
+    clearSendTransforms,
+    clearTransformCache,
+    getSendTransform,
+    getTransform,
+    transformCoords,
+)
+
+
+class Crs:
+    def __init__(self, authid, wkt=""):
+        self._authid = authid
+        self._wkt = wkt
+
+    def authid(self):
+        return self._authid
+
+    def toWkt(self):
+        return self._wkt
+
+
+class Project:
+    def transformContext(self):
+        return "context"
+
+
+class CoordinateTransform:
+    created = []
+
+    def __init__(self, crsSrc, crsDest, context):
+        self.crs = (crsSrc, crsDest)
+        CoordinateTransform.created.append(self)
+
+
+class LineString:
+    def __init__(self, x, y):
+        if len(x) != len(y):
+            raise ValueError("X and Y sizes differ")
+        self.x, self.y = x, y
+
+    def transform(self, xform):
+        self.x = [v + 1 for v in self.x]
+        self.y = [v - 1 for v in self.y]
+
+    def xVector(self):
+        return self.x
+
+    def yVector(self):
+        return self.y
+
+
+@pytest.fixture()
+def qgis_transform(monkeypatch):
+    CoordinateTransform.created = []
+    monkeypatch.setattr(
+        transform_module, "QgsCoordinateTransform", CoordinateTransform, raising=False
+    )
+    monkeypatch.setattr(transform_module, "QgsLineString", LineString, raising=False)
+    clearTransformCache()
+    yield CoordinateTransform.created
+    clearTransformCache()
+
+
+def test_get_transform_reused(qgis_transform):
+    src, dest = Crs("EPSG:4326"), Crs("EPSG:32633")
+    xform = getTransform(src, dest, Project())
+    # equal CRSs (other instances) reuse the same transform
+    assert getTransform(Crs("EPSG:4326"), Crs("EPSG:32633"), Project()) is xform
+    assert getTransform(dest, src, Project()) is not xform
+    # custom CRS without authid is keyed by WKT
+    custom = Crs("", "PROJCS[custom]")
+    assert getTransform(custom, dest, Project()) is getTransform(
+        Crs("", "PROJCS[custom]"), dest, Project()
+    )
+    assert len(qgis_transform) == 3
+
+
+def test_clear_transform_cache(qgis_transform):
+    src, dest = Crs("EPSG:4326"), Crs("EPSG:32633")
+    xform = getTransform(src, dest, Project())
+    clearTransformCache()
+    # e.g. after the project CRS or transform context changed
+    assert getTransform(src, dest, Project()) is not xform
+    assert len(qgis_transform) == 2
+
+
+def test_transform_coords(qgis_transform):
+    src, dest = Crs("EPSG:4326"), Crs("EPSG:32633")
+    x, y = transformCoords(Project(), [1.0, 2.0], [3.0, 4.0], src, dest)
+    assert (x, y) == ([2.0, 3.0], [2.0, 3.0])
+    transformCoords(Project(), [5.0], [6.0], src, dest)
+    assert len(qgis_transform) == 1
+    assert transformCoords(Project(), [], [], src, dest) == ([], [])
+
+
+def test_transform_coords_error(qgis_transform, monkeypatch):
+    messages = []
+    monkeypatch.setattr(
+        transform_module, "logToUser", lambda msg, **kwargs: messages.append(msg)
+    )
+    # different number of X and Y values
+    x, y = transformCoords(Project(), [1.0, 2.0], [3.0], Crs("A"), Crs("B"))
+    assert (x, y) == ([], [])
+    assert len(messages) == 1
+    # callers can iterate the result
+    assert list(zip(x, y)) == []
+
+
+def test_send_transform_identity():
+    send_transform = SendTransform(0, 0, 0)
+    assert send_transform.identity is True
+    assert send_transform.apply(1.5, 2.5) == (1.5, 2.5)
+
+
+def test_send_transform_array_same_as_points():
+    send_transform = SendTransform(10.0, -5.0, 30.0)
+    vertices = np.array([[1.0, 2.0, 3.0], [-4.0, 5.5, 0.0], [100.0, 0.0, 7.0]])
+    result = send_transform.apply_array(vertices)
+    for pt, new_pt in zip(vertices, result):
+        assert tuple(new_pt[:2]) == send_transform.apply(pt[0], pt[1])
+        assert new_pt[2] == pt[2]
+    assert (send_transform.apply_array(vertices.ravel()) == result.ravel()).all()
+
+
+def test_get_send_transform():
+    class Storage:
+        crs_offset_x = 10.0
+        crs_offset_y = 20.0
+        crs_rotation = None
+
+    send_transform = getSendTransform(Storage())
+    assert getSendTransform(Storage()) is send_transform
+    assert send_transform.apply(15.0, 25.0) == (5.0, 5.0)
+    clearSendTransforms()
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import earcut.earcut
+import pytest
+
+import speckle.converter.geometry.triangulation as triangulation
+from speckle.converter.geometry.triangulation import (
+    PRECOMPUTED_TRIANGULATIONS,
+    clear_precomputed_triangulations,
+    pop_precomputed_triangulation,
+    precompute_triangulations,
+    shutdown_triangulation_executor,
+    triangulate_rings,
+    triangulate_rings_batch,
+)
+
+
+@pytest.fixture()
+def polygons():
+    square = [0.0, 0.0, 0.0, 10.0, 0.0, 0.0, 10.0, 10.0, 0.0, 0.0, 10.0, 0.0]
+    hole = [2.0, 2.0, 0.0, 2.0, 4.0, 0.0, 4.0, 4.0, 0.0, 4.0, 2.0, 0.0]
+    l_shape = [0, 0, 0, 6, 0, 0, 6, 2, 0, 2, 2, 0, 2, 6, 0, 0, 6, 0]
+    return [(square, []), (square + hole, [4]), ([float(x) for x in l_shape], [])]
+
+
+def test_triangulate_rings(polygons):
+    for vertices, holes in polygons:
+        triangles = earcut.earcut.earcut(vertices, holes or None, dim=3)
+        result = triangulate_rings(vertices, holes)
+        assert [i for trg in result for i in trg] == triangles
+
+
+def test_triangulate_rings_batch_same_order(polygons):
+    jobs = polygons * 10
+    result = triangulate_rings_batch(jobs, max_workers=1)
+    assert result == [triangulate_rings(v, h) for v, h in jobs]
+
+
+def test_triangulate_rings_batch_one_executor_per_send(polygons, monkeypatch):
+    started = []
+
+    def get_process_executor(max_workers):
+        started.append(max_workers)
+        return ThreadPoolExecutor(max_workers=max_workers)
+
+    monkeypatch.setattr(triangulation, "get_process_executor", get_process_executor)
+    monkeypatch.setattr(triangulation, "TRIANGULATION_MIN_BATCH", 2)
+    monkeypatch.setattr(triangulation, "TRIANGULATION_CHUNK_SIZE", 4)
+    jobs = polygons * 5
+    try:
+        # 2 layers of the same send
+        for _ in range(2):
+            result = triangulate_rings_batch(jobs, max_workers=2)
+            assert result == [triangulate_rings(v, h) for v, h in jobs]
+        assert started == [2]
+    finally:
+        shutdown_triangulation_executor()
+    assert len(triangulation.TRIANGULATION_EXECUTOR) == 0
+
+
+def test_precomputed_triangulations_in_order(polygons):
+    try:
+        assert precompute_triangulations(polygons, max_workers=1) == 3
+        square, l_shape = polygons[0], polygons[2]
+
+        assert pop_precomputed_triangulation(*square) == triangulate_rings(*square)
+        # the polygon with a hole was not converted: the next one is found
+        assert pop_precomputed_triangulation(*l_shape) == triangulate_rings(*l_shape)
+        # each result is used once, and only for the same input
+        assert pop_precomputed_triangulation(*square) is None
+        assert pop_precomputed_triangulation(*l_shape) is None
+    finally:
+        clear_precomputed_triangulations()
+    assert len(PRECOMPUTED_TRIANGULATIONS) == 0
+
+
+def test_precomputed_triangulations_other_input(polygons):
+    try:
+        precompute_triangulations(polygons[:1], max_workers=1)
+        vertices, holes = polygons[0]
+        moved = [v + 1.0 for v in vertices]
+        # same size, different coordinates
+        assert pop_precomputed_triangulation(moved, holes) is None
+        assert pop_precomputed_triangulation(vertices, [2]) is None
+        assert pop_precomputed_triangulation(vertices, holes) is not None
+    finally:
+        clear_precomputed_triangulations()
+
+
+def test_precomputed_triangulations_per_thread(polygons):
+    square, l_shape = polygons[0], polygons[2]
+
+    def convert_layer(polygon):
+        # another layer converted at the same time doesn't take the results
+        precompute_triangulations([polygon], max_workers=1)
+        barrier.wait(5)
+        try:
+            return [pop_precomputed_triangulation(*p) for p in (square, l_shape)]
+        finally:
+            clear_precomputed_triangulations()
+
+    barrier = threading.Barrier(2)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first, second = executor.map(convert_layer, [square, l_shape])
+    assert first == [triangulate_rings(*square), None]
+    assert second == [None, triangulate_rings(*l_shape)]
+    assert len(PRECOMPUTED_TRIANGULATIONS) == 0
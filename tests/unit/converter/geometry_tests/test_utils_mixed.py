@@ -14,6 +14,8 @@ from speckle.converter.geometry.utils import (
     triangulatePolygon,
     trianglateQuadMesh,
     getPolyPtsSegments,
+    pointIndexFromCoords,
+    pointInIndex,
     fix_orientation,
     getHolePt,
     specklePolycurveToPoints,
@@ -26,6 +28,8 @@ from speckle.converter.geometry.utils import (
     apply_pt_offsets_rotation_on_send,
     transform_speckle_pt_on_receive,
     apply_pt_transform_matrix,
+    apply_receive_matrix,
+    get_receive_matrix,
 )
 
 from specklepy.objects import Base
@@ -325,3 +329,37 @@ def test_apply_pt_transform_matrix(data_storage):
     data_storage.matrix = matrix
     result = apply_pt_transform_matrix(pt, data_storage)
     assert isinstance(result, Point)
+
+
+def test_get_receive_matrix_same_as_points(data_storage):
+    data_storage.crs_offset_x = 10.0
+    data_storage.crs_offset_y = -20.0
+    data_storage.crs_rotation = 30
+    data_storage.matrix = np.matrix(
+        [2, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 5, 6, 7, 1]
+    ).reshape(4, 4)
+    coords = [[0.0, 4.0, 1.0], [-3.0, 2.5, 0.0]]
+    result = apply_receive_matrix(coords, get_receive_matrix(data_storage))
+    for (x, y, z), new_pt in zip(coords, result):
+        pt = apply_pt_transform_matrix(Point(x=x, y=y, z=z), data_storage)
+        pt = transform_speckle_pt_on_receive(pt, data_storage)
+        assert np.allclose(new_pt, [pt.x, pt.y, pt.z])
+
+
+def test_pointInIndex():
+    nan = math.nan
+    coords = [(0.0, 0.0, nan, nan), (5e5, 5e6, nan, nan), (1.0, 2.0, 3.0, nan)]
+    index = pointIndexFromCoords(coords)
+    assert pointInIndex(index, coords, (5e5, 5e6, nan, nan)) is True
+    # points within the tolerance of QgsPoint comparison are equal
+    assert pointInIndex(index, coords, (5e5 + 5e-9, 5e6 - 5e-9, nan, nan)) is True
+    assert pointInIndex(index, coords, (1.0, 2.0, 3.0, nan)) is True
+
+
+def test_pointInIndex_different_points():
+    nan = math.nan
+    coords = [(0.0, 0.0, nan, nan), (1.0, 2.0, 3.0, nan)]
+    index = pointIndexFromCoords(coords)
+    assert pointInIndex(index, coords, (0.0, 1e-6, nan, nan)) is False
+    assert pointInIndex(index, coords, (1.0, 2.0, 4.0, nan)) is False
+    assert pointInIndex(index, coords, (nan, nan, nan, nan)) is False
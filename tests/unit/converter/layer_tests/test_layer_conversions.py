@@ -14,4 +14,165 @@ from speckle.converter.layers.layer_conversions import (
     addVectorMainThread,
     rasterLayerToNative,
     addRasterMainThread,
+    getReceivedLayerNames,
+    getReceiveStorage,
+    emitToMainThread,
+    addFeaturesInChunks,
+    getMainThreadTimesSummary,
 )
+import threading
+
+import speckle.converter.layers.layer_conversions as layer_conversions
+from plugin_utils.helpers import SYMBOL
+from plugin_utils.threads import AckQueue
+
+
+
+def test_getReceivedLayerNames():
+    name = "base" + SYMBOL + "sub" + SYMBOL + "layer"
+    finalName, groupName = getReceivedLayerNames(name, "stream_main", "_as_Mesh")
+    assert finalName == "layer_as_Mesh"
+    assert groupName == "stream_main" + SYMBOL + "base" + SYMBOL + "sub" + SYMBOL
+
+
+def test_getReceiveStorage_keeps_shared_storage():
+    class Storage:
+        currentUnits = "ft"
+        matrix = None
+        current_layer_crs_offset_x = 0
+        latestActionLayers = []
+
+    class Crs:
+        offset_x = 10
+        offset_y = 20
+        rotation = 30
+
+    dataStorage = Storage()
+    layerStorage = getReceiveStorage(dataStorage, "degrees", [1, 0, 0, 1], Crs())
+    assert layerStorage.currentUnits == "m"
+    assert layerStorage.matrix == [1, 0, 0, 1]
+    assert layerStorage.current_layer_crs_offset_x == 10
+    assert layerStorage.current_layer_crs_rotation == 30
+    assert dataStorage.currentUnits == "ft"
+    assert dataStorage.matrix is None
+    assert dataStorage.current_layer_crs_offset_x == 0
+    assert layerStorage.latestActionLayers is dataStorage.latestActionLayers
+
+
+def test_emitToMainThread_waits_for_ack(monkeypatch):
+    queue = AckQueue(max_in_flight=1, timeout=0.05)
+    waiting = threading.Event()
+    monkeypatch.setattr(layer_conversions, "RECEIVE_QUEUE", queue)
+    monkeypatch.setattr(layer_conversions, "logToUser", lambda *a, **kw: waiting.set())
+
+    class Signal:
+        emitted = []
+
+        def emit(self, obj):
+            self.emitted.append(obj)
+
+    signal = Signal()
+    queue.put()  # a layer the main thread has not added yet
+    t = threading.Thread(target=emitToMainThread, args=(signal, {"layer": 1}))
+    t.start()
+    assert waiting.wait(5)
+    assert signal.emitted == []
+
+    queue.ack()
+    t.join(5)
+    assert signal.emitted == [{"layer": 1}]
+    assert queue.in_flight == 1
+
+
+def test_addFeaturesInChunks(monkeypatch):
+    events = []
+
+    class Provider:
+        def addFeatures(self, fets):
+            events.append(list(fets))
+
+    class Application:
+        @staticmethod
+        def sendPostedEvents(receiver, event_type):
+            events.append("repaint")
+
+    class Event:
+        UpdateRequest = 77
+
+    monkeypatch.setattr(layer_conversions, "RECEIVE_FEATURES_CHUNK_SIZE", 2)
+    monkeypatch.setattr(layer_conversions, "QCoreApplication", Application, raising=False)
+    monkeypatch.setattr(layer_conversions, "QEvent", Event, raising=False)
+    addFeaturesInChunks(Provider(), [1, 2, 3, 4, 5])
+    assert events == [[1, 2], "repaint", [3, 4], "repaint", [5]]
+
+
+def test_getMainThreadTimesSummary(monkeypatch):
+    monkeypatch.setattr(layer_conversions, "RECEIVE_MAIN_THREAD_TIMES", {})
+    assert getMainThreadTimesSummary() is None
+
+    layer_conversions.RECEIVE_MAIN_THREAD_TIMES.update({"roads": 0.5, "buildings": 2})
+    summary = getMainThreadTimesSummary()
+    assert "2.50s in total" in summary
+    assert "2.00s max ('buildings')" in summary
+
+
+def test_convertSelectedLayersToSpeckle_concurrent_in_order(monkeypatch):
+    class VectorLayer:
+        def __init__(self, name):
+            self._name = name
+
+        def name(self):
+            return self._name
+
+        def providerType(self):
+            return "ogr"
+
+    class Converted:
+        def __init__(self, name):
+            self.name = name
+            self.elements = []
+
+    class Storage:
+        latestActionReport = []
+        savedTransforms = None
+
+    class Plugin:
+        dataStorage = Storage()
+        project = None
+        dockwidget = None
+
+    layers = [VectorLayer(f"layer_{i}") for i in range(6)]
+    started = []
+    ran_together = []
+    all_started = threading.Event()
+
+    def layerToSpeckle(snapshot, projectCRS, plugin, displayOrder, report):
+        started.append(snapshot.name())
+        if len(started) == min(len(layers), layer_conversions.LAYER_CONVERSION_WORKERS):
+            all_started.set()
+        # the first layers wait until the pool is full
+        ran_together.append(all_started.wait(5))
+        report.append({"feature_id": snapshot.name()})
+        return Converted(snapshot.name())
+
+    collected = []
+    monkeypatch.setattr(layer_conversions, "QgsVectorLayer", VectorLayer, raising=False)
+    monkeypatch.setattr(layer_conversions, "VectorLayerSnapshot", lambda layer: layer)
+    monkeypatch.setattr(layer_conversions, "layerToSpeckle", layerToSpeckle)
+    monkeypatch.setattr(layer_conversions, "compileLayerTransforms", lambda *a: None)
+    monkeypatch.setattr(layer_conversions, "getLayerTransform", lambda *a: None)
+    monkeypatch.setattr(layer_conversions, "logToUser", lambda *a, **kw: None)
+    monkeypatch.setattr(
+        layer_conversions,
+        "collectionsFromJson",
+        lambda tree, levels, converted, base: collected.append(converted.name),
+    )
+    monkeypatch.setattr(layer_conversions, "LAYER_CONVERSION_WORKERS", 3)
+
+    convertSelectedLayersToSpeckle(
+        None, layers, ["group"] * len(layers), None, Plugin()
+    )
+    names = [layer.name() for layer in layers]
+    assert all(ran_together)
+    assert collected == names
+    assert [item["feature_id"] for item in Storage.latestActionReport] == names
@@ -1,5 +1,6 @@
 from speckle.converter.layers.symbology import (
     featureColorfromNativeRenderer,
+    resolveFeatureColor,
     gradientColorRampToSpeckle,
     gradientColorRampToNative,
     get_r_g_b,
@@ -8,3 +9,35 @@ from speckle.converter.layers.symbology import (
     rasterRendererToNative,
     rendererToSpeckle,
 )
+
+
+def test_resolveFeatureColor_categorized():
+    resolver = {
+        "type": "categorized",
+        "color": 0,
+        "numeric": {1.0: 0},
+        "text": {"a": 1, "": 2},
+        "all": {"1": 0, "a": 1, "": 2},
+        "colors": [10, 11, 12],
+        "other_color": 12,
+    }
+    assert resolveFeatureColor(resolver, 1) == 10
+    assert resolveFeatureColor(resolver, "1") == 10
+    assert resolveFeatureColor(resolver, "a") == 11
+    assert resolveFeatureColor(resolver, "b") == 12
+
+
+def test_resolveFeatureColor_graduated():
+    resolver = {
+        "type": "graduated",
+        "color": 0,
+        "lower": [0, 10, 20],
+        "upper": [10, 20, 30],
+        "colors": [10, 11, 12],
+        "sorted": True,
+    }
+    assert resolveFeatureColor(resolver, 5) == 10
+    # value on the border belongs to the first range
+    assert resolveFeatureColor(resolver, 10) == 10
+    assert resolveFeatureColor(resolver, 25.5) == 12
+    assert resolveFeatureColor(resolver, 31) == 0
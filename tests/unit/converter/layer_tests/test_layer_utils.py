@@ -1,3 +1,7 @@
+import numpy as np
+from specklepy.objects import Base
+
+import speckle.converter.layers.utils as layer_utils
 from speckle.converter.layers.utils import (
     generate_qgis_app_id,
     generate_qgis_raster_app_id,
@@ -5,22 +9,298 @@ from speckle.converter.layers.utils import (
     getVariantFromValue,
     colorFromSpeckle,
     getLayerAttributes,
+    getLayerAttributeTypes,
     traverseDict,
     validateAttributeName,
     trySaveCRS,
     reprojectPt,
     getClosestIndex,
     getArrayIndicesFromXY,
+    getArrayIndicesFromXYArrays,
     getXYofArrayPoint,
     isAppliedLayerTransformByKeywords,
+    parseLayerTransform,
+    RASTER_GRID_MESH_TRANSFORM,
+    compileLayerTransforms,
+    getLayerTransform,
+    clearLayerTransforms,
     getElevationLayer,
     get_raster_stats,
     getRasterArrays,
+    get_raster_tiles,
+    getRasterTileBand,
+    getFeaturesById,
+    getLayerSourceStamp,
+    getCachedElevationData,
+    getCachedRasterBand,
+    clearRasterBandCache,
+    clearRasterCache,
     moveVertically,
     moveVerticallySegment,
     tryCreateGroupTree,
     tryCreateGroup,
     findUpdateJsonItemPath,
+    addJsonItemPath,
     collectionsFromJson,
     getDisplayValueList,
 )
+
+
+class RasterLayer:
+    def __init__(self, layer_id, source):
+        self._id = layer_id
+        self._source = source
+
+    def id(self):
+        return self._id
+
+    def source(self):
+        return self._source
+
+
+def test_getCachedElevationData_read_once_per_send(monkeypatch, tmp_path):
+    source = tmp_path / "dem.tif"
+    source.write_bytes(b"")
+    reads = []
+
+    def getRasterArrays(layer):
+        reads.append(layer.id())
+        return [np.zeros((2, 2))], [0.0], [0.0], [None]
+
+    monkeypatch.setattr(layer_utils, "getRasterArrays", getRasterArrays)
+    monkeypatch.setattr(layer_utils, "get_raster_stats", lambda layer: (1.0, -1.0))
+    layer = RasterLayer("dem", str(source))
+
+    clearRasterCache()
+    try:
+        first = getCachedElevationData(layer)
+        assert getCachedElevationData(layer) is first
+        assert reads == ["dem"]
+
+        # next send reads the file again
+        clearRasterCache()
+        assert len(layer_utils.ELEVATION_CACHE) == 0
+        getCachedElevationData(layer)
+        assert reads == ["dem", "dem"]
+    finally:
+        clearRasterCache()
+
+
+def test_getCachedElevationData_failed_read_not_cached(monkeypatch, tmp_path):
+    source = tmp_path / "dem.tif"
+    source.write_bytes(b"")
+    reads = []
+
+    def getRasterArrays(layer):
+        reads.append(layer.id())
+        return None, None, None, None
+
+    monkeypatch.setattr(layer_utils, "getRasterArrays", getRasterArrays)
+    monkeypatch.setattr(layer_utils, "get_raster_stats", lambda layer: None)
+    layer = RasterLayer("dem", str(source))
+
+    clearRasterCache()
+    try:
+        getCachedElevationData(layer)
+        getCachedElevationData(layer)
+        assert reads == ["dem", "dem"]
+        assert len(layer_utils.ELEVATION_CACHE) == 0
+    finally:
+        clearRasterCache()
+
+
+def test_getCachedElevationData_reads_outside_lock(monkeypatch, tmp_path):
+    source = tmp_path / "dem.tif"
+    source.write_bytes(b"")
+    lock_free = []
+
+    def getRasterArrays(layer):
+        # other threads can use the cache while the file is read
+        lock_free.append(layer_utils.RASTER_CACHE_LOCK.acquire(blocking=False))
+        layer_utils.RASTER_CACHE_LOCK.release()
+        return [np.zeros((2, 2))], [0.0], [0.0], [None]
+
+    monkeypatch.setattr(layer_utils, "getRasterArrays", getRasterArrays)
+    monkeypatch.setattr(layer_utils, "get_raster_stats", lambda layer: None)
+
+    clearRasterCache()
+    try:
+        getCachedElevationData(RasterLayer("dem", str(source)))
+        assert lock_free == [True]
+    finally:
+        clearRasterCache()
+
+
+def test_clearRasterBandCache(tmp_path):
+    source = tmp_path / "raster.tif"
+    source.write_bytes(b"")
+    layer = RasterLayer("raster", str(source))
+    other = RasterLayer("other", str(source))
+    stamp = getLayerSourceStamp(layer)
+    band = {"array": np.zeros((2, 2)), "noData": None}
+
+    clearRasterCache()
+    try:
+        layer_utils.RASTER_BAND_CACHE[("raster", stamp, 0)] = band
+        layer_utils.RASTER_BAND_CACHE[("other", stamp, 0)] = dict(band)
+        # cached band is returned without reading the file
+        assert getCachedRasterBand(layer, 0) is band
+
+        clearRasterBandCache(layer)
+        assert list(layer_utils.RASTER_BAND_CACHE) == [("other", stamp, 0)]
+    finally:
+        clearRasterCache()
+
+
+def test_get_raster_tiles_single():
+    tiles = get_raster_tiles(100, 100, 1, (100, 1), 1024)
+    assert tiles == [(0, 0, 100, 100)]
+
+
+def test_get_raster_tiles_cover_raster():
+    width, height = 5000, 3000
+    tiles = get_raster_tiles(width, height, 3, (256, 256), 10)
+    assert len(tiles) > 1
+    assert sum([t[2] * t[3] for t in tiles]) == width * height
+    for xoff, yoff, xsize, ysize in tiles:
+        assert xoff % 256 == 0 and yoff % 256 == 0
+        assert xoff + xsize <= width and yoff + ysize <= height
+
+
+def test_getRasterTileBand_layer_nodata():
+    tile = Base(x_size=2, y_size=2, noDataValue=[-1.0, None])
+    tile["@(10000)Band 1_values"] = [1.0, -1.0, 3.0, -1.0]
+    tile["@(10000)Band 2_values"] = [5.0, 6.0, 7.0, 8.0]
+
+    values = getRasterTileBand(tile, "Band 1", 0, -999.0)
+    assert values.tolist() == [[1.0, -999.0], [3.0, -999.0]]
+    # unknown NoData of the tile: values are kept
+    values = getRasterTileBand(tile, "Band 2", 1, -999.0)
+    assert values.tolist() == [[5.0, 6.0], [7.0, 8.0]]
+
+
+def test_getArrayIndicesFromXYArrays_same_as_points():
+    settings = (2.5, -2.5, 10.0, 50.0, 6, 4, None, None)
+    # points inside, on the edges and outside of the layer extent
+    x = np.linspace(5.0, 30.0, 41)
+    y = np.linspace(58.0, 35.0, 37)
+    xx, yy = np.meshgrid(x, y)
+
+    ind1, ind2, valid = getArrayIndicesFromXYArrays(settings, xx, yy)
+    assert valid.any() and not valid.all()
+    for i, j in np.ndindex(xx.shape):
+        index1, index2, _, _ = getArrayIndicesFromXY(settings, xx[i, j], yy[i, j])
+        if index1 is None:
+            assert not valid[i, j]
+        else:
+            assert valid[i, j]
+            assert (ind1[i, j], ind2[i, j]) == (index1, index2)
+
+
+def test_parseLayerTransform():
+    transform = parseLayerTransform(
+        "buildings ('height')  ->  Extrude polygon by selected attribute"
+    )
+    assert transform["layer_name"] == "buildings"
+    assert transform["attribute"] == "height"
+    assert transform["extrude"] is True
+    assert transform["ignore"] is False
+
+
+def test_parseLayerTransform_grid_mesh():
+    transform = parseLayerTransform(f"dem  ->  {RASTER_GRID_MESH_TRANSFORM}")
+    assert transform["grid_mesh"] is True
+    assert transform["elevation"] is False
+
+
+def test_isAppliedLayerTransformByKeywords():
+    class Layer:
+        def __init__(self, layer_id, name):
+            self._id = layer_id
+            self._name = name
+
+        def id(self):
+            return self._id
+
+        def name(self):
+            return self._name
+
+    class Storage:
+        savedTransforms = [
+            "dem  ->  Set as a 3d mesh from elevation layer",
+            "parcels  ->  Project polygon to elevation layer",
+        ]
+
+    layers = [Layer("1", "dem"), Layer("2", "parcels"), Layer("3", "roads")]
+    compileLayerTransforms(layers, Storage())
+    try:
+        assert getLayerTransform(layers[2], Storage()) is None
+        assert isAppliedLayerTransformByKeywords(
+            layers[0], ["elevation", "mesh"], ["texture"], Storage()
+        )
+        assert not isAppliedLayerTransformByKeywords(
+            layers[0], ["texture"], [], Storage()
+        )
+        assert isAppliedLayerTransformByKeywords(
+            layers[1], ["polygon", "project", "elevation"], [], Storage()
+        )
+    finally:
+        clearLayerTransforms()
+
+
+def test_addJsonItemPath_same_as_findUpdateJsonItemPath():
+    from plugin_utils.helpers import SYMBOL
+
+    paths = [
+        "a",
+        "a" + SYMBOL + "b",
+        SYMBOL + "a" + SYMBOL + "c" + SYMBOL + "d",
+        "e" + SYMBOL + "f",
+    ]
+    tree = {"a": {}}
+    expected = {"a": {}}
+    for path in paths:
+        assert addJsonItemPath(tree, path) is tree
+        expected = findUpdateJsonItemPath(expected, path)
+    assert tree == expected
+    assert addJsonItemPath(None, "a") is None
+
+
+def test_getFeaturesById_one_pass():
+    shapes = [{"speckle_id": f"id_{i % 5000}", "index": i} for i in range(6000)]
+    read = []
+
+    def getFeatures():
+        for shape in shapes:
+            read.append(shape)
+            yield shape
+
+    shapes_by_id = getFeaturesById(getFeatures())
+    # the written shapes are read once, not once per received feature
+    assert len(read) == len(shapes)
+    assert len(shapes_by_id) == 5000
+    # duplicated ids: the first shape is used, as in the previous linear search
+    assert shapes_by_id["id_10"]["index"] == 10
+    assert shapes_by_id.get("missing") is None
+
+
+def test_getLayerAttributeTypes_mixed_types_keep_first(monkeypatch):
+    class QVariant:
+        String = "String"
+
+    types = {int: "LongLong", float: "Double", str: "String"}
+    monkeypatch.setattr(layer_utils, "QVariant", QVariant, raising=False)
+    monkeypatch.setattr(
+        layer_utils, "getVariantFromValue", lambda value: types.get(type(value))
+    )
+
+    features = []
+    for value in [1, 2.5, "text"]:
+        feature = Base()
+        feature["mixed"] = value
+        feature["name"] = str(value)
+        features.append(feature)
+
+    schema = getLayerAttributeTypes(features)
+    assert schema == {"mixed": "LongLong", "name": "String", "Speckle_ID": "String"}
+    assert getLayerAttributeTypes(features[1:])["mixed"] == "Double"
@@ -0,0 +1,81 @@
+import threading
+
+from plugin_utils.threads import CANCELLATION_TOKEN, AckQueue, KThread
+
+
+def test_ack_queue_limits_items_in_flight():
+    queue = AckQueue(max_in_flight=2, timeout=5)
+    received = []
+    max_seen = []
+
+    def producer():
+        for i in range(10):
+            queue.put()
+            max_seen.append(queue.in_flight)
+            received.append(i)
+        queue.join()
+
+    t = threading.Thread(target=producer)
+    t.start()
+    while t.is_alive() or queue.in_flight > 0:
+        if queue.in_flight > 0:
+            queue.ack()
+    t.join()
+
+    assert received == list(range(10))
+    assert max(max_seen) <= 2
+    assert queue.in_flight == 0
+
+
+def test_ack_queue_timeout():
+    queue = AckQueue(max_in_flight=1, timeout=0.1)
+    results = []
+
+    def producer():
+        results.append(queue.put())
+        results.append(queue.put())  # never acknowledged
+
+    t = threading.Thread(target=producer)
+    t.start()
+    t.join()
+    assert results == [True, False]
+    assert queue.in_flight == 1  # nothing reserved on timeout
+
+    queue.reset()
+    assert queue.in_flight == 0
+
+
+def test_ack_queue_reset_sets_limit():
+    queue = AckQueue(max_in_flight=4, timeout=0.05)
+    queue.put()
+    queue.reset(2)
+    assert queue.max_in_flight == 2
+    assert queue.in_flight == 0
+
+    queue.reset(0)  # at least one layer can always be sent
+    assert queue.max_in_flight == 1
+    queue.reset()  # keeps the current limit
+    assert queue.max_in_flight == 1
+
+
+def test_kthread_stops_at_cancellation_check():
+    CANCELLATION_TOKEN.reset()
+    started = threading.Event()
+    steps = []
+
+    def work():
+        started.set()
+        while len(steps) < 10**6:
+            CANCELLATION_TOKEN.check()
+            steps.append(1)
+
+    t = KThread(target=work, name="speckle_test")
+    t.start()
+    started.wait()
+    t.kill()
+    t.join(5)
+    assert not t.is_alive()
+    assert len(steps) < 10**6
+
+    CANCELLATION_TOKEN.reset()
+    CANCELLATION_TOKEN.check()
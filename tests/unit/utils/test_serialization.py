@@ -0,0 +1,41 @@
+from specklepy.objects.geometry import Mesh
+from specklepy.objects.GIS.geometry import GisRasterElement
+from specklepy.objects.other import Collection
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.memory import MemoryTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+from speckle.utils.serialization import CachedObject, cacheObject, sendObject
+
+
+def raster_tile(i: int) -> GisRasterElement:
+    tile = GisRasterElement(units="m")
+    tile["@(10000)Band 1_values"] = [float(i + k) for k in range(25000)]
+    tile.displayValue = [Mesh.create([float(i)] * 12, [4, 0, 1, 2, 3], [1, 2, 3, 4])]
+    tile.applicationId = f"raster_{i}"
+    return tile
+
+
+def commit(elements) -> Collection:
+    layer = Collection(name="raster", collectionType="RasterLayer", elements=elements)
+    other = Collection(name="other", elements=[raster_tile(2)])
+    return Collection(name="QGIS commit", elements=[layer, other])
+
+
+def test_sendObject_same_as_send(tmp_path):
+    expected = MemoryTransport()
+    expected_id, _ = BaseObjectSerializer(write_transports=[expected]).write_json(
+        commit([raster_tile(0), raster_tile(1), raster_tile(0)])
+    )
+
+    cache = SQLiteTransport(base_path=str(tmp_path))
+    tiles = [cacheObject(raster_tile(i), cache) for i in [0, 1, 0]]
+    assert all(isinstance(t, CachedObject) for t in tiles)
+
+    transport = MemoryTransport()
+    obj_id = sendObject(commit(tiles), [transport], cache)
+    cache.close()
+
+    # same object ids, closures and children count as without caching
+    assert obj_id == expected_id
+    assert transport.objects == expected.objects